@@ -1,16 +1,14 @@
 import customtkinter as ctk
-import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 from db_conn import get_connection
-
-import sys
-import os
-
-def resource_path(relative_path):
-    if getattr(sys, "frozen", False):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.dirname(__file__), "..", relative_path)
+from services.asset_import import import_assets, summary as import_summary
+from services.repositories import AssetRepository
+from services.export import export_assets
+from utils.tree_sync import TreeSync
+from utils.page_cache import notify_data_changed
+from utils.progress_dialog import run_with_progress
+from utils.ui_resources import checkbox_images, define_style
 
 
 TEXT_DARK = "#222222"
@@ -67,6 +65,30 @@ class AssetsPage(ctk.CTkFrame):
             command=self.delete_selected_assets,
         ).pack(side="right", padx=(0, 12))
 
+        ctk.CTkButton(
+            top_bar,
+            text="Export",
+            width=100,
+            height=34,
+            fg_color="#E0E0E0",
+            hover_color="#CCCCCC",
+            text_color=TEXT_DARK,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            command=self.open_export_dialog,
+        ).pack(side="right", padx=(0, 12))
+
+        ctk.CTkButton(
+            top_bar,
+            text="Import CSV",
+            width=110,
+            height=34,
+            fg_color="#E0E0E0",
+            hover_color="#CCCCCC",
+            text_color=TEXT_DARK,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            command=self.open_import_dialog,
+        ).pack(side="right", padx=(0, 12))
+
         # ---------- MAIN TABLE ----------
         main_frame = ctk.CTkFrame(self, fg_color="#FFFFFF")
         main_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -75,10 +97,8 @@ class AssetsPage(ctk.CTkFrame):
         tree_container.pack(fill="both", expand=True)
 
         # ---------- TREEVIEW STYLE ----------
-        style = ttk.Style()
-        style.theme_use("clam")
-
-        style.configure(
+        define_style(
+            self,
             "Assets.Treeview",
             background=CARD_BG,
             fieldbackground=CARD_BG,
@@ -88,7 +108,8 @@ class AssetsPage(ctk.CTkFrame):
             borderwidth=0,
             relief="flat",
         )
-        style.configure(
+        define_style(
+            self,
             "Assets.Treeview.Heading",
             background="#EEEEEE",
             foreground="#444444",
@@ -98,7 +119,7 @@ class AssetsPage(ctk.CTkFrame):
         )
 
         # ---------- LOAD CHECKBOX IMAGES ----------
-        self.img_unchecked, self.img_checked = self._load_checkbox_images()
+        self.img_unchecked, self.img_checked = checkbox_images(self)
 
         # Columns (checkbox is #0)
         self.columns = (
@@ -149,6 +170,9 @@ class AssetsPage(ctk.CTkFrame):
         # IMPORTANT: use ButtonPress + X-coordinate detection
         self.tree.bind("<ButtonPress-1>", self._on_tree_click)
 
+        # refreshes patch the tree instead of rebuilding it
+        self.tree_sync = TreeSync(self.tree)
+
         self.info_label = ctk.CTkLabel(
             self,
             text="0 asset(s) in inventory.",
@@ -159,54 +183,29 @@ class AssetsPage(ctk.CTkFrame):
 
         self.load_assets()
 
-    # ---------- IMAGE LOADER ----------
-    def _load_checkbox_images(self):
-        unchecked = tk.PhotoImage(
-            file=resource_path("Images/unchecked.png")
-        )
-        checked = tk.PhotoImage(
-            file=resource_path("Images/checkbox.png")
-        )
-
-        max_size = 22
-
-        def scale(img):
-            w, h = img.width(), img.height()
-            if w <= max_size and h <= max_size:
-                return img
-            factor = max(int(w / max_size), int(h / max_size), 1)
-            return img.subsample(factor, factor)
-
-        return scale(unchecked), scale(checked)
+    # ---------- PAGE CACHE HOOKS ----------
+    def on_show(self, stale):
+        if stale:
+            self.load_assets()
 
     # ---------- LOAD ASSETS ----------
     def load_assets(self):
-        self.tree.delete(*self.tree.get_children())
-        self.checked_rows.clear()
-        self.header_checked = False
-        self.tree.heading("#0", image=self.img_unchecked)
-
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("""
-            SELECT id, asset_name, asset_tag_id, status, location, category
-            FROM assets
-            ORDER BY asset_name
-        """)
-        rows = c.fetchall()
+        rows = AssetRepository(conn).all()
         conn.close()
 
         self.info_label.configure(text=f"{len(rows)} asset(s) in inventory.")
 
-        for r in rows:
-            asset_id, name, tag, status, location, category = r
-            self.tree.insert(
-                "",
-                "end",
-                iid=str(asset_id),
-                image=self.img_unchecked,
-                values=(name, tag, status, location, category, "✏️"),
-            )
+        diff = self.tree_sync.apply(
+            (
+                (asset_id, (name, tag, status, location, category, "✏️"))
+                for asset_id, name, tag, status, location, category in rows
+            ),
+            image=self.img_unchecked,
+        )
+        # checked rows that no longer exist drop out of the selection
+        self.checked_rows.difference_update(diff.removed)
+        self._refresh_header_checkbox()
 
     # ---------- CHECKBOX HANDLING (ROBUST) ----------
     def _on_tree_click(self, event):
@@ -239,11 +238,14 @@ class AssetsPage(ctk.CTkFrame):
             self.tree.item(row_id, image=self.img_checked)
             self.checked_rows.add(row_id)
 
-        all_ids = list(self.tree.get_children())
+        self._refresh_header_checkbox()
+
+    def _refresh_header_checkbox(self):
+        all_ids = self.tree.get_children()
+        self.header_checked = bool(all_ids) and len(self.checked_rows) == len(all_ids)
         self.tree.heading(
             "#0",
-            image=self.img_checked if all_ids and len(self.checked_rows) == len(all_ids)
-            else self.img_unchecked,
+            image=self.img_checked if self.header_checked else self.img_unchecked,
         )
 
     def _toggle_header_checkbox(self):
@@ -270,17 +272,12 @@ class AssetsPage(ctk.CTkFrame):
             return
 
         conn = get_connection()
-        c = conn.cursor()
-        placeholders = ",".join("?" for _ in self.checked_rows)
-        c.execute(
-            f"DELETE FROM assets WHERE id IN ({placeholders})",
-            list(self.checked_rows),
-        )
-        conn.commit()
+        AssetRepository(conn).delete(self.checked_rows)
         conn.close()
 
         messagebox.showinfo("Deleted", "Selected asset(s) deleted.")
         self.load_assets()
+        notify_data_changed(self)
 
 
     # ---------- Add Asset dialog ----------
@@ -470,17 +467,13 @@ class AssetsPage(ctk.CTkFrame):
 
             try:
                 conn = get_connection()
-                c = conn.cursor()
-                c.execute("""
-                    INSERT INTO assets (asset_name, asset_tag_id, status, location, category)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (name, tag, status_val, location, category))
-                conn.commit()
+                AssetRepository(conn).add(name, tag, status_val, location, category)
                 conn.close()
 
                 messagebox.showinfo("Success", "Asset added successfully.")
                 dialog.destroy()
                 self.load_assets()
+                notify_data_changed(self)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to add asset.\n\n{e}")
 
@@ -511,23 +504,20 @@ class AssetsPage(ctk.CTkFrame):
         # Fetch current values
         try:
             conn = get_connection()
-            c = conn.cursor()
-            c.execute("""
-                SELECT asset_name, asset_tag_id, status, location, category
-                FROM assets
-                WHERE id = ?
-            """, (asset_id,))
-            row = c.fetchone()
+            asset = AssetRepository(conn).get(asset_id)
             conn.close()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load asset.\n\n{e}")
             return
 
-        if not row:
+        if not asset:
             messagebox.showerror("Error", "Asset not found.")
             return
 
-        current_name, current_tag, current_status, current_location, current_category = row
+        current_name, current_tag = asset.name, asset.tag
+        current_status, current_location, current_category = (
+            asset.status, asset.location, asset.category
+        )
 
         dialog = ctk.CTkToplevel(self)
         dialog.title("Edit Asset")
@@ -710,18 +700,15 @@ class AssetsPage(ctk.CTkFrame):
 
             try:
                 conn = get_connection()
-                c = conn.cursor()
-                c.execute("""
-                    UPDATE assets
-                    SET asset_name = ?, asset_tag_id = ?, status = ?, location = ?, category = ?
-                    WHERE id = ?
-                """, (name, tag, status_val, location, category, asset_id))
-                conn.commit()
+                AssetRepository(conn).update(
+                    asset_id, name, tag, status_val, location, category
+                )
                 conn.close()
 
                 messagebox.showinfo("Success", "Asset updated successfully.")
                 dialog.destroy()
                 self.load_assets()
+                notify_data_changed(self)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to update asset.\n\n{e}")
 
@@ -758,6 +745,66 @@ class AssetsPage(ctk.CTkFrame):
                 selected_ids.append(int(iid))
         return selected_ids
 
+    # ---------- EXPORT ----------
+    def open_export_dialog(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export Assets",
+            defaultextension=".csv",
+            initialfile="assets.csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")],
+        )
+        if not path:
+            return
+
+        def job(progress, cancelled):
+            conn = get_connection("read-only-report")
+            try:
+                return export_assets(conn, path, progress=progress, cancelled=cancelled)
+            finally:
+                conn.close()
+
+        run_with_progress(
+            self, "Exporting assets", job,
+            on_done=lambda n: messagebox.showinfo(
+                "Export complete", f"Exported {n} asset(s) to:\n{path}"
+            ),
+            error_title="Export failed",
+        )
+
+    # ---------- BULK IMPORT ----------
+    def open_import_dialog(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Import Assets",
+            filetypes=[("CSV", "*.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        def job(progress, cancelled):
+            conn = get_connection("bulk-import")
+            try:
+                return import_assets(conn, path, progress=progress, cancelled=cancelled)
+            finally:
+                conn.close()
+
+        def done(result):
+            self.load_assets()
+            notify_data_changed(self)
+            show = messagebox.showwarning if result.rejected else messagebox.showinfo
+            show("Import finished", import_summary(result))
+
+        def stopped():
+            # chunks written before a cancel or error are kept
+            self.load_assets()
+            notify_data_changed(self)
+
+        run_with_progress(
+            self, "Importing assets", job, on_done=done, on_stopped=stopped,
+            error_title="Import failed",
+        )
+
     # ---------- Helper: center Toplevel ----------
     def _center_window(self, window, width, height):
         try:
@@ -1,17 +1,16 @@
 import customtkinter as ctk
-import tkinter as tk
 from tkinter import ttk, messagebox
-from utils.path_helper import resource_path
 
-
-from Pages.students import to_michigan
 from db_conn import get_connection
-
-from datetime import datetime
-from zoneinfo import ZoneInfo
-
-def michigan_now():
-    return datetime.now(ZoneInfo("America/Detroit")).strftime("%Y-%m-%d %H:%M:%S")
+from services.repositories import CheckoutRepository
+from services.search import search_open_checkouts
+from services.scan import ScanCart, TagCache, can_check_in
+from utils.search_controller import SearchController
+from utils.tree_sync import TreeSync
+from utils.page_cache import notify_data_changed
+from utils.scan_bar import ScanBar
+from utils.timefmt import format_ts
+from utils.ui_resources import checkbox_images, define_style
 
 
 TEXT_DARK = "#222222"
@@ -47,6 +46,7 @@ class CheckInPage(ctk.CTkFrame):
         # ---------- SEARCH + BUTTON ----------
         action_frame = ctk.CTkFrame(self, fg_color="#FFFFFF")
         action_frame.pack(fill="x", padx=20, pady=(0, 10))
+        self.action_frame = action_frame
 
         self.search_entry = ctk.CTkEntry(
             action_frame,
@@ -69,6 +69,20 @@ class CheckInPage(ctk.CTkFrame):
             command=self.confirm_checkin,
         ).pack(side="right")
 
+        self.scan_switch = ctk.CTkSwitch(
+            action_frame,
+            text="Scan mode",
+            command=self._on_scan_mode_toggled,
+        )
+        self.scan_switch.pack(side="right", padx=(0, 16))
+
+        # ---------- SCAN MODE (hidden until switched on) ----------
+        # scanned tags resolve through an in-memory tag -> asset dict and
+        # collect in a cart; nothing is written until Confirm Check In
+        self.tag_cache = TagCache()
+        self.scan_cart = ScanCart(self.tag_cache, can_check_in)
+        self.scan_bar = ScanBar(self, self.scan_cart, "to check in")
+
         # ---------- MAIN TABLE ----------
         main_frame = ctk.CTkFrame(self, fg_color="#FFFFFF")
         main_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -76,11 +90,9 @@ class CheckInPage(ctk.CTkFrame):
         tree_container = ttk.Frame(main_frame)
         tree_container.pack(fill="both", expand=True)
 
-        style = ttk.Style()
-        style.theme_use("clam")
-
         # Treeview style
-        style.configure(
+        define_style(
+            self,
             "CheckIn.Treeview",
             background=CARD_BG,
             fieldbackground=CARD_BG,
@@ -89,8 +101,13 @@ class CheckInPage(ctk.CTkFrame):
             rowheight=38,
             borderwidth=0,
             relief="flat",
+            map={
+                "background": [("selected", "#4E6B85")],
+                "foreground": [("selected", "white")],
+            },
         )
-        style.configure(
+        define_style(
+            self,
             "CheckIn.Treeview.Heading",
             background="#EEEEEE",
             foreground="#444444",
@@ -98,14 +115,9 @@ class CheckInPage(ctk.CTkFrame):
             relief="solid",
             borderwidth=1,
         )
-        style.map(
-            "CheckIn.Treeview",
-            background=[("selected", "#4E6B85")],
-            foreground=[("selected", "white")],
-        )
 
         # ---------- LOAD CHECKBOX IMAGES (SAME AS CHECK OUT) ----------
-        self.img_unchecked, self.img_checked = self._load_checkbox_images()
+        self.img_unchecked, self.img_checked = checkbox_images(self)
 
         # Columns (checkbox is #0)
         self.columns = (
@@ -158,6 +170,9 @@ class CheckInPage(ctk.CTkFrame):
 
         self.tree.bind("<ButtonRelease-1>", self._on_tree_click)
 
+        # refreshes patch the tree instead of rebuilding it
+        self.tree_sync = TreeSync(self.tree)
+
         # ---------- INFO ----------
         self.info_label = ctk.CTkLabel(
             self,
@@ -167,81 +182,96 @@ class CheckInPage(ctk.CTkFrame):
         )
         self.info_label.pack(anchor="w", padx=20, pady=(6, 0))
 
-        self.load_checked_out_items()
-
-    # ---------- IMAGE LOADER ----------
-    def _load_checkbox_images(self):
-        unchecked = tk.PhotoImage(
-            file=resource_path("Images/unchecked.png")
+        # typing in the search box queries on a worker thread
+        self.search = SearchController(
+            self, search_open_checkouts, self._show_items, self._on_search_error
         )
-        checked = tk.PhotoImage(
-            file=resource_path("Images/checkbox.png")
-        )
-
-        max_size = 22
-
-        def scale(img):
-            w, h = img.width(), img.height()
-            if w <= max_size and h <= max_size:
-                return img
-            factor = max(int(w / max_size), int(h / max_size), 1)
-            return img.subsample(factor, factor)
-
-        return scale(unchecked), scale(checked)
 
+        self.load_checked_out_items()
+        self._warm_tag_cache()
+
+    def destroy(self):
+        self.search.shutdown()
+        super().destroy()
+
+    # ---------- PAGE CACHE HOOKS ----------
+    def on_show(self, stale):
+        if stale:
+            self.load_checked_out_items(self.search_entry.get().strip())
+            self.tag_cache.invalidate()
+            if self.scan_mode:
+                self._warm_tag_cache()
+        if self.scan_mode:
+            self.scan_bar.focus()
+
+    def on_hide(self):
+        self.search.cancel()
+
+    # ---------- SCAN MODE ----------
+    @property
+    def scan_mode(self):
+        return bool(self.scan_switch.get())
+
+    def _warm_tag_cache(self):
+        try:
+            self.tag_cache.ensure_loaded(get_connection)
+        except Exception as e:
+            print("Failed to load asset tags:", e)
+
+    def _on_scan_mode_toggled(self):
+        if self.scan_mode:
+            self._warm_tag_cache()
+            self.scan_bar.pack(fill="x", padx=20, pady=(0, 10), after=self.action_frame)
+            self.scan_bar.focus()
+        else:
+            self.scan_bar.pack_forget()
+            self.scan_bar.clear("Scan a tag (or type it and press Enter).")
+
+    def _update_tag_cache(self, result):
+        """Patch the scan cache with this check-in instead of reloading it."""
+        if result.already_returned or result.missing or not self.scan_mode:
+            # another desk changed these checkouts, or they were ticked in
+            # the table (no asset ids at hand): reload instead of patching
+            self.tag_cache.invalidate()
+            if self.scan_mode:
+                self._warm_tag_cache()
+        else:
+            returned = set(result.returned)
+            self.tag_cache.update(
+                [a.asset_id for a in self.scan_cart.items if a.checkout_id in returned],
+                status="Available", checkout_id=None, student_name=None,
+            )
+        if self.scan_mode:
+            self.scan_bar.clear(f"Checked in {len(result.returned)} asset(s).")
 
     # ---------- SEARCH ----------
     def _on_search_changed(self, event=None):
-        self.load_checked_out_items(self.search_entry.get().strip())
+        self.search.schedule(self.search_entry.get().strip())
+
+    def _on_search_error(self, error):
+        messagebox.showerror("Error", f"Failed to load checked-out items.\n\n{error}")
 
     # ---------- LOAD DATA ----------
     def load_checked_out_items(self, query=""):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        self.header_checked = False
-        self.checked_rows.clear()
-        self.tree.heading("#0", image=self.img_unchecked)
-
         conn = get_connection()
-        c = conn.cursor()
-
-        sql = """
-            SELECT co.id, a.asset_name, a.asset_tag_id,
-                   co.student_name, co.student_id, co.checkout_time
-            FROM checkout co
-            JOIN assets a ON co.asset_id = a.id
-            WHERE co.status = 'Checked Out'
-        """
-
-        params = []
-        if query:
-            sql += """ AND (
-                a.asset_name LIKE ? OR
-                a.asset_tag_id LIKE ? OR
-                co.student_name LIKE ? OR
-                co.student_id LIKE ?
-            )"""
-            q = f"%{query}%"
-            params.extend([q, q, q, q])
-
-        sql += " ORDER BY co.checkout_time DESC"
-        c.execute(sql, params)
-        rows = c.fetchall()
+        rows = CheckoutRepository(conn).search_open(query)
         conn.close()
 
+        self._show_items(rows)
+
+    def _show_items(self, rows):
         self.info_label.configure(text=f"{len(rows)} asset(s) currently checked out.")
 
-        for r in rows:
-            checkout_id, asset, tag, sname, sid, time = r
-            self.tree.insert(
-                "",
-                "end",
-                iid=str(checkout_id),
-                text="",
-                image=self.img_unchecked,
-                values=(asset, tag, sname, sid, to_michigan(time)),
-            )
+        diff = self.tree_sync.apply(
+            (
+                (checkout_id, (asset, tag, sname, sid, format_ts(checkout_at)))
+                for checkout_id, asset, tag, sname, sid, checkout_at in rows
+            ),
+            image=self.img_unchecked,
+        )
+        # returned or filtered-out rows drop out of the selection
+        self.checked_rows.difference_update(diff.removed)
+        self._refresh_header_checkbox()
 
     # ---------- CHECKBOX HANDLING ----------
     def _on_tree_click(self, event):
@@ -266,8 +296,11 @@ class CheckInPage(ctk.CTkFrame):
         else:
             self._set_row_checked(row_id, True)
 
-        all_ids = list(self.tree.get_children())
-        if all_ids and all(rid in self.checked_rows for rid in all_ids):
+        self._refresh_header_checkbox()
+
+    def _refresh_header_checkbox(self):
+        all_ids = self.tree.get_children()
+        if all_ids and len(self.checked_rows) == len(all_ids):
             self.header_checked = True
             self.tree.heading("#0", image=self.img_checked)
         else:
@@ -292,32 +325,32 @@ class CheckInPage(ctk.CTkFrame):
 
     # ---------- CONFIRM ----------
     def confirm_checkin(self):
-        if not self.checked_rows:
+        if self.scan_mode:
+            checkout_ids = [asset.checkout_id for asset in self.scan_cart.items]
+        else:
+            checkout_ids = self.checked_rows
+        if not checkout_ids:
             messagebox.showerror("Error", "Select asset(s) to check in.")
             return
 
-        conn = get_connection()
-        c = conn.cursor()
-
-        for cid in self.checked_rows:
-            c.execute("SELECT asset_id FROM checkout WHERE id=?", (cid,))
-            asset_id = c.fetchone()[0]
-
-            c.execute("UPDATE assets SET status='Available' WHERE id=?", (asset_id,))
-            checkin_time = michigan_now()
-
-            c.execute(
-            """
-            UPDATE checkout
-            SET status='Returned', checkin_time=?
-            WHERE id=?
-            """,
-            (checkin_time, cid),
-        )
-
-
-        conn.commit()
-        conn.close()
+        try:
+            conn = get_connection()
+            result = CheckoutRepository(conn).check_in(checkout_ids)
+            conn.close()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to check in.\n\n{e}")
+            return
 
-        messagebox.showinfo("Success", "Asset(s) checked in successfully.")
+        skipped = len(result.already_returned) + len(result.missing)
+        if skipped:
+            messagebox.showwarning(
+                "Check In",
+                f"{len(result.returned)} asset(s) checked in.\n\n"
+                f"{skipped} item(s) were already returned or removed "
+                "at another desk and were skipped.",
+            )
+        elif not self.scan_mode:
+            messagebox.showinfo("Success", "Asset(s) checked in successfully.")
+        self._update_tag_cache(result)
         self.load_checked_out_items()
+        notify_data_changed(self)
@@ -1,19 +1,21 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
-from utils.path_helper import resource_path
 
-
-from datetime import datetime
-from zoneinfo import ZoneInfo
-
-def michigan_now():
-    return datetime.now(ZoneInfo("America/Detroit")).strftime("%Y-%m-%d %H:%M:%S")
-    
 from db_conn import get_connection
+from services.repositories import CheckoutRepository
+from services.search import search_assets
+from services.scan import ScanCart, TagCache, can_check_out
+from utils.search_controller import SearchController
+from utils.tree_sync import TreeSync
+from utils.prefix_index import PrefixIndex
+from utils.page_cache import notify_data_changed
+from utils.scan_bar import ScanBar
+from utils.ui_resources import checkbox_images, define_style
 
 TEXT_DARK = "#222222"
 CARD_BG = "#F5F5F5"
+MAX_SUGGESTIONS = 20
 
 
 class CheckOutPage(ctk.CTkFrame):
@@ -48,6 +50,7 @@ class CheckOutPage(ctk.CTkFrame):
         # ---------- Filters ----------
         filter_frame = ctk.CTkFrame(self, fg_color="#FFFFFF")
         filter_frame.pack(fill="x", padx=20, pady=(0, 10))
+        self.filter_frame = filter_frame
 
         self.search_entry = ctk.CTkEntry(
             filter_frame,
@@ -68,6 +71,20 @@ class CheckOutPage(ctk.CTkFrame):
         self.status_filter.set("Available only")
         self.status_filter.pack(side="left")
 
+        self.scan_switch = ctk.CTkSwitch(
+            filter_frame,
+            text="Scan mode",
+            command=self._on_scan_mode_toggled,
+        )
+        self.scan_switch.pack(side="right")
+
+        # ---------- Scan mode (hidden until switched on) ----------
+        # scanned tags resolve through an in-memory tag -> asset dict and
+        # collect in a cart; nothing is written until Confirm Check Out
+        self.tag_cache = TagCache()
+        self.scan_cart = ScanCart(self.tag_cache, can_check_out)
+        self.scan_bar = ScanBar(self, self.scan_cart, "to check out")
+
         # ---------- Main split (left table + right details) ----------
         main_frame = ctk.CTkFrame(self, fg_color="#FFFFFF")
         main_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -84,13 +101,8 @@ class CheckOutPage(ctk.CTkFrame):
         tree_container = ttk.Frame(left_frame)
         tree_container.pack(fill="both", expand=True)
 
-        style = ttk.Style()
-        try:
-            style.theme_use("clam")
-        except Exception:
-            pass
-
-        style.configure(
+        define_style(
+            self,
             "Checkout.Treeview",
             background=CARD_BG,
             fieldbackground=CARD_BG,
@@ -100,7 +112,8 @@ class CheckOutPage(ctk.CTkFrame):
             borderwidth=1,
             relief="solid",
         )
-        style.configure(
+        define_style(
+            self,
             "Checkout.Treeview.Heading",
             background="#EEEEEE",
             foreground="#444444",
@@ -113,7 +126,7 @@ class CheckOutPage(ctk.CTkFrame):
         self.columns = ("name", "tag", "location", "category", "status")
 
         # ---- load and SCALE checkbox icons ----
-        self.img_unchecked, self.img_checked = self._load_checkbox_images()
+        self.img_unchecked, self.img_checked = checkbox_images(self)
 
         self.tree = ttk.Treeview(
             tree_container,
@@ -153,6 +166,9 @@ class CheckOutPage(ctk.CTkFrame):
 
         self.tree.bind("<Button-1>", self._on_tree_click)
 
+        # refreshes patch the tree instead of rebuilding it
+        self.tree_sync = TreeSync(self.tree)
+
         self.info_label = ctk.CTkLabel(
             left_frame,
             text="Select asset(s) to check out.",
@@ -249,120 +265,119 @@ class CheckOutPage(ctk.CTkFrame):
         )
         checkout_btn.pack(padx=12, pady=(8, 16))
 
+        # typing in the search box queries on a worker thread
+        self.search = SearchController(
+            self, search_assets, self._show_assets, self._on_search_error
+        )
+
         # initial data
         self.load_assets()
         self.load_known_students()
+        self._warm_tag_cache()
 
-    # ---------- helper to load & scale checkbox icons ----------
-    def _load_checkbox_images(self):
-        """Load checkbox PNGs and shrink them if they are large."""
-        unchecked_orig = tk.PhotoImage(
-            file=resource_path("Images/unchecked.png")
-        )
-        checked_orig = tk.PhotoImage(
-            file=resource_path("Images/checkbox.png")
-        )
-
-        max_size = 22  # target max width/height in pixels
+    def destroy(self):
+        self.search.shutdown()
+        super().destroy()
 
-        def scale(img):
-            w, h = img.width(), img.height()
-            if w <= max_size and h <= max_size:
-                return img
-            factor = max(int(w / max_size), int(h / max_size), 1)
-            return img.subsample(factor, factor)
-
-        img_unchecked = scale(unchecked_orig)
-        img_checked = scale(checked_orig)
-
-        return img_unchecked, img_checked
+    # ---------- page cache hooks ----------
+    def on_show(self, stale):
+        if stale:
+            self.load_assets(*self._current_filters())
+            self.load_known_students()
+            self.tag_cache.invalidate()
+            if self.scan_mode:
+                self._warm_tag_cache()
+        if self.scan_mode:
+            self.scan_bar.focus()
+
+    def on_hide(self):
+        self.search.cancel()
+        self._hide_suggestions()
 
     # ---------- Filter helpers ----------
-    def _filter_assets(self):
+    def _current_filters(self):
         query = self.search_entry.get().strip()
         available_only = (self.status_filter.get() == "Available only")
-        self.load_assets(query=query, available_only=available_only)
+        return query, available_only
 
     def _on_search_changed(self, event=None):
-        self._filter_assets()
+        self.search.schedule(*self._current_filters())
 
     def _on_status_changed(self, value):
-        self._filter_assets()
+        self.search.run_now(*self._current_filters())
+
+    def _on_search_error(self, error):
+        messagebox.showerror("Error", f"Failed to load assets.\n\n{error}")
 
     # ---------- Load assets ----------
     def load_assets(self, query: str = "", available_only: bool = True):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        self.header_checked = False
-        self.checked_rows.clear()
-        self.tree.heading("#0", image=self.img_unchecked, text="")
-
         try:
             conn = get_connection()
-            c = conn.cursor()
-
-            sql = """
-                SELECT id, asset_name, asset_tag_id, location, category, status
-                FROM assets
-            """
-            params = []
-            where_clauses = []
-
-            if available_only:
-                where_clauses.append("status = 'Available'")
-            if query:
-                where_clauses.append("(asset_name LIKE ? OR asset_tag_id LIKE ?)")
-                q = f"%{query}%"
-                params.extend([q, q])
-
-            if where_clauses:
-                sql += " WHERE " + " AND ".join(where_clauses)
+            rows = search_assets(conn, query, available_only)
+            conn.close()
+        except Exception as e:
+            self._on_search_error(e)
+            return
 
-            sql += " ORDER BY asset_name"
+        self._show_assets(rows)
 
-            c.execute(sql, params)
-            rows = c.fetchall()
-            conn.close()
+    def _show_assets(self, rows):
+        if not rows:
+            self.info_label.configure(text="No matching assets found.")
+        else:
+            self.info_label.configure(
+                text=f"{len(rows)} asset(s) available to check out."
+            )
 
-            if not rows:
-                self.info_label.configure(text="No matching assets found.")
-            else:
-                self.info_label.configure(
-                    text=f"{len(rows)} asset(s) available to check out."
-                )
+        diff = self.tree_sync.apply(
+            (
+                (asset_id, (name, tag, location, category, status))
+                for asset_id, name, tag, location, category, status in rows
+            ),
+            image=self.img_unchecked,
+        )
+        # checked rows filtered out of the list drop out of the selection
+        self.checked_rows.difference_update(diff.removed)
+        self._refresh_header_checkbox()
 
-            for r in rows:
-                asset_id, name, tag, location, category, status = r
-                iid = str(asset_id)
-                self.tree.insert(
-                    "",
-                    "end",
-                    iid=iid,
-                    text="",
-                    image=self.img_unchecked,
-                    values=(name, tag, location, category, status),
-                )
+    # ---------- Scan mode ----------
+    @property
+    def scan_mode(self):
+        return bool(self.scan_switch.get())
 
+    def _warm_tag_cache(self):
+        try:
+            self.tag_cache.ensure_loaded(get_connection)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load assets.\n\n{e}")
+            print("Failed to load asset tags:", e)
+
+    def _on_scan_mode_toggled(self):
+        if self.scan_mode:
+            self._warm_tag_cache()
+            self.scan_bar.pack(fill="x", padx=20, pady=(0, 10), after=self.filter_frame)
+            self.scan_bar.focus()
+        else:
+            self.scan_bar.pack_forget()
+            self.scan_bar.clear("Scan a tag (or type it and press Enter).")
 
     # ---------- Student autocomplete ----------
     def load_known_students(self):
+        """Index every student's name and ID for autocomplete."""
         try:
             conn = get_connection()
-            c = conn.cursor()
-            c.execute("""
-                SELECT DISTINCT student_name
-                FROM checkout
-                WHERE student_name IS NOT NULL AND TRIM(student_name) <> ''
-                ORDER BY student_name COLLATE NOCASE
-            """)
-            self.known_students = [row[0] for row in c.fetchall()]
+            students = CheckoutRepository(conn).known_students()
             conn.close()
+            self.student_index = PrefixIndex(
+                (student_id, (name, student_id), (name, student_id))
+                for name, student_id in students
+            )
         except Exception as e:
             print("Failed to load student names:", e)
-            self.known_students = []
+            self.student_index = PrefixIndex()
+
+    def _remember_student(self, name, student_id):
+        """Add/refresh one student after a checkout instead of reloading all."""
+        self.student_index.add(student_id, (name, student_id), (name, student_id))
 
     def _on_tree_click(self, event):
         region = self.tree.identify("region", event.x, event.y)
@@ -382,15 +397,17 @@ class CheckOutPage(ctk.CTkFrame):
         else:
             self._set_row_checked(row_id, True)
 
-        all_ids = list(self.tree.get_children())
-        if all_ids and all(rid in self.checked_rows for rid in all_ids):
+        self._refresh_header_checkbox()
+
+    def _refresh_header_checkbox(self):
+        all_ids = self.tree.get_children()
+        if all_ids and len(self.checked_rows) == len(all_ids):
             self.header_checked = True
             self.tree.heading("#0", image=self.img_checked)
         else:
             self.header_checked = False
             self.tree.heading("#0", image=self.img_unchecked)
 
-
     def _set_row_checked(self, row_id: str, checked: bool):
         if checked:
             self.tree.item(row_id, image=self.img_checked)
@@ -414,13 +431,21 @@ class CheckOutPage(ctk.CTkFrame):
 
     # ----- autocomplete helpers -----
     def _autocomplete_student(self, event=None):
-        text = self.student_name_entry.get().strip().lower()
-        self._hide_suggestions()
-        if not text:
-            return
-        matches = [n for n in self.known_students if text in n.lower()]
-        if not matches:
+        text = self.student_name_entry.get().strip()
+        if text == getattr(self, "_suggest_text", None):
+            return  # arrows, shift, etc.
+        self._suggest_text = text
+
+        self.suggestions = self.student_index.search(text, MAX_SUGGESTIONS) if text else []
+        if not self.suggestions:
+            self._hide_suggestions()
             return
+
+        listbox = self._suggestion_popup()
+        listbox.delete(0, "end")
+        listbox.insert("end", *(f"{name}  ({sid})" for name, sid in self.suggestions))
+        listbox.configure(height=min(5, len(self.suggestions)))
+
         self.student_name_entry.update_idletasks()
         x = self.student_name_entry.winfo_x()
         y = (
@@ -428,39 +453,38 @@ class CheckOutPage(ctk.CTkFrame):
             + self.student_name_entry.winfo_height()
             + 2
         )
-        self.suggestion_frame = ctk.CTkFrame(
-            self.student_name_entry.master,
-            fg_color="#FFFFFF",
-            corner_radius=6,
-            border_width=1,
-            border_color="#CCCCCC",
-        )
         self.suggestion_frame.place(x=x, y=y)
-
-        self.suggestion_listbox = tk.Listbox(
-            self.suggestion_frame,
-            height=min(5, len(matches)),
-            width=28,
-            bg="white",
-            fg="#222222",
-            borderwidth=0,
-            highlightthickness=0,
-            selectbackground="#6A0032",
-            activestyle="none",
-        )
-        self.suggestion_listbox.pack(fill="both", expand=True)
-
-        for m in matches:
-            self.suggestion_listbox.insert("end", m)
-
-        self.suggestion_listbox.bind("<<ListboxSelect>>", self._select_autocomplete)
-        self.suggestion_listbox.bind("<Double-Button-1>", self._select_autocomplete)
+        self.suggestion_frame.lift()
+
+    def _suggestion_popup(self):
+        """Build the suggestion list once; later calls just refill it."""
+        if getattr(self, "suggestion_frame", None) is None:
+            self.suggestion_frame = ctk.CTkFrame(
+                self.student_name_entry.master,
+                fg_color="#FFFFFF",
+                corner_radius=6,
+                border_width=1,
+                border_color="#CCCCCC",
+            )
+            self.suggestion_listbox = tk.Listbox(
+                self.suggestion_frame,
+                width=28,
+                bg="white",
+                fg="#222222",
+                borderwidth=0,
+                highlightthickness=0,
+                selectbackground="#6A0032",
+                activestyle="none",
+            )
+            self.suggestion_listbox.pack(fill="both", expand=True)
+            self.suggestion_listbox.bind("<<ListboxSelect>>", self._select_autocomplete)
+            self.suggestion_listbox.bind("<Double-Button-1>", self._select_autocomplete)
+        return self.suggestion_listbox
 
     def _hide_suggestions(self, event=None):
+        self._suggest_text = None
         if getattr(self, "suggestion_frame", None) is not None:
-            self.suggestion_frame.destroy()
-            self.suggestion_frame = None
-            self.suggestion_listbox = None
+            self.suggestion_frame.place_forget()
 
     def _select_autocomplete(self, event=None):
         if not getattr(self, "suggestion_listbox", None):
@@ -468,46 +492,41 @@ class CheckOutPage(ctk.CTkFrame):
         selection = self.suggestion_listbox.curselection()
         if not selection:
             return
-        name = self.suggestion_listbox.get(selection[0])
+        name, student_id = self.suggestions[selection[0]]
         self.student_name_entry.delete(0, "end")
         self.student_name_entry.insert(0, name)
         self._hide_suggestions()
-        self._autofill_student_details(name)
-
-    def _autofill_student_details(self, name: str):
-        """Fill only the student ID from the most recent checkout."""
-        try:
-            conn = get_connection()
-            c = conn.cursor()
-            c.execute("""
-                SELECT student_id
-                FROM checkout
-                WHERE student_name = ?
-                ORDER BY checkout_time DESC
-                LIMIT 1
-            """, (name,))
-            row = c.fetchone()
-            conn.close()
-        except Exception as e:
-            print("Failed to fetch student details:", e)
-            row = None
+        self._autofill_student_details(student_id)
 
+    def _autofill_student_details(self, student_id):
+        """Fill the student ID of the picked student."""
         # Clear existing values
         self.student_id_entry.delete(0, "end")
         self.phone_entry.delete(0, "end")
         self.notes_entry.delete("1.0", "end")
 
-        if row:
-            student_id = row[0]
-            if student_id:
-                self.student_id_entry.insert(0, student_id)
+        if student_id:
+            self.student_id_entry.insert(0, student_id)
 
     # ---------- Confirm checkout ----------
     def get_selected_asset_ids(self):
         return [int(iid) for iid in self.checked_rows]
 
+    def _describe_asset(self, asset_id):
+        iid = str(asset_id)
+        if not self.tree.exists(iid):
+            asset = self.tag_cache.by_id(asset_id)
+            if asset is None:
+                return f"- asset #{asset_id}"
+            return f"- {asset.name} ({asset.tag})"
+        name, tag = self.tree.item(iid, "values")[:2]
+        return f"- {name} ({tag})"
+
     def confirm_checkout(self):
-        asset_ids = self.get_selected_asset_ids()
+        if self.scan_mode:
+            asset_ids = [asset.asset_id for asset in self.scan_cart.items]
+        else:
+            asset_ids = self.get_selected_asset_ids()
         student_name = self.student_name_entry.get().strip()
         student_id = self.student_id_entry.get().strip()
         # phone & notes kept local only (not stored in DB)
@@ -526,33 +545,25 @@ class CheckOutPage(ctk.CTkFrame):
 
         try:
             conn = get_connection()
-            c = conn.cursor()
-            
-            for aid in asset_ids:
-                checkout_time = michigan_now()
-
-                # We only insert fields that actually exist in the checkout table.
-                c.execute(
-                    """
-                    INSERT INTO checkout (
-                        asset_id, student_name, student_id, checkout_time, status
-                    )
-                    VALUES (?, ?, ?, ?, 'Checked Out')
-                    """,
-                    (aid, student_name, student_id, checkout_time),
-                )
-
-                c.execute(
-                    "UPDATE assets SET status = 'Checked Out' WHERE id = ?",
-                    (aid,),
-                )
-
-            conn.commit()
+            result = CheckoutRepository(conn).check_out(asset_ids, student_name, student_id)
             conn.close()
 
-            messagebox.showinfo("Success", "Asset(s) checked out successfully.")
+            if result.conflicts:
+                taken = "\n".join(self._describe_asset(a) for a in result.conflicts)
+                messagebox.showwarning(
+                    "Some assets unavailable",
+                    f"{len(result.checked_out)} asset(s) checked out.\n\n"
+                    f"These were no longer available and were skipped:\n{taken}",
+                )
+            elif not self.scan_mode:
+                messagebox.showinfo("Success", "Asset(s) checked out successfully.")
+            self._update_tag_cache(result, student_name)
+            for iid in list(self.checked_rows):
+                self._set_row_checked(iid, False)
             self.load_assets()
-            self.load_known_students()
+            if result.checked_out:
+                self._remember_student(student_name, student_id)
+            notify_data_changed(self)
 
             self.student_name_entry.delete(0, "end")
             self.student_id_entry.delete(0, "end")
@@ -561,3 +572,17 @@ class CheckOutPage(ctk.CTkFrame):
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to check out.\n\n{e}")
+
+    def _update_tag_cache(self, result, student_name):
+        """Patch the scan cache with this checkout instead of reloading it."""
+        if result.conflicts:
+            # another desk changed these assets: the cache is out of date
+            self.tag_cache.invalidate()
+            if self.scan_mode:
+                self._warm_tag_cache()
+        else:
+            self.tag_cache.update(
+                result.checked_out, status="Checked Out", student_name=student_name
+            )
+        if self.scan_mode:
+            self.scan_bar.clear(f"Checked out {len(result.checked_out)} asset(s).")
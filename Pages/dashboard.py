@@ -4,12 +4,13 @@ import tkinter as tk
 from tkinter import messagebox
 
 from db_conn import get_connection
-from Pages.Asset import AssetsPage
-from Pages.check_out import CheckOutPage
-from Pages.check_in import CheckInPage
-from Pages.students import StudentsPage 
-from Pages.staff import StaffPage   
-from Pages.settings import SettingsPage   
+from services.repositories import CheckoutRepository
+from services.stats import get_summary_stats
+from utils.virtual_table import VirtualTable
+from utils.page_cache import PageCache, DATA_CHANGED_EVENT
+from utils.db_watcher import DataVersionWatcher
+from utils.timefmt import format_ts
+from utils.page_registry import PageRegistry
 
 
 
@@ -25,6 +26,20 @@ COL_WIDTHS = [
     120,  # Student ID
     180   # Checked Out At
 ]
+COL_HEADERS = ["Asset Name", "Tag ID", "Student Name", "Student ID", "Checked Out At"]
+
+# Sub-pages kept alive between sidebar clicks (None = keep all of them)
+MAX_CACHED_PAGES = None
+
+# sidebar pages, imported on first visit or by the idle prewarm
+PAGES = PageRegistry({
+    "Assets": "Pages.Asset:AssetsPage",
+    "Check Out": "Pages.check_out:CheckOutPage",
+    "Check In": "Pages.check_in:CheckInPage",
+    "History": "Pages.students:StudentsPage",
+    "Staff": "Pages.staff:StaffPage",
+    "Settings": "Pages.settings:SettingsPage",
+})
 
 
 class DashboardPage(ctk.CTkFrame):
@@ -45,8 +60,8 @@ class DashboardPage(ctk.CTkFrame):
         self.first_name = first_name
         self.role = role
 
-        # will hold the scrollable list on the dashboard
-        self.checked_out_list_frame = None
+        # will hold the checked-out table on the dashboard
+        self.checked_out_table = None
 
         # ---------- Layout: sidebar + content ----------
         self.columnconfigure(0, weight=0)   # sidebar
@@ -136,14 +151,50 @@ class DashboardPage(ctk.CTkFrame):
 
         self.current_view = None
 
+        # built pages stay alive; nav clicks just swap them
+        self.pages = PageCache(self.content_frame, max_pages=MAX_CACHED_PAGES)
+
+        # any page that writes to the DB marks the others stale
+        self._data_changed_bind = self.winfo_toplevel().bind(
+            DATA_CHANGED_EVENT, self._on_data_changed, add="+"
+        )
+
+        # other desks' check-outs show up without a click; only polls
+        # while the dashboard page is visible
+        self.db_watcher = DataVersionWatcher(self, self.refresh_dashboard)
+
         # Show dashboard by default
         self.show_dashboard_view()
+        # only the pages this role has a button for
+        PAGES.prewarm(self, [name for name in self.nav_buttons if name in PAGES])
 
     # ---------- UTIL ----------
     def clear_content(self):
-        if self.current_view is not None:
+        """Hide the cached page and destroy any one-off view (placeholder)."""
+        if self.current_view is not None and self.current_view is not self.pages.current:
             self.current_view.destroy()
-            self.current_view = None
+        self.current_view = None
+        self.pages.hide_current()
+
+    def show_page(self, key, factory):
+        """Show a cached sub-page, building it on first visit."""
+        self.set_active_nav(key)
+        if self.current_view is not None and self.current_view is not self.pages.current:
+            self.current_view.destroy()
+        self.current_view = self.pages.show(key, factory)
+
+    def _on_data_changed(self, event=None):
+        # the visible page already reloaded itself after its write
+        self.pages.invalidate_all(except_current=True)
+
+    def destroy(self):
+        PAGES.cancel_prewarm(self)
+        self.db_watcher.close()
+        try:
+            self.winfo_toplevel().unbind(DATA_CHANGED_EVENT, self._data_changed_bind)
+        except tk.TclError:
+            pass
+        super().destroy()
     
     # ---------- SIDEBAR HIGHLIGHT ----------
     def set_active_nav(self, page_name):
@@ -155,10 +206,14 @@ class DashboardPage(ctk.CTkFrame):
 
     # ---------- DASHBOARD VIEW ----------
     def show_dashboard_view(self):
-        self.set_active_nav("Dashboard")
-        self.clear_content()
+        self.show_page("Dashboard", self._build_dashboard_view)
 
-        view = ctk.CTkFrame(self.content_frame, fg_color="#FFFFFF")
+    def _build_dashboard_view(self):
+        page = ctk.CTkFrame(self.content_frame, fg_color="#FFFFFF")
+        page.on_show = self._on_dashboard_show
+        page.on_hide = self.db_watcher.stop
+
+        view = ctk.CTkFrame(page, fg_color="#FFFFFF")
         view.pack(fill="both", expand=True, padx=20, pady=20)
 
         # Top bar
@@ -191,8 +246,9 @@ class DashboardPage(ctk.CTkFrame):
         stats_frame.pack(fill="x", pady=(20, 10))
 
         stats = self.get_summary_stats()
+        self.stat_labels = {}
 
-        def make_card(parent, title, value, extra, color):
+        def make_card(parent, key, title, value, extra, color):
             card = ctk.CTkFrame(parent, fg_color=CARD_BG, corner_radius=12)
             card.pack(side="left", expand=True, fill="x", padx=8)
 
@@ -201,23 +257,25 @@ class DashboardPage(ctk.CTkFrame):
                 font=ctk.CTkFont(size=13, weight="bold")
             ).pack(anchor="w", padx=16, pady=(10, 0))
 
-            ctk.CTkLabel(
+            value_label = ctk.CTkLabel(
                 card, text=str(value), text_color=color,
                 font=ctk.CTkFont(size=28, weight="bold")
-            ).pack(anchor="w", padx=16, pady=(2, 0))
+            )
+            value_label.pack(anchor="w", padx=16, pady=(2, 0))
+            self.stat_labels[key] = value_label
 
             ctk.CTkLabel(
                 card, text=extra, text_color="#777777",
                 font=ctk.CTkFont(size=12)
             ).pack(anchor="w", padx=16, pady=(0, 10))
 
-        make_card(stats_frame, "Total Assets", stats["total_assets"],
+        make_card(stats_frame, "total_assets", "Total Assets", stats["total_assets"],
                   "All items in inventory", "#1E88E5")
-        make_card(stats_frame, "Checked Out", stats["checked_out"],
+        make_card(stats_frame, "checked_out", "Checked Out", stats["checked_out"],
                   "Currently with students", "#D81B60")
-        make_card(stats_frame, "Available", stats["available"],
+        make_card(stats_frame, "available", "Available", stats["available"],
                   "Ready to check out", "#43A047")
-        make_card(stats_frame, "Staff Accounts", stats["total_users"],
+        make_card(stats_frame, "total_users", "Staff Accounts", stats["total_users"],
                   "Admin + staff users", "#FB8C00")
 
         # Main panel
@@ -250,109 +308,47 @@ class DashboardPage(ctk.CTkFrame):
         inner = ctk.CTkFrame(table_card, fg_color="#FFFFFF", corner_radius=16)
         inner.pack(fill="both", expand=True, padx=12, pady=12)
 
-        self.checked_out_list_frame = ctk.CTkScrollableFrame(
+        # windowed table: only the visible rows exist as widgets
+        self.checked_out_table = VirtualTable(
             inner,
-            fg_color="#FFFFFF"
+            columns=list(zip(COL_HEADERS, COL_WIDTHS)),
+            empty_text="No assets checked-out yet.",
+            empty_color="#0E7A52",
         )
-        self.checked_out_list_frame.pack(fill="both", expand=True)
+        self.checked_out_table.pack(fill="both", expand=True, padx=8, pady=8)
 
         self.load_checked_out_assets()
-        self.current_view = view
+        return page
+
+    def _on_dashboard_show(self, stale):
+        # check() also catches commits made while the page was hidden
+        changed = self.db_watcher.check()
+        if stale or changed:
+            self.refresh_dashboard()
+        self.db_watcher.start()
+
+    def refresh_dashboard(self):
+        """Re-query the stats cards and checked-out list in place."""
+        stats = self.get_summary_stats()
+        for key, label in self.stat_labels.items():
+            label.configure(text=str(stats[key]))
+        self.load_checked_out_assets()
 
     # ---------- LOAD CHECKED-OUT TABLE ----------
     def load_checked_out_assets(self):
         """Show all currently checked-out assets using checkout + assets join."""
-        # clear previous rows
-        for w in self.checked_out_list_frame.winfo_children():
-            w.destroy()
-
         try:
             conn = get_connection()
-            c = conn.cursor()
-            c.execute("""
-                SELECT a.asset_name,
-                       a.asset_tag_id,
-                       co.student_name,
-                       co.student_id,
-                       co.checkout_time
-                FROM checkout AS co
-                JOIN assets AS a ON co.asset_id = a.id
-                WHERE co.status = 'Checked Out'
-                ORDER BY co.checkout_time DESC
-            """)
-            rows = c.fetchall()
+            rows = [
+                (*r[:4], format_ts(r.checkout_at))
+                for r in CheckoutRepository(conn).open_checkouts()
+            ]
             conn.close()
         except Exception as e:
             messagebox.showerror("Error", f"Could not load checked-out assets.\n\n{e}")
             rows = []
 
-        if not rows:
-            ctk.CTkLabel(
-                self.checked_out_list_frame,
-                text="No assets checked-out yet.",
-                text_color="#0E7A52",
-                font=ctk.CTkFont(size=15, weight="bold")
-            ).pack(anchor="center", pady=16)
-            return
-
-        # HEADER
-        header_frame = ctk.CTkFrame(
-            self.checked_out_list_frame,
-            fg_color="#ECECEC",
-            corner_radius=8
-        )
-        header_frame.pack(fill="x", pady=(0, 0))
-
-        headers = ["Asset Name", "Tag ID", "Student Name", "Student ID", "Checked Out At"]
-
-        for col, (text, width) in enumerate(zip(headers, COL_WIDTHS)):
-            # let each column stretch while keeping a minimum width
-            header_frame.columnconfigure(col, minsize=width, weight=1)
-            ctk.CTkLabel(
-                header_frame,
-                text=text,
-                anchor="center",
-                text_color="#333333",
-                font=ctk.CTkFont(size=14, weight="bold")
-            ).grid(row=0, column=col, padx=2, pady=10, sticky="nsew")
-
-        # Dark separator under header
-        ctk.CTkFrame(
-            self.checked_out_list_frame,
-            fg_color="#C7C7C7",
-            height=1
-        ).pack(fill="x")
-
-        # ROWS
-        for i, (asset_name, tag_id, student_name, student_id, checkout_time) in enumerate(rows):
-            bg = "#FFFFFF" if i % 2 == 0 else "#F2F2F5"
-
-            row = ctk.CTkFrame(
-                self.checked_out_list_frame,
-                fg_color=bg,
-                corner_radius=6
-            )
-            row.pack(fill="x", pady=2)
-
-            row_data = [asset_name, tag_id, student_name, student_id, checkout_time]
-
-            for col, (text, width) in enumerate(zip(row_data, COL_WIDTHS)):
-                # each column in the row also stretches to fill full width
-                row.columnconfigure(col, minsize=width, weight=1)
-                ctk.CTkLabel(
-                    row,
-                    text=str(text),
-                    anchor="center",
-                    text_color="#1A1A1A",
-                    font=ctk.CTkFont(size=13)
-                ).grid(row=0, column=col, padx=2, pady=10, sticky="nsew")
-
-            # line after each row
-            ctk.CTkFrame(
-                self.checked_out_list_frame,
-                fg_color="#D5D5D5",
-                height=1
-            ).pack(fill="x")
+        self.checked_out_table.set_rows(rows)
 
     # ---------- SUMMARY ----------
     def get_summary_stats(self):
@@ -365,20 +361,7 @@ class DashboardPage(ctk.CTkFrame):
         }
         try:
             conn = get_connection()
-            c = conn.cursor()
-
-            c.execute("SELECT COUNT(*) FROM assets")
-            stats["total_assets"] = c.fetchone()[0] or 0
-
-            c.execute("SELECT COUNT(*) FROM assets WHERE status = 'Checked Out'")
-            stats["checked_out"] = c.fetchone()[0] or 0
-
-            c.execute("SELECT COUNT(*) FROM assets WHERE status = 'Available'")
-            stats["available"] = c.fetchone()[0] or 0
-
-            c.execute("SELECT COUNT(*) FROM users")
-            stats["total_users"] = c.fetchone()[0] or 0
-
+            stats.update(get_summary_stats(conn))
             conn.close()
         except Exception as e:
             messagebox.showerror("Error", f"Could not load dashboard stats.\n\n{e}")
@@ -386,41 +369,25 @@ class DashboardPage(ctk.CTkFrame):
 
     # ---------- NAV PAGES ----------
     def show_assets_page(self):
-        self.set_active_nav("Assets")
-        self.clear_content()
-        self.current_view = AssetsPage(self.content_frame)
-        self.current_view.pack(fill="both", expand=True)
+        self.show_page("Assets", lambda: PAGES.create("Assets", self.content_frame))
 
     def show_checkout_page(self):
-        self.set_active_nav("Check Out")
-        self.clear_content()
-        self.current_view = CheckOutPage(self.content_frame)
-        self.current_view.pack(fill="both", expand=True)
+        self.show_page("Check Out", lambda: PAGES.create("Check Out", self.content_frame))
 
     def show_checkin_page(self):
-        self.set_active_nav("Check In")
-        self.clear_content()
-        self.current_view = CheckInPage(self.content_frame)
-        self.current_view.pack(fill="both", expand=True)
+        self.show_page("Check In", lambda: PAGES.create("Check In", self.content_frame))
 
     def show_students_page(self):
         """Show the Students management page inside content_frame."""
-        self.set_active_nav("History")
-        self.clear_content()
-        self.current_view = StudentsPage(self.content_frame)
-        self.current_view.pack(fill="both", expand=True)
-    
+        self.show_page("History", lambda: PAGES.create("History", self.content_frame))
+
     def show_staff_page(self):
-        self.set_active_nav("Staff")
-        self.clear_content()
-        self.current_view = StaffPage(self.content_frame)
-        self.current_view.pack(fill="both", expand=True)
+        self.show_page("Staff", lambda: PAGES.create("Staff", self.content_frame))
 
     def show_settings_page(self):
-        self.set_active_nav("Settings")
-        self.clear_content()
-        self.current_view = SettingsPage(self.content_frame, self.user_id)
-        self.current_view.pack(fill="both", expand=True)
+        self.show_page(
+            "Settings", lambda: PAGES.create("Settings", self.content_frame, self.user_id)
+        )
 
     def show_placeholder(self, title, text):
         self.clear_content()
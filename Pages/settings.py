@@ -1,6 +1,8 @@
 import customtkinter as ctk
-from Pages.sign_in import hash_password
 from db_conn import get_connection
+from services.repositories import UserRepository
+from services.users import change_password as change_user_password
+from utils.page_cache import notify_data_changed
 
 TEXT_DARK = "#222222"
 MAROON = "#6A0032"
@@ -172,35 +174,25 @@ class SettingsPage(ctk.CTkFrame):
     # ======================================================
     def _load_user(self):
         conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "SELECT first_name, last_name, email FROM users WHERE id=?",
-            (self.user_id,)
-        )
-        row = c.fetchone()
+        user = UserRepository(conn).get(self.user_id)
         conn.close()
 
-        if row:
-            self.first_name.insert(0, row[0])
-            self.last_name.insert(0, row[1])
-            self.email.insert(0, row[2])
+        if user:
+            self.first_name.insert(0, user.first_name)
+            self.last_name.insert(0, user.last_name)
+            self.email.insert(0, user.email)
 
     def update_profile(self):
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("""
-            UPDATE users
-            SET first_name=?, last_name=?, email=?
-            WHERE id=?
-        """, (
+        UserRepository(conn).update(
+            self.user_id,
             self.first_name.get().strip(),
             self.last_name.get().strip(),
             self.email.get().strip(),
-            self.user_id
-        ))
-        conn.commit()
+        )
         conn.close()
 
+        notify_data_changed(self)
         self.show_toast("Profile updated successfully")
 
     def change_password(self):
@@ -218,48 +210,22 @@ class SettingsPage(ctk.CTkFrame):
 
         try:
             conn = get_connection()
-            c = conn.cursor()
-
-            c.execute(
-                "SELECT password FROM users WHERE id=?",
-                (self.user_id,)
-            )
-            row = c.fetchone()
-
-            if not row:
+            try:
+                change_user_password(conn, self.user_id, current, new)
+            finally:
                 conn.close()
-                self.show_toast("User not found", success=False)
-                return
-
-            stored_pw = row[0]
-
-            # ✅ hash the typed current password
-            typed_hash = hash_password(current)
-
-            # ✅ allow legacy plaintext OR hashed comparison
-            if stored_pw != current and stored_pw != typed_hash:
-                conn.close()
-                self.show_toast("Current password is incorrect", success=False)
-                return
-
-            # ✅ store NEW password as hash
-            new_hash = hash_password(new)
-
-            c.execute(
-                "UPDATE users SET password=? WHERE id=?",
-                (new_hash, self.user_id)
-            )
-            conn.commit()
-            conn.close()
-
-            # Clear fields
-            self.current_pw.delete(0, "end")
-            self.new_pw.delete(0, "end")
-            self.confirm_pw.delete(0, "end")
-
-            self.show_toast("Password updated successfully")
-
+        except ValueError as e:
+            self.show_toast(str(e), success=False)
+            return
         except Exception as e:
             self.show_toast(f"Error: {e}", success=False)
+            return
+
+        # Clear fields
+        self.current_pw.delete(0, "end")
+        self.new_pw.delete(0, "end")
+        self.confirm_pw.delete(0, "end")
+
+        self.show_toast("Password updated successfully")
 
             
\ No newline at end of file
@@ -3,17 +3,13 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
 from db_conn import get_connection
-import hashlib  # ✅ added
+from services.users import authenticate
 
 HEADER_BG = "#6A0032"
 BUTTON_BG = "#6A0032"
 BORDER_COLOR = "#E0E0E0"
 
 
-def hash_password(pw: str) -> str:
-    return hashlib.sha256(pw.encode()).hexdigest()
-
-
 def handle_login(self):
     email = self.email_entry.get().strip().lower()
     pw = self.password_entry.get().strip()
@@ -22,43 +18,13 @@ def handle_login(self):
         return None
 
     conn = get_connection()
-    c = conn.cursor()
-
-    # ✅ Fetch stored password and compare in Python (supports hash + plaintext)
-    c.execute(
-        "SELECT id, first_name, role, password FROM users WHERE email=?",
-        (email,)
-    )
-    row = c.fetchone()
-
-    if not row:
+    try:
+        user = authenticate(conn, email, pw)
+    finally:
         conn.close()
+    if user is None:
         return None
-
-    user_id, first_name, role, stored_pw = row
-
-    typed_hash = hash_password(pw)
-
-    # ✅ Accept either:
-    # - stored password is plaintext (legacy)
-    # - stored password is sha256 hash (new)
-    ok = (stored_pw == pw) or (stored_pw == typed_hash)
-
-    if ok:
-        # ✅ Optional: migrate plaintext -> hashed automatically after successful login
-        # (so everything becomes consistent going forward)
-        if stored_pw == pw and stored_pw != typed_hash:
-            try:
-                c.execute("UPDATE users SET password=? WHERE id=?", (typed_hash, user_id))
-                conn.commit()
-            except Exception:
-                pass
-
-        conn.close()
-        return (user_id, first_name, role)
-
-    conn.close()
-    return None
+    return (user.id, user.first_name, user.role)
 
 
 class SignInPage(ctk.CTkFrame):
@@ -7,6 +7,7 @@ HEADER_BG = "#6A0032"       # maroon
 BUTTON_BG = "#6A0032"
 
 from db_conn import get_connection
+from services.users import register_staff
 
 
 class SignUpPage(ctk.CTkFrame):
@@ -180,16 +181,8 @@ class SignUpPage(ctk.CTkFrame):
             return
 
         conn = get_connection()
-        c = conn.cursor()
         try:
-            c.execute(
-                """
-                INSERT INTO users (first_name, last_name, email, password, role)
-                VALUES (?, ?, ?, ?, 'staff')
-                """,
-                (first, last, email, pw),
-            )
-            conn.commit()
+            register_staff(conn, first, last, email, pw)
 
             messagebox.showinfo(
                 "Success",
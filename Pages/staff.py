@@ -1,6 +1,10 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from db_conn import get_connection
+from services.repositories import UserRepository
+from services.users import add_staff
+from utils.page_cache import notify_data_changed
+from utils.ui_resources import define_style
 
 TEXT_DARK = "#222222"
 CARD_BG = "#F5F5F5"
@@ -48,10 +52,8 @@ class StaffPage(ctk.CTkFrame):
         tree_container = ttk.Frame(main_frame)
         tree_container.pack(fill="both", expand=True)
 
-        style = ttk.Style()
-        style.theme_use("clam")
-
-        style.configure(
+        define_style(
+            self,
             "Staff.Treeview",
             background=CARD_BG,
             fieldbackground=CARD_BG,
@@ -59,7 +61,8 @@ class StaffPage(ctk.CTkFrame):
             font=("Inter", 12),
             rowheight=36,
         )
-        style.configure(
+        define_style(
+            self,
             "Staff.Treeview.Heading",
             background="#EEEEEE",
             foreground="#444444",
@@ -99,12 +102,15 @@ class StaffPage(ctk.CTkFrame):
 
         self.load_staff()
 
+    # ---------- PAGE CACHE HOOKS ----------
+    def on_show(self, stale):
+        if stale:
+            self.load_staff()
+
     # ---------- ADMIN COUNT ----------
     def admin_count(self):
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM users WHERE role='admin'")
-        count = c.fetchone()[0]
+        count = UserRepository(conn).admin_count()
         conn.close()
         return count
 
@@ -113,24 +119,21 @@ class StaffPage(ctk.CTkFrame):
         self.tree.delete(*self.tree.get_children())
 
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("""
-            SELECT id,
-                   first_name || ' ' || last_name,
-                   email,
-                   role
-            FROM users
-            ORDER BY first_name
-        """)
-        rows = c.fetchall()
+        users = UserRepository(conn).all()
         conn.close()
 
-        for uid, name, email, role in rows:
+        for user in users:
             self.tree.insert(
                 "",
                 "end",
-                iid=str(uid),
-                values=(name, email, role, "✏️", "🗑️"),
+                iid=str(user.id),
+                values=(
+                    f"{user.first_name} {user.last_name}",
+                    user.email,
+                    user.role,
+                    "✏️",
+                    "🗑️",
+                ),
             )
 
     # ---------- TABLE CLICK ----------
@@ -154,16 +157,13 @@ class StaffPage(ctk.CTkFrame):
 
     def open_edit_staff_dialog(self, user_id):
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("""
-            SELECT first_name, last_name, email, role
-            FROM users WHERE id=?
-        """, (user_id,))
-        row = c.fetchone()
+        user = UserRepository(conn).get(user_id)
         conn.close()
 
-        if row:
-            self._staff_dialog(user_id, *row)
+        if user:
+            self._staff_dialog(
+                user_id, user.first_name, user.last_name, user.email, user.role
+            )
 
     def _staff_dialog(self, user_id=None, first_name="", last_name="", email="", role="staff"):
         dialog = ctk.CTkToplevel(self)
@@ -232,24 +232,14 @@ class StaffPage(ctk.CTkFrame):
                     return
 
             conn = get_connection()
-            c = conn.cursor()
-
             if user_id:
-                c.execute("""
-                    UPDATE users
-                    SET first_name=?, last_name=?, email=?, role=?
-                    WHERE id=?
-                """, (fn, ln, em, rl, user_id))
+                UserRepository(conn).update(user_id, fn, ln, em, rl)
             else:
-                c.execute("""
-                    INSERT INTO users (first_name, last_name, email, password, role)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (fn, ln, em, "temp123", rl))
-
-            conn.commit()
+                add_staff(conn, fn, ln, em, rl)
             conn.close()
             dialog.destroy()
             self.load_staff()
+            notify_data_changed(self)
 
         ctk.CTkButton(
             btn_frame, text="Cancel", width=100,
@@ -266,19 +256,17 @@ class StaffPage(ctk.CTkFrame):
     # ---------- DELETE STAFF ----------
     def confirm_delete_staff(self, user_id):
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("SELECT first_name, last_name, role FROM users WHERE id=?", (user_id,))
-        row = c.fetchone()
+        users = UserRepository(conn)
+        user = users.get(user_id)
 
-        if not row:
+        if not user:
             conn.close()
             return
 
-        name = f"{row[0]} {row[1]}"
-        role = row[2]
+        name = f"{user.first_name} {user.last_name}"
 
         # 🚨 Prevent deleting last admin
-        if role == "admin" and self.admin_count() <= 1:
+        if user.role == "admin" and users.admin_count() <= 1:
             messagebox.showerror(
                 "Not Allowed",
                 "You cannot delete the last admin account."
@@ -293,10 +281,10 @@ class StaffPage(ctk.CTkFrame):
             conn.close()
             return
 
-        c.execute("DELETE FROM users WHERE id=?", (user_id,))
-        conn.commit()
+        users.delete(user_id)
         conn.close()
         self.load_staff()
+        notify_data_changed(self)
 
     def _center_window(self, window, w, h):
         window.update_idletasks()
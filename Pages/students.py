@@ -1,24 +1,19 @@
 # Pages/students.py
 import customtkinter as ctk
-from tkinter import ttk, messagebox
-
-from datetime import datetime
-from zoneinfo import ZoneInfo
-
-def michigan_now():
-    return datetime.now(ZoneInfo("America/Detroit")).strftime("%Y-%m-%d %H:%M:%S")
-
-def to_michigan(ts: str | None):
-    if not ts:
-        return "-"
-    return ts  # already Michigan time
-
-
+from tkinter import ttk, messagebox, filedialog
 
 from db_conn import get_connection
+from services.export import export_history
+from services.search import search_history, count_history, HISTORY_PAGE_SIZE
+from utils.search_controller import SearchController
+from utils.progress_dialog import run_with_progress
+from utils.timefmt import format_ts
+from utils.ui_resources import define_style
 
 CARD_BG = "#F5F5F5"
 TEXT_DARK = "#222222"
+# fetch the next page once the scrollbar's bottom edge passes this
+LOAD_MORE_AT = 0.9
 
 
 class StudentsPage(ctk.CTkFrame):
@@ -33,7 +28,7 @@ class StudentsPage(ctk.CTkFrame):
         - Student ID
         - Asset Tag ID
         - Checkout Time
-        - Return Time (checkin_time, may be NULL)
+        - Return Time (checkin_at, may be NULL)
         - Status (Checked Out / Returned)
         """
         super().__init__(master, fg_color="#FFFFFF")
@@ -68,6 +63,27 @@ class StudentsPage(ctk.CTkFrame):
         self.search_entry.pack(side="right")
         self.search_entry.bind("<KeyRelease>", self._on_search_changed)
 
+        ctk.CTkButton(
+            top_bar,
+            text="Export",
+            width=90,
+            height=32,
+            fg_color="#E0E0E0",
+            hover_color="#CCCCCC",
+            text_color=TEXT_DARK,
+            command=self.open_export_dialog,
+        ).pack(side="right", padx=(0, 12))
+
+        # archived (old returned) checkouts are only searched on request
+        self.include_archive_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            top_bar,
+            text="Include archive",
+            variable=self.include_archive_var,
+            command=self._on_archive_toggled,
+            text_color=TEXT_DARK,
+        ).pack(side="right", padx=(0, 12))
+
         # ---------- Table container ----------
         table_frame = ctk.CTkFrame(self, fg_color="#FFFFFF")
         table_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -76,33 +92,28 @@ class StudentsPage(ctk.CTkFrame):
         tree_container.pack(fill="both", expand=True)
 
         # ---------- Treeview styling ----------
-        style = ttk.Style()
-        try:
-            style.theme_use("clam")
-        except Exception:
-            pass
-
-        style.configure(
+        define_style(
+            self,
             "Students.Treeview",
             background=CARD_BG,
             fieldbackground=CARD_BG,
             foreground=TEXT_DARK,
             rowheight=26,
             borderwidth=1,
-            relief="solid"
+            relief="solid",
+            map={
+                "background": [("selected", "#D6E4FF")],
+                "foreground": [("selected", "#000000")],
+            },
         )
-        style.configure(
+        define_style(
+            self,
             "Students.Treeview.Heading",
             background="#EEEEEE",
             foreground="#444444",
             relief="raised",
             borderwidth=1,
-            font=("Inter", 12, "bold")
-        )
-        style.map(
-            "Students.Treeview",
-            background=[("selected", "#D6E4FF")],
-            foreground=[("selected", "#000000")]
+            font=("Inter", 12, "bold"),
         )
 
         # Columns: Student | Student ID | Asset Tag ID | Checkout Time | Return Time | Status
@@ -145,7 +156,8 @@ class StudentsPage(ctk.CTkFrame):
             orient="vertical",
             command=self.tree.yview
         )
-        self.tree.configure(yscroll=scrollbar.set)
+        self.scrollbar = scrollbar
+        self.tree.configure(yscroll=self._on_tree_scroll)
 
         self.tree.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
@@ -164,99 +176,221 @@ class StudentsPage(ctk.CTkFrame):
         )
         self.info_label.pack(anchor="w", pady=(6, 0))
 
+        # keyset paging state for the current query
+        self._query = ""
+        self._include_archive = False
+        self._cursor = None        # (checkout_at, id) of the last loaded row
+        self._shown = 0
+        self._exhausted = False
+        self._more_pending = False
+        self._count_cache = {}     # (query, include_archive) -> total rows
+
+        # typing in the search box queries on a worker thread; the total
+        # for the footer is counted separately so the first page is not
+        # held up by it
+        self.search = SearchController(
+            self, self._first_page, self._show_rows, self._on_search_error
+        )
+        self.counter = SearchController(
+            self, self._count, self._show_count, self._on_search_error, delay_ms=0
+        )
+
         # Load initial data
         self.load_students()
 
+    def destroy(self):
+        self.search.shutdown()
+        self.counter.shutdown()
+        super().destroy()
+
+    # ---------- Page cache hooks ----------
+    def on_show(self, stale):
+        if stale:
+            self._count_cache.clear()
+            self.load_students(*self._current_filters())
+
+    def on_hide(self):
+        self.search.cancel()
+        self.counter.cancel()
+
     # ---------- Search handler ----------
+    def _current_filters(self):
+        return self.search_entry.get().strip(), self.include_archive_var.get()
+
     def _on_search_changed(self, event=None):
-        query = self.search_entry.get().strip()
-        self.load_students(query=query)
+        self.search.schedule(*self._current_filters())
+
+    def _on_archive_toggled(self):
+        self.search.run_now(*self._current_filters())
+
+    def _on_search_error(self, error):
+        messagebox.showerror("Error", f"Failed to load student history.\n\n{error}")
 
     # ---------- Load data from DB ----------
-    def load_students(self, query: str = ""):
+    # worker-thread query functions; they return the query with the
+    # result so late results can be matched to what is on screen
+    @staticmethod
+    def _first_page(conn, query, include_archive=False):
+        rows = search_history(conn, query, include_archive=include_archive)
+        return (query, include_archive), rows
+
+    @staticmethod
+    def _count(conn, query, include_archive=False):
+        total = count_history(conn, query, include_archive=include_archive)
+        return (query, include_archive), total
+
+    def load_students(self, query: str = "", include_archive: bool = False):
         """
-        Loads checkout history with student + asset details:
+        Loads the first page of checkout history with student + asset details:
 
         | Student | Student ID | Asset Tag ID | Checkout Time | Return Time | Status |
         from:
-        - checkout (student_name, student_id, checkout_time, checkin_time, status)
+        - checkout (student_name, student_id, checkout_at, checkin_at, status)
         - assets (asset_tag_id)
+        Further pages are loaded as the table is scrolled.
         """
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
         try:
             conn = get_connection()
-            c = conn.cursor()
-
-            sql = """
-                SELECT
-                    COALESCE(NULLIF(TRIM(co.student_name), ''), 'Unknown') AS s_name,
-                    COALESCE(NULLIF(TRIM(co.student_id), ''), '-') AS s_id,
-                    COALESCE(NULLIF(TRIM(a.asset_tag_id), ''), '-') AS tag_id,
-                    co.checkout_time,
-                    co.checkin_time,
-                    co.status
-                FROM checkout AS co
-                JOIN assets AS a
-                    ON co.asset_id = a.id
-                WHERE 1=1
-            """
-            params = []
-
-            if query:
-                sql += """
-                    AND (
-                        co.student_name LIKE ?
-                        OR co.student_id LIKE ?
-                        OR a.asset_tag_id LIKE ?
-                    )
-                """
-                q = f"%{query}%"
-                params.extend([q, q, q])
-
-            sql += """
-                ORDER BY co.checkout_time DESC
-            """
-
-            c.execute(sql, params)
-            rows = c.fetchall()
+            result = self._first_page(conn, query, include_archive)
             conn.close()
-
-            if not rows:
-                if query:
-                    self.info_label.configure(
-                        text="No records matched your search."
-                    )
-                else:
-                    self.info_label.configure(
-                        text="No student checkouts yet. History will appear here after check-outs."
-                    )
+        except Exception as e:
+            self._on_search_error(e)
+            return
+
+        self._show_rows(result)
+
+    def _show_rows(self, result):
+        key, rows = result
+        self._query, self._include_archive = key
+        self._cursor = None
+        self._exhausted = False
+        self._shown = 0
+
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._append_rows(rows)
+        self.tree.yview_moveto(0)
+
+        if key not in self._count_cache:
+            if self._exhausted:
+                # everything fits on one page: no need to count
+                self._count_cache[key] = len(rows)
+            else:
+                self.counter.run_now(*key)
+        self._update_info()
+
+    def _append_rows(self, rows):
+        for r in rows:
+            checkout_id, s_name, s_id, tag_id, checkout_at, return_at, status = r
+
+            # Display "-" if return_at is NULL
+            checkout_time = format_ts(checkout_at)
+            display_return = format_ts(return_at)
+
+            self.tree.insert(
+                "",
+                "end",
+                iid=str(checkout_id),
+                values=(
+                    s_name,
+                    s_id,
+                    tag_id,
+                    checkout_time,
+                    display_return,
+                    status,
+                )
+            )
+
+        self._shown += len(rows)
+        if rows:
+            last = rows[-1]
+            self._cursor = (last[4], last[0])
+        if len(rows) < HISTORY_PAGE_SIZE:
+            self._exhausted = True
+
+    # ---------- Infinite scroll ----------
+    def _on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= LOAD_MORE_AT and not self._exhausted and not self._more_pending:
+            # don't insert rows from inside Tk's scroll callback
+            self._more_pending = True
+            self.after_idle(self._load_more)
+
+    def _load_more(self):
+        self._more_pending = False
+        if self._exhausted:
+            return
+        try:
+            conn = get_connection()
+            rows = search_history(
+                conn, self._query, after=self._cursor,
+                include_archive=self._include_archive,
+            )
+            conn.close()
+        except Exception as e:
+            self._exhausted = True
+            self._on_search_error(e)
+            return
+
+        self._append_rows(rows)
+        self._update_info()
+
+    # ---------- Footer ----------
+    def _show_count(self, result):
+        key, total = result
+        self._count_cache[key] = total
+        if key == (self._query, self._include_archive):
+            self._update_info()
+
+    def _update_info(self):
+        shown = self._shown
+        if not shown:
+            if self._query:
+                self.info_label.configure(
+                    text="No records matched your search."
+                )
             else:
                 self.info_label.configure(
-                    text=f"{len(rows)} record(s) found."
+                    text="No student checkouts yet. History will appear here after check-outs."
                 )
-
-            for r in rows:
-                s_name, s_id, tag_id, checkout_time, return_time, status = r
-
-                # Display "-" if return_time is NULL
-                checkout_time = to_michigan(checkout_time)
-                display_return = to_michigan(return_time)
-
-
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        s_name,
-                        s_id,
-                        tag_id,
-                        checkout_time,
-                        display_return,
-                        status,
-                    )
+            return
+
+        total = self._count_cache.get((self._query, self._include_archive))
+        if total is None or total == shown:
+            text = f"{shown} record(s) found." if self._exhausted else f"{shown}+ record(s) found."
+        else:
+            text = f"Showing {shown} of {total} record(s)."
+        self.info_label.configure(text=text)
+
+    # ---------- Export ----------
+    def open_export_dialog(self):
+        """Export every row matching the current search (not just loaded pages)."""
+        query, include_archive = self._current_filters()
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export History",
+            defaultextension=".csv",
+            initialfile="checkout_history.csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")],
+        )
+        if not path:
+            return
+
+        def job(progress, cancelled):
+            conn = get_connection("read-only-report")
+            try:
+                return export_history(
+                    conn, path, query, include_archive,
+                    progress=progress, cancelled=cancelled,
                 )
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load student history.\n\n{e}")
+            finally:
+                conn.close()
+
+        run_with_progress(
+            self, "Exporting history", job,
+            on_done=lambda n: messagebox.showinfo(
+                "Export complete", f"Exported {n} record(s) to:\n{path}"
+            ),
+            error_title="Export failed",
+        )
@@ -0,0 +1,240 @@
+"""
+Headless command line for nightly jobs and bulk fixes.
+
+    python -m assetmanager assets list [--search TEXT] [--available]
+    python -m assetmanager assets add NAME TAG [--status --location --category]
+    python -m assetmanager assets import new_room.csv
+    python -m assetmanager assets export assets.csv [--format jsonl]
+    python -m assetmanager checkout --name "Jane Doe" --student-id 123 TAG [TAG ...]
+    python -m assetmanager checkin TAG [TAG ...]
+    python -m assetmanager stats [--verify]
+    python -m assetmanager vacuum
+
+Uses the same service functions as the pages and never imports
+tkinter/customtkinter/PIL. Service modules are imported inside each
+command so startup only pays for the command that runs. Set
+ASSET_MANAGER_DB to work on a database other than the app's.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+from db_conn import get_connection, open_connection
+from services.asset_import import IMPORT_STATUSES
+
+
+def _print_rows(header, rows):
+    print("\t".join(header))
+    for row in rows:
+        print("\t".join("" if v is None else str(v) for v in row))
+
+
+# ---------- ASSETS ----------
+def cmd_assets_list(args):
+    conn = get_connection("read-only-report")
+    try:
+        from services.repositories import AssetRepository
+        assets = AssetRepository(conn)
+        if args.search or args.available:
+            rows = assets.search(args.search or "", args.available)
+        else:
+            rows = assets.all()
+    finally:
+        conn.close()
+    _print_rows(("id", "asset_name", "asset_tag_id", "status", "location", "category"), rows)
+    return 0
+
+
+def cmd_assets_add(args):
+    from services.repositories import AssetRepository
+
+    conn = get_connection()
+    try:
+        asset_id = AssetRepository(conn).add(args.name, args.tag, args.status,
+                                             args.location, args.category)
+    finally:
+        conn.close()
+    print(f"Added asset #{asset_id} ({args.tag}).")
+    return 0
+
+
+def cmd_assets_import(args):
+    from services.asset_import import import_assets, summary
+
+    conn = get_connection("bulk-import")
+    try:
+        result = import_assets(conn, args.path)
+    finally:
+        conn.close()
+    print(summary(result))
+    return 1 if result.rejected else 0
+
+
+def cmd_assets_export(args):
+    from services.export import export_assets
+
+    conn = get_connection("read-only-report")
+    try:
+        n = export_assets(conn, args.path, args.format)
+    finally:
+        conn.close()
+    print(f"Exported {n} asset(s) to {args.path}.")
+    return 0
+
+
+# ---------- CHECK OUT / CHECK IN ----------
+def _report_unknown(tags, found, what):
+    unknown = [t for t in dict.fromkeys(tags) if t not in found]
+    for tag in unknown:
+        print(f"  {tag}: {what}", file=sys.stderr)
+    return unknown
+
+
+def cmd_checkout(args):
+    from services.repositories import AssetRepository, CheckoutRepository
+
+    conn = get_connection()
+    try:
+        ids = AssetRepository(conn).ids_for_tags(args.tags)
+        unknown = _report_unknown(args.tags, ids, "unknown tag")
+        result = CheckoutRepository(conn).check_out(ids.values(), args.name, args.student_id)
+    finally:
+        conn.close()
+
+    tag_for = {asset_id: tag for tag, asset_id in ids.items()}
+    for asset_id in result.conflicts:
+        print(f"  {tag_for[asset_id]}: not available", file=sys.stderr)
+    print(f"Checked out {len(result.checked_out)} asset(s) to {args.name} ({args.student_id}).")
+    return 1 if unknown or result.conflicts else 0
+
+
+def cmd_checkin(args):
+    from services.repositories import CheckoutRepository
+
+    conn = get_connection()
+    try:
+        checkouts = CheckoutRepository(conn)
+        open_ids = checkouts.open_ids_for_tags(args.tags)
+        not_out = _report_unknown(args.tags, open_ids, "unknown tag or not checked out")
+        result = checkouts.check_in(open_ids.values())
+    finally:
+        conn.close()
+
+    skipped = len(result.already_returned) + len(result.missing)
+    print(f"Checked in {len(result.returned)} asset(s).")
+    if skipped:
+        print(f"{skipped} item(s) were checked in elsewhere meanwhile.", file=sys.stderr)
+    return 1 if not_out or skipped else 0
+
+
+# ---------- MAINTENANCE ----------
+def cmd_stats(args):
+    from services.stats import get_summary_stats, has_counters, verify_stats
+
+    conn = get_connection("read-only-report")
+    try:
+        for key, value in get_summary_stats(conn).items():
+            print(f"{key}: {value}")
+        if not args.verify:
+            return 0
+        if not has_counters(conn):
+            print("stat_counters table missing; run migrate.py first.", file=sys.stderr)
+            return 1
+        drift = verify_stats(conn)
+    finally:
+        conn.close()
+
+    for (kind, name), (stored, actual) in sorted(drift.items()):
+        print(f"drift {kind}/{name or '(blank)'}: stored {stored}, actual {actual}")
+    return 1 if drift else 0
+
+
+def cmd_vacuum(args):
+    # VACUUM rewrites the whole file: use a private connection, not a
+    # pooled one other threads could be holding a read transaction on
+    conn = open_connection()
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA optimize")
+        size = conn.execute(
+            "SELECT page_count * page_size FROM pragma_page_count, pragma_page_size"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    print(f"Database compacted ({size / 1024 / 1024:.1f} MB).")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m assetmanager", description="Asset Manager command line."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    assets = commands.add_parser("assets", help="list, add, import or export assets")
+    asset_commands = assets.add_subparsers(dest="action", required=True)
+
+    p = asset_commands.add_parser("list", help="print assets as tab-separated rows")
+    p.add_argument("--search", help="same search as the Check Out page")
+    p.add_argument("--available", action="store_true", help="only Available assets")
+    p.set_defaults(func=cmd_assets_list)
+
+    p = asset_commands.add_parser("add", help="add one asset")
+    p.add_argument("name")
+    p.add_argument("tag")
+    p.add_argument("--status", default="Available", choices=IMPORT_STATUSES)
+    p.add_argument("--location", default="")
+    p.add_argument("--category", default="")
+    p.set_defaults(func=cmd_assets_add)
+
+    p = asset_commands.add_parser("import", help="bulk add/update assets from a CSV")
+    p.add_argument("path")
+    p.set_defaults(func=cmd_assets_import)
+
+    p = asset_commands.add_parser("export", help="write every asset to CSV or JSONL")
+    p.add_argument("path")
+    p.add_argument("--format", choices=("csv", "jsonl"),
+                   help="override the format implied by the file extension")
+    p.set_defaults(func=cmd_assets_export)
+
+    p = commands.add_parser("checkout", help="check out assets by tag to one student")
+    p.add_argument("--name", required=True, help="student name")
+    p.add_argument("--student-id", required=True)
+    p.add_argument("tags", nargs="+", metavar="TAG")
+    p.set_defaults(func=cmd_checkout)
+
+    p = commands.add_parser("checkin", help="check in assets by tag")
+    p.add_argument("tags", nargs="+", metavar="TAG")
+    p.set_defaults(func=cmd_checkin)
+
+    p = commands.add_parser("stats", help="print the dashboard numbers")
+    p.add_argument("--verify", action="store_true",
+                   help="also compare counters with live COUNT(*)")
+    p.set_defaults(func=cmd_stats)
+
+    p = commands.add_parser("vacuum", help="checkpoint, compact and optimize the database")
+    p.set_defaults(func=cmd_vacuum)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        status = args.func(args)
+        sys.stdout.flush()
+        return status
+    except BrokenPipeError:
+        # output piped into `head` and the like: stop quietly, and keep
+        # the interpreter's final flush from raising again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except (ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Per-call latency of opening a DB connection: the old "new sqlite3
+connection per query" path vs. the shared pool in db_conn.
+
+Run from the repo root:
+    python benchmarks/bench_connections.py [iterations]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import db_conn  # noqa: E402
+
+
+def make_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE assets (id INTEGER PRIMARY KEY, asset_name TEXT, status TEXT)")
+    conn.executemany(
+        "INSERT INTO assets (asset_name, status) VALUES (?, 'Available')",
+        [(f"Asset {i}",) for i in range(1000)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def per_call_unpooled(path):
+    # what get_connection() used to do on every call
+    os.path.exists(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("SELECT COUNT(*) FROM assets WHERE status = 'Available'").fetchone()
+    conn.close()
+
+
+def per_call_pooled():
+    conn = db_conn.get_connection()
+    conn.execute("SELECT COUNT(*) FROM assets WHERE status = 'Available'").fetchone()
+    conn.close()
+
+
+def timeit(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        make_db(path)
+        db_conn.configure_pool(path)
+
+        old = timeit(lambda: per_call_unpooled(path), iterations)
+        new = timeit(per_call_pooled, iterations)
+        db_conn.get_pool().close_all()
+
+    print(f"iterations:        {iterations}")
+    print(f"new connection:    {old:8.1f} us/call")
+    print(f"pooled connection: {new:8.1f} us/call")
+    print(f"speedup:           {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
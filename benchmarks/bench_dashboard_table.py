@@ -0,0 +1,98 @@
+"""
+Dashboard "Checked Out Assets" list: the old one-CTkFrame-plus-labels-per-row
+rendering vs. utils.virtual_table.VirtualTable.
+
+Needs a display; on a headless box run it under Xvfb:
+    xvfb-run -a python benchmarks/bench_dashboard_table.py [rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tkinter as tk  # noqa: E402
+
+from utils.virtual_table import VirtualTable  # noqa: E402
+
+COL_WIDTHS = [160, 80, 160, 120, 180]
+HEADERS = ["Asset Name", "Tag ID", "Student Name", "Student ID", "Checked Out At"]
+
+
+def make_rows(n):
+    return [
+        (f"Basketball {i}", f"P{i}", f"Student {i}", f"S{100000 + i}",
+         "2025-01-15 14:32:00")
+        for i in range(n)
+    ]
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def render_old(root, rows):
+    """The pre-virtualization DashboardPage.load_checked_out_assets loop."""
+    import customtkinter as ctk
+
+    frame = ctk.CTkScrollableFrame(root, fg_color="#FFFFFF")
+    frame.pack(fill="both", expand=True)
+
+    for i, row_data in enumerate(rows):
+        bg = "#FFFFFF" if i % 2 == 0 else "#F2F2F5"
+        row = ctk.CTkFrame(frame, fg_color=bg, corner_radius=6)
+        row.pack(fill="x", pady=2)
+        for col, (text, width) in enumerate(zip(row_data, COL_WIDTHS)):
+            row.columnconfigure(col, minsize=width, weight=1)
+            ctk.CTkLabel(
+                row, text=str(text), anchor="center",
+                text_color="#1A1A1A", font=ctk.CTkFont(size=13),
+            ).grid(row=0, column=col, padx=2, pady=10, sticky="nsew")
+        ctk.CTkFrame(frame, fg_color="#D5D5D5", height=1).pack(fill="x")
+    return frame
+
+
+def render_new(root, rows):
+    table = VirtualTable(root, columns=list(zip(HEADERS, COL_WIDTHS)))
+    table.pack(fill="both", expand=True)
+    table.set_rows(rows)
+    return table
+
+
+def measure(root, render, rows):
+    start = time.perf_counter()
+    widget = render(root, rows)
+    root.update()
+    elapsed = time.perf_counter() - start
+    widgets = count_widgets(widget)
+    widget.destroy()
+    root.update()
+    return elapsed, widgets
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rows = make_rows(n)
+
+    root = tk.Tk()
+    root.geometry("1100x650")
+    root.update()
+
+    new_time, new_widgets = measure(root, render_new, rows)
+    print(f"rows: {n}")
+    print(f"virtual table: {new_time * 1000:9.1f} ms  {new_widgets:7d} widgets")
+
+    try:
+        import customtkinter  # noqa: F401
+    except ImportError:
+        print("old renderer:  skipped (customtkinter not installed)")
+    else:
+        old_time, old_widgets = measure(root, render_old, rows)
+        print(f"old renderer:  {old_time * 1000:9.1f} ms  {old_widgets:7d} widgets")
+        print(f"speedup:       {old_time / new_time:9.1f}x")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Headless timings of the data calls behind each page, through the same
+repositories/services the pages use (no display needed).
+
+Builds a throwaway database with `n` assets and a mix of open and
+returned checkouts, then times the page loads and a cart checkout/in.
+
+Run from the repo root:
+    python benchmarks/bench_repositories.py [assets]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DB_DIR = tempfile.mkdtemp(prefix="am_bench_")
+os.environ["ASSET_MANAGER_DB"] = os.path.join(DB_DIR, "bench.db")
+
+import migrate  # noqa: E402
+from db_conn import get_connection  # noqa: E402
+from services.repositories import (  # noqa: E402
+    AssetRepository, CheckoutRepository, UserRepository,
+)
+from services.stats import get_summary_stats  # noqa: E402
+from services.users import authenticate, register_staff  # noqa: E402
+
+CART = 25
+
+
+def seed(conn, n):
+    conn.executemany(
+        "INSERT INTO assets (asset_name, asset_tag_id, location, category, status) "
+        "VALUES (?, ?, 'Room A', 'Fitness Equipment', 'Available')",
+        [(f"Basketball {i}", f"P{i}") for i in range(n)],
+    )
+    conn.commit()
+    checkouts = CheckoutRepository(conn)
+    # every 10th asset out, half of them later returned
+    for start in range(1, n + 1, 1000):
+        ids = range(start, min(start + 1000, n + 1), 10)
+        result = checkouts.check_out(ids, f"Student {start}", f"S{start}")
+        if start % 2000 == 1:
+            checkouts.check_in(
+                r[0] for r in conn.execute(
+                    "SELECT id FROM checkout WHERE student_id = ?", (f"S{start}",)
+                )
+            )
+        assert not result.conflicts
+    register_staff(conn, "Bench", "User", "bench@example.com", "Passw0rd")
+
+
+def timed(label, fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    size = f"{len(result):7d} rows" if isinstance(result, list) else ""
+    print(f"{label:32s} {best * 1000:8.2f} ms  {size}")
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    conn = get_connection()
+    migrate.upgrade(conn, log=lambda *a: None)
+    seed(conn, n)
+    print(f"assets: {n}")
+
+    assets = AssetRepository(conn)
+    checkouts = CheckoutRepository(conn)
+    users = UserRepository(conn)
+
+    timed("Assets page: all()", assets.all)
+    timed("Check Out: search('basket 12')", lambda: assets.search("basket 12"))
+    timed("Check Out: known_students()", checkouts.known_students)
+    timed("Check In: search_open()", checkouts.search_open)
+    timed("Dashboard: open_checkouts()", checkouts.open_checkouts)
+    timed("Dashboard: summary stats", lambda: get_summary_stats(conn))
+    timed("Staff: all()", users.all)
+    timed("Sign in: authenticate()", lambda: authenticate(conn, "bench@example.com", "Passw0rd"))
+
+    cart = assets.search("", available_only=True)[:CART]
+    timed(f"check_out({CART})", lambda: checkouts.check_out(
+        [a.id for a in cart], "Bench", "B1").checked_out, repeat=1)
+    open_ids = list(checkouts.open_ids_for_tags([a.tag for a in cart]).values())
+    timed(f"check_in({CART})", lambda: checkouts.check_in(open_ids).returned, repeat=1)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Cold-start cost of main.py: module import time (from `-X importtime`)
+and time-to-first-frame, each in a fresh interpreter.
+
+"lazy" is what the app does now (import main, show the landing page).
+"eager" also imports every registered page up front, which is what
+main.py and Pages/dashboard.py used to do at module load.
+
+Time-to-first-frame needs a display; on a headless box run it under Xvfb:
+    xvfb-run -a python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_LAZY = "import main"
+IMPORT_EAGER = """
+import importlib, main
+import Pages.dashboard as dashboard
+for name in main.PAGES.module_names() + dashboard.PAGES.module_names():
+    importlib.import_module(name)
+"""
+
+FIRST_FRAME = """
+import time
+start = time.perf_counter()
+{imports}
+app = main.App()
+app.update()
+print(time.perf_counter() - start)
+app.destroy()
+"""
+
+
+def run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+
+
+def import_profile(code):
+    """
+    (total import ms incl. interpreter startup, {top-level module: cumulative
+    ms}, Pages.* modules loaded)
+    """
+    proc = run(code, "-X", "importtime")
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    total_us = 0
+    top = {}
+    pages = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if name.startswith("Pages."):
+            pages.append(name)
+        if level == 0:   # imported directly by the -c code
+            top[name] = int(cumulative) / 1000
+            total_us += int(cumulative)
+    return total_us / 1000, top, pages
+
+
+def first_frame_ms(imports, runs):
+    times, wall = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = run(FIRST_FRAME.format(imports=imports))
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1]
+        times.append(float(proc.stdout.strip().splitlines()[-1]) * 1000)
+        wall.append(elapsed * 1000)
+    return (statistics.median(times), statistics.median(wall)), None
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for label, code in (("lazy", IMPORT_LAZY), ("eager", IMPORT_EAGER)):
+        try:
+            total, top, pages = import_profile(code)
+        except RuntimeError as e:
+            print(f"{label:5s} imports: failed ({e})")
+            continue
+        heaviest = sorted(top.items(), key=lambda kv: -kv[1])[:5]
+        print(f"{label:5s} imports: {total:8.1f} ms   pages loaded: {', '.join(pages) or '-'}")
+        for name, ms in heaviest:
+            print(f"        {name:36s} {ms:8.1f} ms")
+
+    for label, code in (("lazy", IMPORT_LAZY), ("eager", IMPORT_EAGER)):
+        result, error = first_frame_ms(code, runs)
+        if error:
+            print(f"{label:5s} first frame: skipped ({error})")
+        else:
+            in_process, wall = result
+            print(f"{label:5s} first frame: {in_process:8.1f} ms in-process, "
+                  f"{wall:8.1f} ms wall (median of {runs})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,76 @@ import sqlite3
 import os
 import sys
 import shutil
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue, Empty, Full
 
 APP_NAME = "Asset Manager"
 
+# Override the database location (used by benchmarks and headless jobs)
+DB_PATH_ENV = "ASSET_MANAGER_DB"
+
+# Pool defaults: a few connections is plenty for a desk app plus workers
+DEFAULT_POOL_SIZE = 4
+# Idle connections older than this are pinged before being handed out
+HEALTH_CHECK_INTERVAL = 30.0
+
+# ---------- CONNECTION PROFILES ----------
+# PRAGMAs applied to every new connection, by workload.
+# - desk: interactive front-desk terminals sharing sac.db. WAL lets
+#   readers keep going while another desk writes; NORMAL sync is
+#   durable across app crashes (only a power cut can lose the last commit).
+# - bulk-import: large one-off jobs; relaxed durability, bigger cache.
+# - read-only-report: exports and reports; cannot write by accident.
+DEFAULT_PROFILE = "desk"
+
+PROFILES = {
+    "desk": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -8000,          # ~8 MB
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,         # ms
+    },
+    "bulk-import": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,         # ~64 MB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    "read-only-report": {
+        "cache_size": -16000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+        "query_only": "ON",
+    },
+}
+
+_db_path = None
+_db_path_lock = threading.Lock()
+
+
 def get_app_data_dir():
     base = os.path.expanduser("~/Library/Application Support")
     app_dir = os.path.join(base, APP_NAME)
     os.makedirs(app_dir, exist_ok=True)
     return app_dir
 
-def get_db_path():
+
+def _resolve_db_path():
+    override = os.environ.get(DB_PATH_ENV)
+    if override:
+        return override
+
     app_db_path = os.path.join(get_app_data_dir(), "sac.db")
 
     if os.path.exists(app_db_path):
-        print("USING APP DB:", app_db_path)
+        print("USING APP DB:", app_db_path, file=sys.stderr)
         return app_db_path
 
     if getattr(sys, "frozen", False):
@@ -24,11 +80,355 @@ def get_db_path():
         bundled_db = os.path.join(os.path.dirname(__file__), "sac.db")
 
     shutil.copyfile(bundled_db, app_db_path)
-    print("COPIED DB TO:", app_db_path)
+    print("COPIED DB TO:", app_db_path, file=sys.stderr)
     return app_db_path
 
-def get_connection():
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+
+def get_db_path():
+    """Resolve the database path once per process and reuse it."""
+    global _db_path
+    if _db_path is None:
+        with _db_path_lock:
+            if _db_path is None:
+                _db_path = _resolve_db_path()
+    return _db_path
+
+
+def apply_profile(conn, profile=DEFAULT_PROFILE):
+    """Apply a connection profile's PRAGMAs to an open connection."""
+    try:
+        pragmas = PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown connection profile: {profile!r}") from None
+
+    # journal_mode must be set before query_only locks the connection down
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value};")
+    return conn
+
+
+def open_connection(db_path=None, profile=DEFAULT_PROFILE):
+    """Open a raw, unpooled connection with the app's standard setup."""
+    conn = sqlite3.connect(db_path or get_db_path(), check_same_thread=False)
     conn.execute("PRAGMA foreign_keys = ON;")
+    apply_profile(conn, profile)
     return conn
+
+
+@contextmanager
+def write_transaction(conn):
+    """
+    `with write_transaction(conn):` for one unit of writes.
+
+    Normally BEGIN IMMEDIATE (take the write lock up front) ... COMMIT.
+    If `conn` is already in a transaction, e.g. a nested pooled
+    connection whose outer holder has unfinished work, a SAVEPOINT is
+    used instead and the outer holder decides when it commits.
+    Rolls back (to the savepoint) on any error.
+    """
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT write_transaction")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO write_transaction")
+            conn.execute("RELEASE write_transaction")
+            raise
+        conn.execute("RELEASE write_transaction")
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a pooled sqlite3 connection.
+
+    Behaves like sqlite3.Connection, except close() hands the connection
+    back to the pool instead of closing it, so existing
+    `conn = get_connection() ... conn.close()` code keeps working.
+
+    A nested acquire on a thread whose connection is mid-transaction gets
+    a SAVEPOINT instead: its commit() releases only the savepoint and its
+    rollback() undoes only its own work, so the outer holder's unfinished
+    work is committed or rolled back by the outer holder alone.
+    """
+
+    def __init__(self, pool, raw, savepoint=None):
+        self._pool = pool
+        self._raw = raw
+        self._savepoint = savepoint
+        if savepoint:
+            raw.execute(f"SAVEPOINT {savepoint}")
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection.")
+        return getattr(self._raw, name)
+
+    def commit(self):
+        if self._savepoint is None:
+            return self._raw.commit()
+        # fold this holder's work into the outer transaction, keep a fresh
+        # savepoint for anything it does next
+        self._raw.execute(f"RELEASE {self._savepoint}")
+        self._raw.execute(f"SAVEPOINT {self._savepoint}")
+
+    def rollback(self):
+        if self._savepoint is None:
+            return self._raw.rollback()
+        self._raw.execute(f"ROLLBACK TO {self._savepoint}")
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            if self._savepoint:
+                # like the pool: uncommitted work is dropped on release
+                try:
+                    raw.execute(f"ROLLBACK TO {self._savepoint}")
+                    raw.execute(f"RELEASE {self._savepoint}")
+                except sqlite3.Error:
+                    pass
+            self._pool._release(raw)
+
+    # same semantics as sqlite3.Connection: commit/rollback, do not close
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Pool of reusable sqlite3 connections shared by the whole app.
+
+    - size: how many idle connections are kept around for reuse
+    - health_check_interval: idle connections older than this (seconds)
+      are checked with `SELECT 1` and replaced if broken
+    - nested use from the same thread reuses that thread's connection;
+      if it is mid-transaction the nested holder works in a SAVEPOINT
+    - profile: name of the PROFILES entry applied to new connections
+    """
+
+    def __init__(self, db_path=None, size=DEFAULT_POOL_SIZE,
+                 health_check_interval=HEALTH_CHECK_INTERVAL,
+                 profile=DEFAULT_PROFILE):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile!r}")
+        self.db_path = db_path
+        self.profile = profile
+        self.size = size
+        self.health_check_interval = health_check_interval
+
+        self._idle = Queue(maxsize=size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._closed = False
+
+    # ---------- internals ----------
+    def _connect(self):
+        return open_connection(self.db_path, self.profile)
+
+    def _is_healthy(self, raw):
+        last_used = self._last_used.get(id(raw), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            raw.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, raw):
+        with self._lock:
+            self._last_used.pop(id(raw), None)
+        try:
+            raw.close()
+        except sqlite3.Error:
+            pass
+
+    def _release(self, raw):
+        depth = getattr(self._local, "depth", 0)
+        if depth > 1:
+            # still in use by an outer caller on this thread
+            self._local.depth = depth - 1
+            return
+
+        self._local.depth = 0
+        self._local.conn = None
+
+        if self._closed:
+            self._discard(raw)
+            return
+
+        try:
+            if raw.in_transaction:
+                raw.rollback()
+        except sqlite3.Error:
+            self._discard(raw)
+            return
+
+        with self._lock:
+            self._last_used[id(raw)] = time.monotonic()
+        try:
+            self._idle.put_nowait(raw)
+        except Full:
+            self._discard(raw)
+
+    # ---------- public API ----------
+    def acquire(self):
+        """Return a PooledConnection; call close() to give it back."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed.")
+
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            savepoint = None
+            if held.in_transaction:
+                savepoint = f"pool_nested_{self._local.depth}"
+            return PooledConnection(self, held, savepoint)
+
+        raw = None
+        while raw is None:
+            try:
+                candidate = self._idle.get_nowait()
+            except Empty:
+                raw = self._connect()
+                break
+            if self._is_healthy(candidate):
+                raw = candidate
+            else:
+                self._discard(candidate)
+
+        self._local.conn = raw
+        self._local.depth = 1
+        return PooledConnection(self, raw)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager: commits on success, rolls back on error and
+        always returns the connection to the pool.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Close every idle connection and refuse new acquisitions."""
+        self._closed = True
+        while True:
+            try:
+                raw = self._idle.get_nowait()
+            except Empty:
+                break
+            self._discard(raw)
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+_pool_size = DEFAULT_POOL_SIZE
+_health_check_interval = HEALTH_CHECK_INTERVAL
+_schema_checked = False
+
+
+def _log_migration(message):
+    print(message, file=sys.stderr)
+
+
+def _ensure_schema():
+    """
+    Apply pending migrations once per process, before the first pool
+    hands out a connection. A frozen desk build has no way to run
+    migrate.py, and the services expect the current schema.
+    """
+    global _schema_checked
+    if _schema_checked:
+        return
+    from migrate import ensure_tag_index, pending_migrations, upgrade  # migrate imports this module
+
+    conn = open_connection(get_db_path())
+    try:
+        if pending_migrations(conn):
+            upgrade(conn, log=_log_migration)
+        else:
+            # nothing to say on every launch unless the tag index is missing
+            ensure_tag_index(conn, log=_log_migration)
+    finally:
+        conn.close()
+    _schema_checked = True
+
+
+def get_pool(profile=DEFAULT_PROFILE):
+    """Return the process-wide pool for a profile, creating it on first use."""
+    pool = _pools.get(profile)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(profile)
+            if pool is None:
+                _ensure_schema()
+                pool = ConnectionPool(
+                    get_db_path(),
+                    size=_pool_size,
+                    health_check_interval=_health_check_interval,
+                    profile=profile,
+                )
+                _pools[profile] = pool
+    return pool
+
+
+def configure_pool(db_path=None, size=DEFAULT_POOL_SIZE,
+                   health_check_interval=HEALTH_CHECK_INTERVAL):
+    """
+    Close the shared pools and change their settings (e.g. to point at
+    another database file). Pools are recreated lazily per profile.
+    """
+    global _db_path, _pool_size, _health_check_interval, _schema_checked
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
+        if db_path:
+            _db_path = db_path
+            _schema_checked = False
+        _pool_size = size
+        _health_check_interval = health_check_interval
+    return get_pool()
+
+
+def get_connection(profile=DEFAULT_PROFILE):
+    return get_pool(profile).acquire()
+
+
+def connection(profile=DEFAULT_PROFILE):
+    """`with connection() as conn:` shortcut for the shared pool."""
+    return get_pool(profile).connection()
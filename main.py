@@ -1,12 +1,14 @@
 # main.py
 import customtkinter as ctk
-from Pages.landing_page import LandingPage
-from Pages.sign_in import SignInPage
-from Pages.sign_up import SignUpPage
-from Pages.dashboard import DashboardPage
-from Pages.students import StudentsPage
-
+from utils.page_registry import PageRegistry
 
+# imported on first use (or by the idle prewarm), not at startup
+PAGES = PageRegistry({
+    "landing": "Pages.landing_page:LandingPage",
+    "sign_in": "Pages.sign_in:SignInPage",
+    "sign_up": "Pages.sign_up:SignUpPage",
+    "dashboard": "Pages.dashboard:DashboardPage",
+})
 
 
 class App(ctk.CTk):
@@ -22,6 +24,7 @@ class App(ctk.CTk):
 
         # start on landing with medium window
         self.show_landing()
+        PAGES.prewarm(self)
 
     # ------------ helper: center + resize ------------
     def center_window(self, w: int, h: int):
@@ -42,7 +45,7 @@ class App(ctk.CTk):
         # medium window for landing
         self.resizable(False, False)
         self.center_window(900, 540)
-        self.current_page = LandingPage(self)
+        self.current_page = PAGES.create("landing", self)
         self.current_page.pack(fill="both", expand=True)
 
     def show_sign_in(self):
@@ -63,7 +66,7 @@ class App(ctk.CTk):
         # 4. Refresh to apply the "normal" state before packing the page
         self.update() 
         
-        self.current_page = SignInPage(self)
+        self.current_page = PAGES.create("sign_in", self)
         self.current_page.pack(fill="both", expand=True)
 
     def show_sign_up(self):
@@ -71,7 +74,7 @@ class App(ctk.CTk):
         # a bit wider/taller for the sign up form
         self.resizable(False, False)
         self.center_window(820, 640)
-        self.current_page = SignUpPage(self)
+        self.current_page = PAGES.create("sign_up", self)
         self.current_page.pack(fill="both", expand=True)
 
     # ------------ After login go to Dashboard ------------
@@ -81,7 +84,7 @@ class App(ctk.CTk):
         self.resizable(True, True)
         self.center_window(1100, 650)
         self.minsize(900, 500)
-        self.current_page = DashboardPage(self, user_id, first_name, role)
+        self.current_page = PAGES.create("dashboard", self, user_id, first_name, role)
         self.current_page.pack(fill="both", expand=True)
 
 
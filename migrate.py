@@ -1,29 +1,922 @@
-from db_conn import get_connection
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import contextmanager
 
-conn = get_connection()
-cur = conn.cursor()
+from db_conn import get_connection, open_connection
 
-# Check if assets table exists
-cur.execute("""
-SELECT name FROM sqlite_master
-WHERE type='table' AND name='assets';
-""")
+# Rows touched per transaction by long-running backfills. Small enough
+# that the desk app never waits more than a moment for the write lock.
+BACKFILL_BATCH_SIZE = 2000
+# Pause between backfill batches so other terminals can get a write in
+BACKFILL_PAUSE = 0.01
 
-if not cur.fetchone():
-    print("assets table does not exist. Skipping migration.")
-else:
+# version     -> value stored in PRAGMA user_version once applied
+# upgrade     -> fn(conn), runs inside one transaction; must be safe to
+#                re-run (IF NOT EXISTS / column checks) in case a later
+#                backfill was interrupted
+# backfill    -> optional Backfill, run after upgrade in bounded batches
+Migration = namedtuple("Migration", "version description upgrade backfill")
+
+# pending_sql -> SELECT COUNT(*) of rows still to process (for dry runs)
+# step        -> fn(conn, batch_size) -> rows changed; 0 means done
+Backfill = namedtuple("Backfill", "pending_sql step")
+
+MIGRATIONS = []
+
+
+def migration(version, description, backfill=None):
+    """Register an upgrade function as schema version `version`."""
+    def register(fn):
+        MIGRATIONS.append(Migration(version, description, fn, backfill))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return fn
+    return register
+
+
+# ---------- INDEX SET ----------
+# Secondary indexes backing the hot page queries. Each entry is
+# (name, CREATE statement); statements are idempotent.
+INDEXES = [
+    # Dashboard + Check In: open checkouts, newest first.
+    # Partial index: only rows still out, so it stays tiny.
+    ("idx_checkout_open", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_open
+        ON checkout (checkout_time DESC)
+        WHERE status = 'Checked Out'
+    """),
+    # History page: all checkouts, newest first
+    ("idx_checkout_time", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_time
+        ON checkout (checkout_time DESC)
+    """),
+    # Check Out autofill + known-students list
+    ("idx_checkout_student", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_student
+        ON checkout (student_name, checkout_time DESC)
+    """),
+    # Joins / cascades from assets
+    ("idx_checkout_asset", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_asset
+        ON checkout (asset_id)
+    """),
+    # Check Out "Available only" list + dashboard status counts
+    ("idx_assets_status_name", """
+        CREATE INDEX IF NOT EXISTS idx_assets_status_name
+        ON assets (status, asset_name)
+    """),
+    # Assets page + Check Out "All statuses" (ordered by name)
+    ("idx_assets_name", """
+        CREATE INDEX IF NOT EXISTS idx_assets_name
+        ON assets (asset_name)
+    """),
+    # One asset per tag
+    ("ux_assets_tag", """
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_assets_tag
+        ON assets (asset_tag_id)
+    """),
+]
+
+# ---------- PAGE QUERIES ----------
+# check_query_plans() calls the same service/repository functions the
+# pages call, records the SQL they send (trace callback) and checks the
+# plan of every SELECT, so there is no second copy of the SQL to keep in
+# sync. Probes must only read.
+def page_query_probes():
+    """{name: fn(conn)} for the queries the pages run on every load/search."""
+    from services.checkout import asset_ids_for_tags, open_checkouts_for_tags
+    from services.repositories import AssetRepository, CheckoutRepository
+    from services.scan import TagCache
+    from services.search import (
+        count_history, search_assets, search_history, search_open_checkouts,
+    )
+    from services.stats import get_summary_stats
+
+    return {
+        "dashboard.open_checkouts": lambda c: CheckoutRepository(c).open_checkouts(),
+        "dashboard.summary_stats": get_summary_stats,
+        "assets.all": lambda c: AssetRepository(c).all(),
+        "check_out.available": lambda c: search_assets(c),
+        "check_out.all_statuses": lambda c: search_assets(c, available_only=False),
+        "check_out.search": lambda c: search_assets(c, "ball p1"),
+        "check_out.known_students": lambda c: CheckoutRepository(c).known_students(),
+        "check_out.scan_tags": lambda c: asset_ids_for_tags(c, ["P1", "P2"]),
+        "check_in.open": lambda c: search_open_checkouts(c),
+        "check_in.search": lambda c: search_open_checkouts(c, "ball"),
+        "check_in.scan_tags": lambda c: open_checkouts_for_tags(c, ["P1", "P2"]),
+        "scan.tag_cache": lambda c: TagCache().load(c),
+        "history.first_page": lambda c: search_history(c),
+        "history.next_page": lambda c: search_history(c, after=(0, 1)),
+        "history.search": lambda c: search_history(c, "smith"),
+        "history.count": lambda c: count_history(c),
+        "history.with_archive": lambda c: search_history(c, include_archive=True),
+        "history.with_archive_next_page":
+            lambda c: search_history(c, after=(0, 1), include_archive=True),
+    }
+
+
+# Probes that read a whole table on purpose; a SCAN there is expected.
+FULL_SCAN_OK = {
+    "check_out.known_students",   # autocomplete keeps every student in memory
+    "scan.tag_cache",             # scan mode keeps every tagged asset in memory
+}
+
+
+def table_exists(conn, name):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        (name,),
+    ).fetchone()
+    return row is not None
+
+
+def column_exists(conn, table, column):
+    return any(
+        row[1] == column
+        for row in conn.execute(f"PRAGMA table_info({table})")
+    )
+
+
+def add_column(conn, table, column, decl):
+    """ALTER TABLE ... ADD COLUMN, skipped when the column already exists."""
+    if not column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def index_exists(conn, name):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?",
+        (name,),
+    ).fetchone()
+    return row is not None
+
+
+def create_indexes(conn, indexes=INDEXES):
+    """Create a managed index set. Returns the names that were skipped."""
+    skipped = []
+    for name, sql in indexes:
+        try:
+            conn.execute(sql)
+        except sqlite3.IntegrityError as e:
+            # e.g. duplicate asset tags already in the data; see
+            # ensure_tag_index(), which upgrade() retries on every run
+            print(f"{name}: skipped ({e})")
+            skipped.append(name)
+    return skipped
+
+
+# ---------- UNIQUE TAG INDEX ----------
+# ux_assets_tag cannot be built while two assets share a tag, and
+# migration 2 does not hold the schema version back for it. upgrade()
+# re-checks it on every run instead, so fixing the duplicates and
+# running migrate.py again is enough. Tags are compared exactly (case
+# matters), like the index.
+TAG_INDEX = "ux_assets_tag"
+TAG_FALLBACK_INDEX = "idx_assets_tag"
+DUPLICATES_SHOWN = 20
+
+
+def duplicate_tags(conn):
+    """Asset tags used by more than one asset, with their counts."""
+    return conn.execute("""
+        SELECT asset_tag_id, COUNT(*) FROM assets
+        WHERE asset_tag_id IS NOT NULL
+        GROUP BY asset_tag_id
+        HAVING COUNT(*) > 1
+        ORDER BY asset_tag_id
+    """).fetchall()
+
+
+def _run_ddl(conn, *statements):
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        cur.execute("ALTER TABLE assets ADD COLUMN asset_tag_id TEXT")
-        print("asset_tag_id column added")
-    except Exception as e:
-        print("asset_tag_id:", e)
+        for sql in statements:
+            conn.execute(sql)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def ensure_tag_index(conn, dry_run=False, log=print):
+    """
+    Create ux_assets_tag if the data allows it. Returns True if it exists.
+    While duplicates block it, a plain idx_assets_tag keeps tag lookups
+    (scan mode, CLI check-out/in) off a full table scan.
+    """
+    if index_exists(conn, TAG_INDEX) or not table_exists(conn, "assets"):
+        return index_exists(conn, TAG_INDEX)
+
+    duplicates = duplicate_tags(conn)
+    if duplicates:
+        log(f"{TAG_INDEX} not created: {len(duplicates)} tag(s) are used by more "
+            "than one asset. Fix them and run migrate.py again:")
+        for tag, n in duplicates[:DUPLICATES_SHOWN]:
+            log(f"  {tag!r} x{n}")
+        if len(duplicates) > DUPLICATES_SHOWN:
+            log(f"  ... and {len(duplicates) - DUPLICATES_SHOWN} more")
+        if not dry_run and not index_exists(conn, TAG_FALLBACK_INDEX):
+            _run_ddl(conn, f"""
+                CREATE INDEX IF NOT EXISTS {TAG_FALLBACK_INDEX}
+                ON assets (asset_tag_id)
+            """)
+            log(f"created {TAG_FALLBACK_INDEX} (non-unique) in the meantime")
+        return False
+    if dry_run:
+        log(f"would create {TAG_INDEX}")
+        return False
+
+    _run_ddl(conn, dict(INDEXES)[TAG_INDEX], f"DROP INDEX IF EXISTS {TAG_FALLBACK_INDEX}")
+    log(f"created {TAG_INDEX}")
+    return True
+
 
+# ======================================================
+# MIGRATIONS
+# ======================================================
+@migration(1, "Base schema: users, assets, checkout, students")
+def _base_schema(conn):
+    # ---------- USERS TABLE ----------
+    # Admin + staff accounts
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT NOT NULL COLLATE NOCASE UNIQUE,
+        password TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'staff'   -- 'admin' or 'staff'
+    );
+    """)
+
+    # ---------- ASSETS TABLE ----------
+    # All equipment in SAC
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS assets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        asset_name   TEXT NOT NULL,
+        asset_tag_id TEXT,          -- e.g. P1, P2, etc.
+        location     TEXT,          -- e.g. Fitness Center
+        category     TEXT,          -- e.g. Equipment Checkout
+        status       TEXT NOT NULL DEFAULT 'Available'  -- Available / Checked Out / Broken / etc.
+    );
+    """)
+    # older databases predate these columns
+    add_column(conn, "assets", "asset_tag_id", "TEXT")
+    add_column(conn, "assets", "location", "TEXT")
+
+    # ---------- CHECKOUT TABLE ----------
+    # Every checkout / check-in event (used by:
+    # - Check Out page
+    # - Check In page
+    # - Student History page)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS checkout (
+        id           INTEGER PRIMARY KEY AUTOINCREMENT,
+        asset_id     INTEGER NOT NULL,
+        student_name TEXT   NOT NULL,
+        student_id   TEXT   NOT NULL,
+        checkout_time TEXT  NOT NULL,
+        checkin_time  TEXT,                     -- NULL while still checked out
+        status        TEXT  NOT NULL DEFAULT 'Checked Out',
+        FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+    );
+    """)
+
+    # (Optional) STUDENTS TABLE – not required for history, but safe to keep
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        full_name TEXT NOT NULL,
+        student_id TEXT NOT NULL UNIQUE,
+        phone TEXT,
+        email TEXT
+    );
+    """)
+
+    # ---------- DEFAULT ADMIN USER ----------
+    conn.execute("""
+    INSERT OR IGNORE INTO users (first_name, last_name, email, password, role)
+    VALUES ('SAC', 'Admin', 'admin@sac.com', 'admin123', 'admin');
+    """)
+
+
+@migration(2, "Index set for the hot page queries")
+def _page_indexes(conn):
+    create_indexes(conn)
+
+
+# Full-text search over asset name/tag and student name/id.
+# External-content tables: the text lives in assets/checkout, the FTS
+# tables only hold the index and are kept in sync by triggers.
+FTS_TOKENIZER = "unicode61 tokenchars '-_'"
+
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS assets_fts USING fts5(
+        asset_name, asset_tag_id,
+        content='assets', content_rowid='id',
+        tokenize="{FTS_TOKENIZER}", prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS assets_fts_ai AFTER INSERT ON assets BEGIN
+        INSERT INTO assets_fts (rowid, asset_name, asset_tag_id)
+        VALUES (new.id, new.asset_name, new.asset_tag_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS assets_fts_ad AFTER DELETE ON assets BEGIN
+        INSERT INTO assets_fts (assets_fts, rowid, asset_name, asset_tag_id)
+        VALUES ('delete', old.id, old.asset_name, old.asset_tag_id);
+    END
+    """,
+    # status changes on every check out/in; only reindex on text changes
+    """
+    CREATE TRIGGER IF NOT EXISTS assets_fts_au
+    AFTER UPDATE OF asset_name, asset_tag_id ON assets BEGIN
+        INSERT INTO assets_fts (assets_fts, rowid, asset_name, asset_tag_id)
+        VALUES ('delete', old.id, old.asset_name, old.asset_tag_id);
+        INSERT INTO assets_fts (rowid, asset_name, asset_tag_id)
+        VALUES (new.id, new.asset_name, new.asset_tag_id);
+    END
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS checkout_fts USING fts5(
+        student_name, student_id,
+        content='checkout', content_rowid='id',
+        tokenize="{FTS_TOKENIZER}", prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS checkout_fts_ai AFTER INSERT ON checkout BEGIN
+        INSERT INTO checkout_fts (rowid, student_name, student_id)
+        VALUES (new.id, new.student_name, new.student_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS checkout_fts_ad AFTER DELETE ON checkout BEGIN
+        INSERT INTO checkout_fts (checkout_fts, rowid, student_name, student_id)
+        VALUES ('delete', old.id, old.student_name, old.student_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS checkout_fts_au
+    AFTER UPDATE OF student_name, student_id ON checkout BEGIN
+        INSERT INTO checkout_fts (checkout_fts, rowid, student_name, student_id)
+        VALUES ('delete', old.id, old.student_name, old.student_id);
+        INSERT INTO checkout_fts (rowid, student_name, student_id)
+        VALUES (new.id, new.student_name, new.student_id);
+    END
+    """,
+]
+
+
+def fts5_supported(conn):
     try:
-        cur.execute("ALTER TABLE assets ADD COLUMN location TEXT")
-        print("location column added")
-    except Exception as e:
-        print("location:", e)
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+@migration(3, "Full-text search index for assets and checkouts")
+def _search_index(conn):
+    if not fts5_supported(conn):
+        # search falls back to LIKE filters (see services/search.py)
+        print("FTS5 not available in this SQLite build; skipping search index.")
+        return
+
+    for sql in FTS_SCHEMA:
+        conn.execute(sql)
+    conn.execute("INSERT INTO assets_fts (assets_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO checkout_fts (checkout_fts) VALUES ('rebuild')")
+
+
+# Dashboard counters kept current by triggers, so the cards are a
+# primary-key lookup instead of COUNT(*) scans.
+#   kind='total'    name in ('assets', 'users', 'open_checkouts')
+#   kind='status' / 'category' / 'location'   name = column value
+STATS_DIMENSIONS = ("status", "category", "location")
+
+
+def _stats_bump(kind, name_expr, delta):
+    if delta > 0:
+        return f"""
+        INSERT INTO stat_counters (kind, name, n) VALUES ('{kind}', {name_expr}, {delta})
+        ON CONFLICT (kind, name) DO UPDATE SET n = n + {delta};"""
+    return f"""
+        UPDATE stat_counters SET n = n - {-delta}
+        WHERE kind = '{kind}' AND name = {name_expr};"""
+
+
+def stats_schema():
+    statements = ["""
+    CREATE TABLE IF NOT EXISTS stat_counters (
+        kind TEXT NOT NULL,
+        name TEXT NOT NULL,
+        n    INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (kind, name)
+    ) WITHOUT ROWID
+    """]
+
+    # ---------- assets ----------
+    ins = _stats_bump("total", "'assets'", 1)
+    dels = _stats_bump("total", "'assets'", -1)
+    for dim in STATS_DIMENSIONS:
+        ins += _stats_bump(dim, f"COALESCE(new.{dim}, '')", 1)
+        dels += _stats_bump(dim, f"COALESCE(old.{dim}, '')", -1)
+    statements.append(
+        f"CREATE TRIGGER IF NOT EXISTS assets_stats_ai AFTER INSERT ON assets BEGIN {ins} END"
+    )
+    statements.append(
+        f"CREATE TRIGGER IF NOT EXISTS assets_stats_ad AFTER DELETE ON assets BEGIN {dels} END"
+    )
+    # one trigger per column so a status change only touches status rows
+    for dim in STATS_DIMENSIONS:
+        body = (_stats_bump(dim, f"COALESCE(old.{dim}, '')", -1)
+                + _stats_bump(dim, f"COALESCE(new.{dim}, '')", 1))
+        statements.append(f"""
+        CREATE TRIGGER IF NOT EXISTS assets_stats_au_{dim}
+        AFTER UPDATE OF {dim} ON assets
+        WHEN old.{dim} IS NOT new.{dim}
+        BEGIN {body} END""")
+
+    # ---------- users ----------
+    statements.append(f"""
+    CREATE TRIGGER IF NOT EXISTS users_stats_ai AFTER INSERT ON users
+    BEGIN {_stats_bump("total", "'users'", 1)} END""")
+    statements.append(f"""
+    CREATE TRIGGER IF NOT EXISTS users_stats_ad AFTER DELETE ON users
+    BEGIN {_stats_bump("total", "'users'", -1)} END""")
+
+    # ---------- checkout ----------
+    statements.append(f"""
+    CREATE TRIGGER IF NOT EXISTS checkout_stats_ai AFTER INSERT ON checkout
+    WHEN new.status = 'Checked Out'
+    BEGIN {_stats_bump("total", "'open_checkouts'", 1)} END""")
+    statements.append(f"""
+    CREATE TRIGGER IF NOT EXISTS checkout_stats_ad AFTER DELETE ON checkout
+    WHEN old.status = 'Checked Out'
+    BEGIN {_stats_bump("total", "'open_checkouts'", -1)} END""")
+    statements.append(f"""
+    CREATE TRIGGER IF NOT EXISTS checkout_stats_au AFTER UPDATE OF status ON checkout
+    WHEN (old.status = 'Checked Out') IS NOT (new.status = 'Checked Out')
+    BEGIN
+        INSERT INTO stat_counters (kind, name, n)
+        VALUES ('total', 'open_checkouts',
+                CASE WHEN new.status = 'Checked Out' THEN 1 ELSE -1 END)
+        ON CONFLICT (kind, name) DO UPDATE SET n = n + excluded.n;
+    END""")
+    return statements
+
+
+@migration(4, "Trigger-maintained dashboard counters")
+def _stat_counters(conn):
+    for sql in stats_schema():
+        conn.execute(sql)
+
+    from services.stats import rebuild_stats
+    rebuild_stats(conn)
+
+
+STUDENT_INDEXES = [
+    # One student's history, newest first
+    ("idx_checkout_student_fk", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_student_fk
+        ON checkout (student_fk, checkout_time DESC)
+    """),
+    # Check Out autocomplete (covering: name + ID)
+    ("idx_students_name", """
+        CREATE INDEX IF NOT EXISTS idx_students_name
+        ON students (full_name, student_id)
+    """),
+]
+
+
+# Checkouts point at one students row instead of repeating the name and
+# ID as free text. The text columns stay (history shows the name as it
+# was at checkout time, and the FTS index reads them).
+def _link_students_step(conn, batch_size):
+    rows = conn.execute("""
+        SELECT id, student_name, student_id
+        FROM checkout INDEXED BY idx_checkout_unlinked
+        WHERE student_fk IS NULL AND TRIM(student_id) <> ''
+        ORDER BY id
+        LIMIT ?
+    """, (batch_size,)).fetchall()
+    if not rows:
+        return 0
+
+    # oldest first, so each student ends up with their latest name
+    conn.executemany("""
+        INSERT INTO students (full_name, student_id) VALUES (?, ?)
+        ON CONFLICT (student_id) DO UPDATE SET full_name = excluded.full_name
+    """, [(name, sid.strip()) for _, name, sid in rows])
+    conn.executemany("""
+        UPDATE checkout
+        SET student_fk = (SELECT id FROM students WHERE student_id = ?)
+        WHERE id = ?
+    """, [(sid.strip(), cid) for cid, _, sid in rows])
+    return len(rows)
+
+
+@migration(5, "Link checkouts to the students table", backfill=Backfill(
+    pending_sql="""
+        SELECT COUNT(*) FROM checkout
+        WHERE student_fk IS NULL AND TRIM(student_id) <> ''
+    """,
+    step=_link_students_step,
+))
+def _checkout_student_fk(conn):
+    add_column(conn, "checkout", "student_fk",
+               "INTEGER REFERENCES students(id) ON DELETE SET NULL")
+    # rows still to link; stays near-empty once check-out fills student_fk
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_checkout_unlinked
+        ON checkout (id) WHERE student_fk IS NULL
+    """)
+    create_indexes(conn, STUDENT_INDEXES)
+
+
+TIME_INDEXES = [
+    # Dashboard + Check In: open checkouts, newest first (partial, tiny)
+    ("idx_checkout_open_at", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_open_at
+        ON checkout (checkout_at DESC)
+        WHERE status = 'Checked Out'
+    """),
+    # History page: all checkouts, newest first
+    ("idx_checkout_at", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_at
+        ON checkout (checkout_at DESC)
+    """),
+    # One student's history, newest first
+    ("idx_checkout_student_at", """
+        CREATE INDEX IF NOT EXISTS idx_checkout_student_at
+        ON checkout (student_fk, checkout_at DESC)
+    """),
+]
+
+# text-time indexes replaced by TIME_INDEXES
+OLD_TIME_INDEXES = [
+    "idx_checkout_open",
+    "idx_checkout_time",
+    "idx_checkout_student",
+    "idx_checkout_student_fk",
+]
+
+
+# checkout_at / checkin_at hold integer UTC epochs (see utils/timefmt.py).
+# The local-time text columns are still written so desks running an
+# older build keep working during a rollout.
+def _epoch_times_step(conn, batch_size):
+    from utils.timefmt import parse_local
+
+    rows = conn.execute("""
+        SELECT id, checkout_time, checkin_time
+        FROM checkout INDEXED BY idx_checkout_untimed
+        WHERE checkout_at IS NULL
+        ORDER BY id
+        LIMIT ?
+    """, (batch_size,)).fetchall()
+
+    conn.executemany(
+        "UPDATE checkout SET checkout_at = ?, checkin_at = ? WHERE id = ?",
+        [
+            # unreadable checkout times sort as the oldest rows
+            (parse_local(out) or 0, parse_local(back), cid)
+            for cid, out, back in rows
+        ],
+    )
+    return len(rows)
+
+
+@migration(6, "Integer epoch checkout/check-in times", backfill=Backfill(
+    pending_sql="SELECT COUNT(*) FROM checkout WHERE checkout_at IS NULL",
+    step=_epoch_times_step,
+))
+def _epoch_times(conn):
+    add_column(conn, "checkout", "checkout_at", "INTEGER")
+    add_column(conn, "checkout", "checkin_at", "INTEGER")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_checkout_untimed
+        ON checkout (id) WHERE checkout_at IS NULL
+    """)
+    create_indexes(conn, TIME_INDEXES)
+    for name in OLD_TIME_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+@migration(7, "History keyset index on (checkout_at, id)")
+def _history_keyset_index(conn):
+    # ORDER BY checkout_at DESC, id DESC straight from the index (the
+    # implicit rowid in idx_checkout_at sorts ascending, forcing a sort)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_checkout_at_id
+        ON checkout (checkout_at DESC, id DESC)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_checkout_at")
+
+
+@migration(8, "Index for archiving old returned checkouts")
+def _archive_index(conn):
+    # services.archive picks the oldest returned rows batch by batch
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_checkout_returned_at
+        ON checkout (checkin_at) WHERE status = 'Returned'
+    """)
+
+
+# Rows written by a desk still on an older build only have the text
+# times and no student link, so they would sort last in History, never
+# match the keyset predicate and never be archived. These triggers fill
+# the new columns in on insert and on check-in. They are plain SQL (an
+# older build's connection has no Python functions registered), so the
+# local-time -> epoch conversion uses APP_TZ's rules directly: US
+# Eastern, DST from the second Sunday of March to the first Sunday of
+# November. Same result as utils.timefmt.parse_local, including the
+# skipped 02:00-03:00 hour in March (read as standard time) and the
+# repeated 01:00 hour in November (read as daylight time).
+def _local_epoch_sql(column):
+    dst_start = f"datetime({column}, 'start of year', '+2 months', 'weekday 0', '+7 days', '+3 hours')"
+    dst_end = f"datetime({column}, 'start of year', '+10 months', 'weekday 0', '+2 hours')"
+    return f"""(CAST(strftime('%s', {column}) AS INTEGER) + CASE
+        WHEN datetime({column}) >= {dst_start} AND datetime({column}) < {dst_end}
+        THEN 14400 ELSE 18000 END)"""
+
+
+def rollout_triggers():
+    fill_times = f"""
+        UPDATE checkout SET
+            checkout_at = COALESCE(checkout_at, {_local_epoch_sql("checkout_time")}, 0),
+            checkin_at = COALESCE(checkin_at, {_local_epoch_sql("checkin_time")})
+        WHERE id = NEW.id;
+    """
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS checkout_rollout_times_ai AFTER INSERT ON checkout
+        WHEN NEW.checkout_at IS NULL
+          OR (NEW.checkin_at IS NULL AND NEW.checkin_time IS NOT NULL)
+        BEGIN {fill_times} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS checkout_rollout_times_au
+        AFTER UPDATE OF checkout_time, checkin_time ON checkout
+        WHEN NEW.checkout_at IS NULL
+          OR (NEW.checkin_at IS NULL AND NEW.checkin_time IS NOT NULL)
+        BEGIN {fill_times} END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS checkout_rollout_student_ai AFTER INSERT ON checkout
+        WHEN NEW.student_fk IS NULL AND TRIM(NEW.student_id) <> ''
+        BEGIN
+            INSERT INTO students (full_name, student_id)
+            VALUES (NEW.student_name, TRIM(NEW.student_id))
+            ON CONFLICT (student_id) DO UPDATE SET full_name = excluded.full_name;
+            UPDATE checkout
+            SET student_fk = (SELECT id FROM students WHERE student_id = TRIM(NEW.student_id))
+            WHERE id = NEW.id;
+        END
+        """,
+    ]
+
+
+@migration(9, "Fill epoch times and student links on rows from older builds")
+def _rollout_triggers(conn):
+    for sql in rollout_triggers():
+        conn.execute(sql)
+    # rows an older build wrote after migrations 5 and 6 had run
+    while _epoch_times_step(conn, BACKFILL_BATCH_SIZE):
+        pass
+    conn.execute(f"""
+        UPDATE checkout
+        SET checkin_at = {_local_epoch_sql("checkin_time")}
+        WHERE checkin_at IS NULL AND checkin_time IS NOT NULL
+    """)
+    while _link_students_step(conn, BACKFILL_BATCH_SIZE):
+        pass
+
+
+# ======================================================
+# RUNNER
+# ======================================================
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _set_version(conn, version):
+    # PRAGMA does not accept bound parameters
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def pending_migrations(conn):
+    current = get_version(conn)
+    return [m for m in MIGRATIONS if m.version > current]
+
+
+def run_backfill(conn, backfill, batch_size=BACKFILL_BATCH_SIZE,
+                 pause=BACKFILL_PAUSE, progress=None):
+    """
+    Run a backfill step in bounded batches, committing after each one so
+    the write lock is only held briefly. Returns total rows changed.
+    """
+    total = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            changed = backfill.step(conn, batch_size)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        if not changed:
+            return total
+        total += changed
+        if progress:
+            progress(total)
+        if pause:
+            time.sleep(pause)
+
+
+def _count_pending(conn, backfill):
+    try:
+        return conn.execute(backfill.pending_sql).fetchone()[0]
+    except sqlite3.Error:
+        # columns/tables created by this migration do not exist yet
+        return None
+
+
+def upgrade(conn, dry_run=False, batch_size=BACKFILL_BATCH_SIZE, log=print):
+    """
+    Apply every pending migration in version order.
+    Each upgrade runs in its own transaction; user_version is bumped only
+    after its backfill (if any) has finished. The unique tag index is
+    re-checked on every run until it exists (see ensure_tag_index).
+    With dry_run=True nothing is written; the plan is logged and returned.
+    """
+    pending = pending_migrations(conn)
+    if not pending:
+        log(f"Schema is up to date (version {get_version(conn)}).")
+        ensure_tag_index(conn, dry_run=dry_run, log=log)
+        return []
+
+    if dry_run:
+        for m in pending:
+            line = f"would apply {m.version}: {m.description}"
+            if m.backfill:
+                rows = _count_pending(conn, m.backfill)
+                line += " (backfill: {} rows)".format("unknown" if rows is None else rows)
+            log(line)
+        return pending
+
+    for m in pending:
+        log(f"applying {m.version}: {m.description}")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            m.upgrade(conn)
+            if not m.backfill:
+                _set_version(conn, m.version)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        if m.backfill:
+            total = run_backfill(
+                conn, m.backfill, batch_size=batch_size,
+                progress=lambda n: log(f"  backfilled {n} rows"),
+            )
+            log(f"  backfill done ({total} rows)")
+            conn.execute("BEGIN IMMEDIATE")
+            _set_version(conn, m.version)
+            conn.commit()
+
+    log(f"Schema is now at version {get_version(conn)}.")
+    ensure_tag_index(conn, log=log)
+    return pending
+
+
+def _traced_selects(conn, probe):
+    """Run `probe(conn)` and return the SELECTs it sent, parameters inlined."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        probe(conn)
+    finally:
+        conn.set_trace_callback(None)
+    return [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        and "sqlite_master" not in sql   # table-exists checks
+        and "'main'." not in sql         # FTS5 reading its own shadow tables
+    ]
+
+
+@contextmanager
+def _archive_for_plans(conn):
+    """
+    Keep the archive attached while the probes run. Before the first
+    archive run there is none, and history would skip the union, so an
+    empty one is attached from a temporary file instead.
+    """
+    from services.archive import (
+        ARCHIVE_INDEX_SQL, ARCHIVE_SCHEMA, ARCHIVE_TABLE_SQL, attach_archive,
+    )
+
+    if attach_archive(conn, create=False):
+        yield
+        return
+
+    fd, path = tempfile.mkstemp(prefix="am_plan_archive_", suffix=".db")
+    os.close(fd)
+    scratch = sqlite3.connect(":memory:")
+    try:
+        scratch.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+        scratch.execute(ARCHIVE_TABLE_SQL)
+        for sql in ARCHIVE_INDEX_SQL:
+            scratch.execute(sql)
+        scratch.commit()
+    finally:
+        scratch.close()
+    try:
+        attach_archive(conn, path, create=False)
+        yield
+    finally:
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+        os.remove(path)
+
+
+def check_query_plans(conn, probes=None):
+    """
+    Run EXPLAIN QUERY PLAN on every SELECT each probe sends.
+    Returns {probe_name: plan_line} for every probe with a full table
+    scan (a SCAN step that does not use an index).
+    """
+    with _archive_for_plans(conn):
+        return _check_probes(conn, probes or page_query_probes())
+
+
+def _check_probes(conn, probes):
+    problems = {}
+    for name, probe in probes.items():
+        if name in FULL_SCAN_OK:
+            continue
+        for sql in _traced_selects(conn, probe):
+            for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+                detail = row[-1]
+                if detail.startswith("SCAN") and "INDEX" not in detail:
+                    problems[name] = detail
+                    break
+            if name in problems:
+                break
+    return problems
+
+
+def run(dry_run=False, batch_size=BACKFILL_BATCH_SIZE):
+    # not the pool: creating it would already apply the migrations,
+    # --dry-run included
+    conn = open_connection()
+    try:
+        upgrade(conn, dry_run=dry_run, batch_size=batch_size)
+    finally:
+        conn.close()
+    print("Migration finished.")
+
+
+def run_plan_check():
+    probes = page_query_probes()
+    conn = get_connection("read-only-report")
+    try:
+        problems = check_query_plans(conn, probes)
+    finally:
+        conn.close()
+
+    for name, detail in problems.items():
+        print(f"TABLE SCAN  {name}: {detail}")
+    if problems:
+        return 1
+    checked = len(probes) - len(FULL_SCAN_OK)
+    print(f"All {checked} page queries use indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upgrade the Asset Manager database.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show pending migrations without applying them")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE,
+                        help="rows per transaction for data backfills")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="fail if a page query does a full table scan")
+    args = parser.parse_args()
 
-conn.commit()
-conn.close()
-print("Migration finished.")
+    if args.check_plans:
+        sys.exit(run_plan_check())
+    run(dry_run=args.dry_run, batch_size=args.batch_size)
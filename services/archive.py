@@ -0,0 +1,261 @@
+"""
+Hot/cold split for checkout history.
+
+Returned checkouts older than ARCHIVE_AFTER_DAYS are moved, in bounded
+batches, into a separate SQLite file ATTACHed as `archive`, so the live
+checkout table (and every index the desk pages use) only holds recent
+rows. History can still search both through HISTORY_UNION_SQL, which
+stitches the two tables back together.
+
+    python -m services.archive              # archive with the default age
+    python -m services.archive --days 180   # keep half a year hot
+    python -m services.archive --dry-run    # only count what would move
+
+The archive lives next to the main database as <name>_archive.db unless
+ASSET_MANAGER_ARCHIVE_DB points elsewhere.
+"""
+import argparse
+import os
+import sys
+
+from db_conn import get_connection
+from migrate import Backfill, BACKFILL_BATCH_SIZE, BACKFILL_PAUSE, run_backfill
+from utils.timefmt import now_epoch
+
+ARCHIVE_PATH_ENV = "ASSET_MANAGER_ARCHIVE_DB"
+ARCHIVE_SCHEMA = "archive"
+ARCHIVE_AFTER_DAYS = 365
+
+# Archived rows keep their checkout id (AUTOINCREMENT ids are never
+# reused) and take a copy of the asset name/tag, since the asset may be
+# deleted later and a foreign key cannot point into another file.
+ARCHIVE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.checkout (
+    id            INTEGER PRIMARY KEY,
+    asset_id      INTEGER,
+    asset_name    TEXT,
+    asset_tag_id  TEXT,
+    student_name  TEXT NOT NULL,
+    student_id    TEXT NOT NULL,
+    student_fk    INTEGER,
+    checkout_time TEXT,
+    checkin_time  TEXT,
+    checkout_at   INTEGER,
+    checkin_at    INTEGER,
+    status        TEXT NOT NULL
+)
+"""
+ARCHIVE_INDEX_SQL = [
+    f"""CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archive_at_id
+        ON checkout (checkout_at DESC, id DESC)""",
+    f"""CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archive_student
+        ON checkout (student_fk, checkout_at DESC)""",
+]
+
+# Live + archived history as one FROM-clause subquery (a view in the
+# main schema may not reference an attached database, and a temp view
+# cannot be created on read-only report connections). SQLite merges the
+# two ordered index scans for ORDER BY checkout_at DESC, id DESC.
+# A batch is copied before it is deleted, so an id can briefly be in
+# both files (or for longer, after a crash); the live row wins.
+HISTORY_UNION_SQL = f"""(
+    SELECT co.id, co.student_name, co.student_id, a.asset_tag_id,
+           co.checkout_at, co.checkin_at, co.status
+    FROM main.checkout AS co
+    JOIN main.assets AS a ON co.asset_id = a.id
+    UNION ALL
+    SELECT ar.id, ar.student_name, ar.student_id, ar.asset_tag_id,
+           ar.checkout_at, ar.checkin_at, ar.status
+    FROM {ARCHIVE_SCHEMA}.checkout AS ar
+    WHERE NOT EXISTS (SELECT 1 FROM main.checkout AS m WHERE m.id = ar.id)
+)"""
+
+
+def archive_path(conn):
+    """Archive file for the database `conn` is connected to."""
+    override = os.environ.get(ARCHIVE_PATH_ENV)
+    if override:
+        return override
+    main_file = next(
+        (row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main"),
+        "",
+    )
+    if not main_file:
+        raise ValueError(
+            f"In-memory database: set {ARCHIVE_PATH_ENV} to choose an archive file."
+        )
+    root, ext = os.path.splitext(main_file)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def is_attached(conn):
+    return any(row[1] == ARCHIVE_SCHEMA for row in conn.execute("PRAGMA database_list"))
+
+
+def _has_archive_table(conn):
+    return conn.execute(
+        f"SELECT 1 FROM {ARCHIVE_SCHEMA}.sqlite_master WHERE type='table' AND name='checkout'"
+    ).fetchone() is not None
+
+
+def attach_archive(conn, path=None, create=True):
+    """
+    ATTACH the archive. Safe to call on every use; pooled connections
+    keep it attached. Returns True when the archive table is available.
+
+    create=True  -> the archive job: create the file and table if missing
+    create=False -> read paths (History, exports): never write; if no
+                    archive run has happened yet, nothing is attached
+                    and False is returned
+    """
+    if is_attached(conn):
+        return True
+    path = path or archive_path(conn)
+    if not create and not os.path.exists(path):
+        return False
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+    if _has_archive_table(conn):
+        return True
+    if not create:
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+        return False
+    conn.execute(ARCHIVE_TABLE_SQL)
+    for sql in ARCHIVE_INDEX_SQL:
+        conn.execute(sql)
+    conn.commit()
+    return True
+
+
+def cutoff_for(days):
+    return now_epoch() - int(days) * 86400
+
+
+def _pending_sql(cutoff):
+    return f"""
+        SELECT COUNT(*) FROM main.checkout
+        WHERE status = 'Returned' AND checkin_at < {int(cutoff)}
+    """
+
+
+def _archive_step(cutoff):
+    def step(conn, batch_size):
+        ids = [
+            row[0]
+            for row in conn.execute("""
+                SELECT id FROM main.checkout
+                WHERE status = 'Returned' AND checkin_at < ?
+                ORDER BY checkin_at
+                LIMIT ?
+            """, (cutoff, batch_size))
+        ]
+        if not ids:
+            return 0
+
+        placeholders = ",".join("?" for _ in ids)
+        # Copy and delete in two transactions. In WAL mode SQLite does
+        # not commit a transaction that spans two files atomically, so
+        # one transaction could commit the DELETE in main and lose the
+        # INSERT in the archive. The copy is committed first, then only
+        # rows the archive confirms holding are deleted. A crash in
+        # between leaves rows in both files: HISTORY_UNION_SQL shows the
+        # live copy, and the next run's finish_interrupted() deletes it.
+        conn.execute(f"""
+            INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.checkout (
+                id, asset_id, asset_name, asset_tag_id, student_name,
+                student_id, student_fk, checkout_time, checkin_time,
+                checkout_at, checkin_at, status
+            )
+            SELECT co.id, co.asset_id, a.asset_name, a.asset_tag_id,
+                   co.student_name, co.student_id, co.student_fk,
+                   co.checkout_time, co.checkin_time,
+                   co.checkout_at, co.checkin_at, co.status
+            FROM main.checkout AS co
+            LEFT JOIN main.assets AS a ON co.asset_id = a.id
+            WHERE co.id IN ({placeholders})
+        """, ids)
+        conn.commit()
+
+        # run_backfill() commits this second transaction
+        conn.execute("BEGIN IMMEDIATE")
+        archived = [
+            row[0]
+            for row in conn.execute(
+                f"SELECT id FROM {ARCHIVE_SCHEMA}.checkout WHERE id IN ({placeholders})", ids
+            )
+        ]
+        if archived:
+            placeholders = ",".join("?" for _ in archived)
+            conn.execute(f"DELETE FROM main.checkout WHERE id IN ({placeholders})", archived)
+        return len(archived)
+    return step
+
+
+def finish_interrupted(conn):
+    """
+    Delete live rows a previous run already copied to the archive but
+    did not get to delete (a crash between the two transactions of a
+    batch). Returns rows deleted.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        deleted = conn.execute(f"""
+            DELETE FROM main.checkout
+            WHERE status = 'Returned'
+              AND EXISTS (
+                  SELECT 1 FROM {ARCHIVE_SCHEMA}.checkout AS ar
+                  WHERE ar.id = main.checkout.id
+              )
+        """).rowcount
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return deleted
+
+
+def count_archivable(conn, days=ARCHIVE_AFTER_DAYS):
+    return conn.execute(_pending_sql(cutoff_for(days))).fetchone()[0]
+
+
+def archive_returned(conn, days=ARCHIVE_AFTER_DAYS, batch_size=BACKFILL_BATCH_SIZE,
+                     pause=BACKFILL_PAUSE, progress=None, path=None):
+    """
+    Move Returned checkouts whose check-in is older than `days` into the
+    archive in batches: each batch is copied in one short transaction and
+    deleted in another. Returns rows moved.
+    """
+    attach_archive(conn, path)
+    moved = finish_interrupted(conn)
+    cutoff = cutoff_for(days)
+    backfill = Backfill(_pending_sql(cutoff), _archive_step(cutoff))
+    return moved + run_backfill(conn, backfill, batch_size=batch_size,
+                                pause=pause, progress=progress)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move old returned checkouts to the archive.")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                        help="archive checkouts returned more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE,
+                        help="rows moved per transaction")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report how many rows would move")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        if args.dry_run:
+            print(f"{count_archivable(conn, args.days)} checkout(s) would be archived.")
+            return 0
+        moved = archive_returned(
+            conn, args.days, batch_size=args.batch_size,
+            progress=lambda n: print(f"  archived {n} rows"),
+        )
+        print(f"Archived {moved} checkout(s) to {archive_path(conn)}.")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Bulk asset import from CSV (e.g. onboarding a new equipment room).
+
+The file is read as a stream and handled IMPORT_CHUNK rows at a time:
+each chunk is validated in Python, then written with one executemany
+upsert keyed on asset_tag_id inside one transaction. Existing tags get
+their name/location/category updated; their status is left alone so an
+import never "returns" an asset that is checked out.
+
+Rejected rows are reported with their line number and written to
+<file>_rejects.csv next to the input.
+
+    python -m services.asset_import new_room.csv
+"""
+import argparse
+import csv
+import os
+import sys
+from collections import namedtuple
+
+from db_conn import get_connection, write_transaction
+from migrate import TAG_INDEX, duplicate_tags, index_exists
+from services.checkout import chunks
+
+IMPORT_CHUNK = 10000
+
+# Statuses the Add Asset dialog offers. "Checked Out" is only ever set
+# by a check-out, so it is not accepted from a file.
+ASSET_STATUSES = ("Available", "Checked Out", "Maintenance", "Broken", "Retired")
+IMPORT_STATUSES = tuple(s for s in ASSET_STATUSES if s != "Checked Out")
+
+# header (lower-case, spaces -> _) -> assets column; covers the export
+# header and the labels used on screen
+HEADER_ALIASES = {
+    "asset_name": "asset_name",
+    "name": "asset_name",
+    "asset": "asset_name",
+    "asset_tag_id": "asset_tag_id",
+    "asset_tag": "asset_tag_id",
+    "tag_id": "asset_tag_id",
+    "tag": "asset_tag_id",
+    "location": "location",
+    "category": "category",
+    "status": "status",
+}
+REQUIRED = ("asset_name", "asset_tag_id")
+
+# inserted / updated -> row counts
+# rejected           -> [(line_no, reason)]
+# rejects_path       -> CSV of rejected rows, or None
+ImportResult = namedtuple("ImportResult", "inserted updated rejected rejects_path")
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def _map_header(header):
+    mapping = {}
+    for index, name in enumerate(header):
+        column = HEADER_ALIASES.get(name.strip().lower().replace(" ", "_"))
+        if column and column not in mapping:
+            mapping[column] = index
+    missing = [c for c in REQUIRED if c not in mapping]
+    if missing:
+        raise ValueError(
+            "CSV header must include " + " and ".join(missing)
+            + f" (found: {', '.join(header) or 'nothing'})"
+        )
+    return mapping
+
+
+def _count_lines(path):
+    lines = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    return lines
+
+
+def validate(row, mapping, seen_tags):
+    """
+    Return (values, None) for a good row or (None, reason).
+    Tags are compared exactly, like the unique index the upsert matches
+    on: 'p1' and 'P1' are different assets.
+    """
+    def get(column):
+        index = mapping.get(column)
+        if index is None or index >= len(row):
+            return ""
+        return row[index].strip()
+
+    name, tag = get("asset_name"), get("asset_tag_id")
+    if not name:
+        return None, "missing asset name"
+    if not tag:
+        return None, "missing asset tag"
+    if tag in seen_tags:
+        return None, f"duplicate tag {tag!r} earlier in the file"
+
+    status = get("status") or "Available"
+    match = next((s for s in IMPORT_STATUSES if s.lower() == status.lower()), None)
+    if match is None:
+        return None, f"invalid status {status!r}"
+
+    seen_tags.add(tag)
+    return (name, tag, get("location"), get("category"), match), None
+
+
+def _existing_tags(conn, tags):
+    found = set()
+    for chunk in chunks(tags):
+        placeholders = ",".join("?" for _ in chunk)
+        found.update(
+            r[0] for r in conn.execute(
+                f"SELECT asset_tag_id FROM assets WHERE asset_tag_id IN ({placeholders})",
+                chunk,
+            )
+        )
+    return found
+
+
+def _write_chunk(conn, values):
+    """Upsert one chunk in one transaction; returns (inserted, updated)."""
+    with write_transaction(conn):
+        existing = _existing_tags(conn, [v[1] for v in values])
+        conn.executemany("""
+            INSERT INTO assets (asset_name, asset_tag_id, location, category, status)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (asset_tag_id) DO UPDATE SET
+                asset_name = excluded.asset_name,
+                location   = excluded.location,
+                category   = excluded.category
+        """, values)
+    updated = sum(1 for v in values if v[1] in existing)
+    return len(values) - updated, updated
+
+
+def _write_rejects(path, header, rejects):
+    root, _ = os.path.splitext(path)
+    rejects_path = f"{root}_rejects.csv"
+    with open(rejects_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason", *header])
+        writer.writerows([line, reason, *row] for line, reason, row in rejects)
+    return rejects_path
+
+
+def import_assets(conn, path, progress=None, cancelled=None, chunk_size=IMPORT_CHUNK):
+    """
+    Import assets from the CSV at `path`. Chunks already written stay
+    written if a later chunk fails or the import is cancelled.
+
+    progress  -> optional fn(done, total) with data-row counts
+    cancelled -> optional fn() -> bool checked between chunks
+    """
+    if not index_exists(conn, TAG_INDEX):
+        tags = [tag for tag, _ in duplicate_tags(conn)]
+        shown = ", ".join(repr(t) for t in tags[:10]) + (" ..." if len(tags) > 10 else "")
+        raise RuntimeError(
+            "The assets table has duplicate tag IDs, so imports cannot match "
+            f"on tag: {shown or 'none left'}. Give each asset its own tag, then "
+            "run migrate.py to add the unique tag index."
+        )
+
+    total = max(_count_lines(path) - 1, 0)
+    inserted = updated = done = 0
+    rejects = []
+    seen_tags = set()
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        mapping = _map_header(header)
+
+        def flush(values):
+            nonlocal inserted, updated
+            if values:
+                i, u = _write_chunk(conn, values)
+                inserted += i
+                updated += u
+
+        values = []
+        for row in reader:
+            if cancelled and cancelled():
+                flush(values)
+                raise ImportCancelled()
+            if not any(cell.strip() for cell in row):
+                continue  # blank line
+            done += 1
+            good, reason = validate(row, mapping, seen_tags)
+            if good is None:
+                rejects.append((reader.line_num, reason, row))
+            else:
+                values.append(good)
+
+            if len(values) >= chunk_size:
+                flush(values)
+                values = []
+                if progress:
+                    progress(done, total)
+        flush(values)
+        if progress:
+            progress(done, total)
+
+    rejects_path = _write_rejects(path, header, rejects) if rejects else None
+    return ImportResult(
+        inserted, updated, [(line, reason) for line, reason, _ in rejects], rejects_path
+    )
+
+
+def summary(result, limit=10):
+    """Human-readable outcome for a message box or the CLI."""
+    lines = [f"{result.inserted} asset(s) added, {result.updated} updated."]
+    if result.rejected:
+        lines.append(f"{len(result.rejected)} row(s) rejected:")
+        lines.extend(f"  line {line}: {reason}" for line, reason in result.rejected[:limit])
+        if len(result.rejected) > limit:
+            lines.append(f"  ... and {len(result.rejected) - limit} more")
+        lines.append(f"All rejects were saved to {result.rejects_path}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import assets from a CSV file.")
+    parser.add_argument("path", help="CSV with asset_name and asset_tag_id columns")
+    args = parser.parse_args(argv)
+
+    conn = get_connection("bulk-import")
+    try:
+        result = import_assets(
+            conn, args.path,
+            progress=lambda done, total: print(f"\r  {done}/{total} rows", end="", flush=True),
+        )
+    finally:
+        conn.close()
+    print()
+    print(summary(result))
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Check-out / check-in operations shared by the Check Out and Check In
+pages. Everything for one cart happens in a single transaction.
+"""
+from collections import namedtuple
+
+from db_conn import write_transaction
+from utils.timefmt import format_ts, now_epoch
+
+# SQLite's default limit on bound parameters per statement is 999
+MAX_SQL_PARAMS = 900
+
+# checked_out -> asset ids that were checked out
+# conflicts   -> asset ids that were no longer Available (another desk
+#                took them, or they were retired/broken meanwhile)
+CheckoutResult = namedtuple("CheckoutResult", "checked_out conflicts checkout_at")
+
+# returned         -> checkout ids that were checked in now
+# already_returned -> checkout ids someone else checked in first
+# missing          -> checkout ids that no longer exist
+CheckinResult = namedtuple("CheckinResult", "returned already_returned missing checkin_at")
+
+
+def chunks(seq, size=MAX_SQL_PARAMS):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def upsert_student(conn, student_name, student_id):
+    """Insert or rename the students row for `student_id`; returns its id."""
+    row = conn.execute(
+        "SELECT id, full_name FROM students WHERE student_id = ?", (student_id,)
+    ).fetchone()
+    if row is None:
+        return conn.execute(
+            "INSERT INTO students (full_name, student_id) VALUES (?, ?)",
+            (student_name, student_id),
+        ).lastrowid
+    if row[1] != student_name:
+        conn.execute(
+            "UPDATE students SET full_name = ? WHERE id = ?", (student_name, row[0])
+        )
+    return row[0]
+
+
+def _lookup_tags(conn, sql, tags):
+    found = {}
+    for chunk in chunks(list(dict.fromkeys(tags))):
+        placeholders = ",".join("?" for _ in chunk)
+        found.update(conn.execute(sql.format(placeholders=placeholders), chunk))
+    return found
+
+
+def asset_ids_for_tags(conn, tags):
+    """{asset_tag_id: asset id} for the tags that exist."""
+    return _lookup_tags(
+        conn,
+        "SELECT asset_tag_id, id FROM assets WHERE asset_tag_id IN ({placeholders})",
+        tags,
+    )
+
+
+def open_checkouts_for_tags(conn, tags):
+    """{asset_tag_id: checkout id} for tags that are currently checked out."""
+    return _lookup_tags(
+        conn,
+        """
+        SELECT a.asset_tag_id, co.id
+        FROM assets AS a
+        JOIN checkout AS co ON co.asset_id = a.id AND co.status = 'Checked Out'
+        WHERE a.asset_tag_id IN ({placeholders})
+        """,
+        tags,
+    )
+
+
+def _available_ids(conn, asset_ids):
+    available = set()
+    for chunk in chunks(asset_ids):
+        placeholders = ",".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"SELECT id FROM assets WHERE status = 'Available' AND id IN ({placeholders})",
+            chunk,
+        )
+        available.update(r[0] for r in rows)
+    return available
+
+
+def batch_checkout(conn, asset_ids, student_name, student_id):
+    """
+    Check out every available asset in `asset_ids` to one student.
+
+    One IMMEDIATE transaction, one timestamp, executemany for the writes.
+    The status UPDATE is conditional on status = 'Available' and its
+    affected-row count is verified, so an asset another desk already
+    took is reported as a conflict instead of being checked out twice.
+    Raises ValueError if the student name or ID is blank.
+    """
+    asset_ids = list(dict.fromkeys(int(a) for a in asset_ids))
+    student_name = (student_name or "").strip()
+    student_id = (student_id or "").strip()
+    if not student_name or not student_id:
+        raise ValueError("Student Name and Student ID are required.")
+    checkout_at = now_epoch()
+
+    # take the write lock up front so the availability check and the
+    # writes see the same data
+    with write_transaction(conn):
+        available = _available_ids(conn, asset_ids)
+        checked_out = [a for a in asset_ids if a in available]
+        conflicts = [a for a in asset_ids if a not in available]
+
+        if checked_out:
+            cur = conn.executemany(
+                """
+                UPDATE assets SET status = 'Checked Out'
+                WHERE id = ? AND status = 'Available'
+                """,
+                [(a,) for a in checked_out],
+            )
+            if cur.rowcount != len(checked_out):
+                raise RuntimeError(
+                    "Asset availability changed during check out; nothing was saved."
+                )
+
+            student_fk = upsert_student(conn, student_name, student_id)
+            conn.executemany(
+                """
+                INSERT INTO checkout (
+                    asset_id, student_name, student_id, student_fk,
+                    checkout_at, checkout_time, status
+                )
+                VALUES (?, ?, ?, ?, ?, ?, 'Checked Out')
+                """,
+                [
+                    (a, student_name, student_id, student_fk,
+                     checkout_at, format_ts(checkout_at))
+                    for a in checked_out
+                ],
+            )
+
+    return CheckoutResult(checked_out, conflicts, checkout_at)
+
+
+def batch_checkin(conn, checkout_ids):
+    """
+    Return a cart of checkouts in one transaction.
+
+    Resolves all asset ids with one query, then marks the checkouts
+    Returned and the assets Available with set-based UPDATEs.
+    Rows that vanished or were already returned are reported, not fatal.
+    """
+    checkout_ids = list(dict.fromkeys(int(c) for c in checkout_ids))
+    checkin_at = now_epoch()
+
+    with write_transaction(conn):
+        found = {}
+        for chunk in chunks(checkout_ids):
+            placeholders = ",".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT id, asset_id, status FROM checkout WHERE id IN ({placeholders})",
+                chunk,
+            )
+            for cid, asset_id, status in rows:
+                found[cid] = (asset_id, status)
+
+        returned = [c for c in checkout_ids if c in found and found[c][1] == "Checked Out"]
+        already_returned = [c for c in checkout_ids if c in found and found[c][1] != "Checked Out"]
+        missing = [c for c in checkout_ids if c not in found]
+        asset_ids = list(dict.fromkeys(found[c][0] for c in returned))
+
+        for chunk in chunks(returned):
+            placeholders = ",".join("?" for _ in chunk)
+            conn.execute(
+                f"""
+                UPDATE checkout
+                SET status = 'Returned', checkin_at = ?, checkin_time = ?
+                WHERE status = 'Checked Out' AND id IN ({placeholders})
+                """,
+                [checkin_at, format_ts(checkin_at), *chunk],
+            )
+
+        for chunk in chunks(asset_ids):
+            placeholders = ",".join("?" for _ in chunk)
+            conn.execute(
+                f"UPDATE assets SET status = 'Available' WHERE id IN ({placeholders})",
+                chunk,
+            )
+
+    return CheckinResult(returned, already_returned, missing, checkin_at)
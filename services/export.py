@@ -0,0 +1,159 @@
+"""
+Streaming CSV / JSON Lines export of assets and checkout history.
+
+Rows go from the SQLite cursor to the file EXPORT_CHUNK at a time with
+fetchmany(), so memory stays flat however large the history is. The
+file is written as <path>.part and renamed when complete, so a failed
+or cancelled export never leaves a half-written file behind.
+
+    python -m services.export assets assets.csv
+    python -m services.export history history.jsonl --query smith --include-archive
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from db_conn import get_connection
+from services.search import count_history, history_cursor
+from utils.timefmt import format_ts
+
+EXPORT_CHUNK = 1000
+FORMATS = ("csv", "jsonl")
+
+ASSET_COLUMNS = ["id", "asset_name", "asset_tag_id", "status", "location", "category"]
+HISTORY_COLUMNS = [
+    "checkout_id", "student_name", "student_id", "asset_tag_id",
+    "checkout_time", "checkin_time", "status",
+]
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def format_for(path, fmt=None):
+    """Pick the format from `fmt` or the file extension (default csv)."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".") or "csv").lower()
+    if fmt == "json":
+        fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt!r} (use csv or jsonl)")
+    return fmt
+
+
+def iter_chunks(cursor, size=EXPORT_CHUNK):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
+
+
+def write_rows(cursor, columns, path, fmt=None, convert=None,
+               total=None, progress=None, cancelled=None):
+    """
+    Stream every row of `cursor` into `path`. Returns rows written.
+
+    convert   -> optional fn(row) -> row applied before writing
+    progress  -> optional fn(done, total) called after each chunk
+    cancelled -> optional fn() -> bool checked between chunks
+    """
+    fmt = format_for(path, fmt)
+    tmp_path = path + ".part"
+    done = 0
+    try:
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                write_chunk = writer.writerows
+            else:
+                def write_chunk(rows):
+                    f.writelines(
+                        json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+
+            for rows in iter_chunks(cursor):
+                if cancelled and cancelled():
+                    raise ExportCancelled()
+                if convert:
+                    rows = [convert(row) for row in rows]
+                write_chunk(rows)
+                done += len(rows)
+                if progress:
+                    progress(done, total)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return done
+
+
+# ---------- ASSETS ----------
+def export_assets(conn, path, fmt=None, progress=None, cancelled=None):
+    """Every asset, in Assets page order."""
+    total = conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+    cursor = conn.execute("""
+        SELECT id, asset_name, asset_tag_id, status, location, category
+        FROM assets
+        ORDER BY asset_name
+    """)
+    return write_rows(cursor, ASSET_COLUMNS, path, fmt,
+                      total=total, progress=progress, cancelled=cancelled)
+
+
+# ---------- HISTORY ----------
+def _export_ts(epoch):
+    # format_ts() shows NULL as '-' on screen; files get "" (CSV) / null (JSONL)
+    return None if epoch is None else format_ts(epoch)
+
+
+def _history_row(row):
+    checkout_id, name, sid, tag, checkout_at, checkin_at, status = row
+    return (checkout_id, name, sid, tag,
+            _export_ts(checkout_at), _export_ts(checkin_at), status)
+
+
+def export_history(conn, path, query="", include_archive=False, fmt=None,
+                   progress=None, cancelled=None):
+    """Checkout history matching the History page search, newest first."""
+    total = count_history(conn, query, include_archive=include_archive)
+    cursor = history_cursor(conn, query, limit=None, include_archive=include_archive)
+    return write_rows(cursor, HISTORY_COLUMNS, path, fmt, convert=_history_row,
+                      total=total, progress=progress, cancelled=cancelled)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export assets or checkout history.")
+    parser.add_argument("what", choices=("assets", "history"))
+    parser.add_argument("path", help="output file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="override the format implied by the file extension")
+    parser.add_argument("--query", default="",
+                        help="history only: same search as the History page")
+    parser.add_argument("--include-archive", action="store_true",
+                        help="history only: include archived checkouts")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\r  {done}/{total} rows", end="", flush=True)
+
+    conn = get_connection("read-only-report")
+    try:
+        if args.what == "assets":
+            n = export_assets(conn, args.path, args.format, progress=progress)
+        else:
+            n = export_history(conn, args.path, args.query, args.include_archive,
+                               args.format, progress=progress)
+    finally:
+        conn.close()
+    print(f"\nExported {n} row(s) to {args.path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
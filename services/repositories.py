@@ -0,0 +1,208 @@
+"""
+Table access for the pages, the CLI and the benchmarks.
+
+Each repository wraps one open connection and owns the SQL for its
+tables; rows come back as namedtuples, so callers use field names
+instead of column positions. Write methods run as one transaction and
+commit, like batch_checkout / batch_checkin. Nothing here imports Tk,
+so every query can be profiled or benchmarked headless:
+
+    conn = get_connection()
+    assets = AssetRepository(conn).all()
+    conn.close()
+"""
+from collections import namedtuple
+
+from services.checkout import (
+    asset_ids_for_tags, batch_checkin, batch_checkout, chunks, open_checkouts_for_tags,
+)
+from services.search import search_assets, search_open_checkouts
+
+Asset = namedtuple("Asset", "id name tag status location category")
+User = namedtuple("User", "id first_name last_name email role")
+# a currently checked-out asset, as listed on the dashboard
+OpenCheckout = namedtuple("OpenCheckout", "asset_name tag student_name student_id checkout_at")
+Student = namedtuple("Student", "name student_id")
+
+
+class _Repository:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def _write(self, sql, params=()):
+        cur = self.conn.execute(sql, params)
+        self.conn.commit()
+        return cur
+
+
+# ---------- ASSETS ----------
+class AssetRepository(_Repository):
+    _COLUMNS = "id, asset_name, asset_tag_id, status, location, category"
+
+    def all(self):
+        """Every asset, in Assets page order."""
+        return [
+            Asset(*row)
+            for row in self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM assets ORDER BY asset_name"
+            )
+        ]
+
+    def get(self, asset_id):
+        row = self.conn.execute(
+            f"SELECT {self._COLUMNS} FROM assets WHERE id = ?", (asset_id,)
+        ).fetchone()
+        return Asset(*row) if row else None
+
+    def search(self, query="", available_only=True):
+        """The Check Out page search."""
+        return [
+            Asset(asset_id, name, tag, status, location, category)
+            for asset_id, name, tag, location, category, status
+            in search_assets(self.conn, query, available_only)
+        ]
+
+    def ids_for_tags(self, tags):
+        return asset_ids_for_tags(self.conn, tags)
+
+    def add(self, name, tag, status="Available", location="", category=""):
+        """Insert one asset; returns its id. Raises ValueError on bad input."""
+        name, tag = name.strip(), tag.strip()
+        if not name:
+            raise ValueError("Asset name is required.")
+        if not tag:
+            raise ValueError("Asset Tag ID is required.")
+        return self._write("""
+            INSERT INTO assets (asset_name, asset_tag_id, status, location, category)
+            VALUES (?, ?, ?, ?, ?)
+        """, (name, tag, status.strip() or "Available", location.strip(), category.strip())
+        ).lastrowid
+
+    def update(self, asset_id, name, tag, status, location, category):
+        self._write("""
+            UPDATE assets
+            SET asset_name = ?, asset_tag_id = ?, status = ?, location = ?, category = ?
+            WHERE id = ?
+        """, (name, tag, status, location, category, asset_id))
+
+    def delete(self, asset_ids):
+        """Delete assets (and, by cascade, their checkouts); returns rows deleted."""
+        asset_ids = [int(a) for a in asset_ids]
+        deleted = 0
+        try:
+            for chunk in chunks(asset_ids):
+                placeholders = ",".join("?" for _ in chunk)
+                deleted += self.conn.execute(
+                    f"DELETE FROM assets WHERE id IN ({placeholders})", chunk
+                ).rowcount
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        return deleted
+
+
+# ---------- CHECKOUTS ----------
+class CheckoutRepository(_Repository):
+    def open_checkouts(self):
+        """Every checked-out asset, newest first (dashboard table)."""
+        return [
+            OpenCheckout(*row)
+            for row in self.conn.execute("""
+                SELECT a.asset_name,
+                       a.asset_tag_id,
+                       co.student_name,
+                       co.student_id,
+                       co.checkout_at
+                FROM checkout AS co
+                JOIN assets AS a ON co.asset_id = a.id
+                WHERE co.status = 'Checked Out'
+                ORDER BY co.checkout_at DESC
+            """)
+        ]
+
+    def search_open(self, query=""):
+        """The Check In page search."""
+        return search_open_checkouts(self.conn, query)
+
+    def open_ids_for_tags(self, tags):
+        return open_checkouts_for_tags(self.conn, tags)
+
+    def known_students(self):
+        return [
+            Student(*row)
+            for row in self.conn.execute("SELECT full_name, student_id FROM students")
+        ]
+
+    def check_out(self, asset_ids, student_name, student_id):
+        """-> CheckoutResult"""
+        return batch_checkout(self.conn, asset_ids, student_name, student_id)
+
+    def check_in(self, checkout_ids):
+        """-> CheckinResult"""
+        return batch_checkin(self.conn, checkout_ids)
+
+
+# ---------- USERS ----------
+class UserRepository(_Repository):
+    _COLUMNS = "id, first_name, last_name, email, role"
+
+    def all(self):
+        """Staff list order."""
+        return [
+            User(*row)
+            for row in self.conn.execute(
+                f"SELECT {self._COLUMNS} FROM users ORDER BY first_name"
+            )
+        ]
+
+    def get(self, user_id):
+        row = self.conn.execute(
+            f"SELECT {self._COLUMNS} FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        return User(*row) if row else None
+
+    def credentials(self, email):
+        """(User, stored password) for `email`, or None."""
+        row = self.conn.execute(
+            f"SELECT {self._COLUMNS}, password FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return (User(*row[:5]), row[5]) if row else None
+
+    def password_of(self, user_id):
+        row = self.conn.execute(
+            "SELECT password FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def admin_count(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM users WHERE role = 'admin'"
+        ).fetchone()[0]
+
+    def add(self, first_name, last_name, email, password, role="staff"):
+        return self._write("""
+            INSERT INTO users (first_name, last_name, email, password, role)
+            VALUES (?, ?, ?, ?, ?)
+        """, (first_name, last_name, email, password, role)).lastrowid
+
+    def update(self, user_id, first_name, last_name, email, role=None):
+        """Update name/email, and the role unless `role` is None."""
+        if role is None:
+            self._write("""
+                UPDATE users SET first_name = ?, last_name = ?, email = ?
+                WHERE id = ?
+            """, (first_name, last_name, email, user_id))
+        else:
+            self._write("""
+                UPDATE users SET first_name = ?, last_name = ?, email = ?, role = ?
+                WHERE id = ?
+            """, (first_name, last_name, email, role, user_id))
+
+    def set_password(self, user_id, password_hash):
+        self._write(
+            "UPDATE users SET password = ? WHERE id = ?", (password_hash, user_id)
+        )
+
+    def delete(self, user_id):
+        self._write("DELETE FROM users WHERE id = ?", (user_id,))
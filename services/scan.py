@@ -0,0 +1,145 @@
+"""
+Barcode-scanner support for express check-out / check-in.
+
+A USB wedge scanner "types" the tag and presses Enter. TagCache keeps
+every asset (and its open checkout, if any) in a dict keyed by tag, so
+resolving a scan is one dict lookup instead of a query. Scans are
+collected in a ScanCart and only touch the database when the cart is
+committed through batch_checkout / batch_checkin (one transaction).
+"""
+from collections import namedtuple
+
+# checkout_id / student_name are set while the asset is checked out
+ScanAsset = namedtuple(
+    "ScanAsset", "asset_id name tag status checkout_id student_name"
+)
+
+# code -> one of the SCAN_* constants below
+ScanResult = namedtuple("ScanResult", "code asset message")
+
+SCAN_ADDED = "added"
+SCAN_DUPLICATE = "duplicate"
+SCAN_UNKNOWN = "unknown"
+SCAN_REJECTED = "rejected"
+
+
+def normalize_tag(tag):
+    # exact match, like ux_assets_tag: 'P1' and 'p1' are different assets
+    return tag.strip()
+
+
+class TagCache:
+    """asset_tag_id -> ScanAsset for every tagged asset."""
+
+    def __init__(self):
+        self._by_tag = {}
+        self._by_id = {}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._by_tag)
+
+    def load(self, conn):
+        rows = conn.execute("""
+            SELECT a.id, a.asset_name, a.asset_tag_id, a.status,
+                   co.id, co.student_name
+            FROM assets AS a
+            LEFT JOIN checkout AS co
+                ON co.asset_id = a.id AND co.status = 'Checked Out'
+            WHERE a.asset_tag_id IS NOT NULL AND TRIM(a.asset_tag_id) <> ''
+        """)
+        self._by_tag.clear()
+        self._by_id.clear()
+        for row in rows:
+            asset = ScanAsset(*row)
+            self._by_tag[normalize_tag(asset.tag)] = asset
+            self._by_id[asset.asset_id] = asset
+        self.loaded = True
+
+    def invalidate(self):
+        """Drop everything; the next ensure_loaded() re-reads the table."""
+        self._by_tag.clear()
+        self._by_id.clear()
+        self.loaded = False
+
+    def ensure_loaded(self, conn_factory):
+        if not self.loaded:
+            conn = conn_factory()
+            try:
+                self.load(conn)
+            finally:
+                conn.close()
+
+    def get(self, tag):
+        return self._by_tag.get(normalize_tag(tag))
+
+    def by_id(self, asset_id):
+        return self._by_id.get(asset_id)
+
+    def update(self, asset_ids, **changes):
+        """Patch cached entries after this desk's own commit."""
+        for asset_id in asset_ids:
+            asset = self._by_id.get(asset_id)
+            if asset is None:
+                continue
+            asset = asset._replace(**changes)
+            self._by_id[asset_id] = asset
+            self._by_tag[normalize_tag(asset.tag)] = asset
+
+
+class ScanCart:
+    """
+    cache  -> TagCache used to resolve tags
+    accept -> fn(ScanAsset) -> None if the asset may go in the cart,
+              otherwise a short reason ("is Broken")
+    """
+
+    def __init__(self, cache, accept):
+        self.cache = cache
+        self.accept = accept
+        self.items = []      # ScanAsset, in scan order
+        self._ids = set()
+
+    def __len__(self):
+        return len(self.items)
+
+    def scan(self, tag):
+        tag = tag.strip()
+        asset = self.cache.get(tag) if tag else None
+        if asset is None:
+            return ScanResult(SCAN_UNKNOWN, None, f"Unknown tag {tag!r}")
+        if asset.asset_id in self._ids:
+            return ScanResult(SCAN_DUPLICATE, asset, f"{asset.name} ({asset.tag}) is already in the cart")
+
+        reason = self.accept(asset)
+        if reason:
+            return ScanResult(SCAN_REJECTED, asset, f"{asset.name} ({asset.tag}) {reason}")
+
+        self.items.append(asset)
+        self._ids.add(asset.asset_id)
+        return ScanResult(SCAN_ADDED, asset, f"Added {asset.name} ({asset.tag})")
+
+    def undo(self):
+        """Remove the most recent scan (e.g. a wrong item was scanned)."""
+        if not self.items:
+            return None
+        asset = self.items.pop()
+        self._ids.discard(asset.asset_id)
+        return asset
+
+    def clear(self):
+        self.items.clear()
+        self._ids.clear()
+
+
+# ---------- accept rules ----------
+def can_check_out(asset):
+    if asset.status != "Available":
+        return f"is {asset.status}"
+    return None
+
+
+def can_check_in(asset):
+    if asset.checkout_id is None:
+        return "is not checked out"
+    return None
@@ -0,0 +1,216 @@
+"""
+Search for the Check Out, Check In and History search boxes.
+
+Uses the FTS5 indexes created by migration 3 (assets_fts, checkout_fts)
+for prefix matching, and falls back to the old LIKE '%q%' filters when
+the local SQLite build has no FTS5 or the database is not migrated yet.
+"""
+import re
+
+from services.archive import attach_archive, HISTORY_UNION_SQL
+
+# Letters/digits plus '-' and '_' so tags like "SAC-00123" stay one token
+_TERM_RE = re.compile(r"[\w-]+", re.UNICODE)
+
+
+def has_fts(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='assets_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def fts_terms(text):
+    """Split user input into FTS5 prefix terms: 'sac-01 jo' -> ['"sac-01"*', '"jo"*']."""
+    return [f'"{t}"*' for t in _TERM_RE.findall(text.lower())]
+
+
+def _asset_match(column):
+    return f"{column} IN (SELECT rowid FROM assets_fts WHERE assets_fts MATCH ?)"
+
+
+def _checkout_match(column):
+    return f"{column} IN (SELECT rowid FROM checkout_fts WHERE checkout_fts MATCH ?)"
+
+
+# ---------- CHECK OUT ----------
+def search_assets(conn, query="", available_only=True):
+    """Assets for the Check Out table: (id, name, tag, location, category, status)."""
+    sql = """
+        SELECT id, asset_name, asset_tag_id, location, category, status
+        FROM assets
+    """
+    params = []
+    where_clauses = []
+
+    if available_only:
+        where_clauses.append("status = 'Available'")
+
+    if query:
+        terms = fts_terms(query)
+        if has_fts(conn) and terms:
+            # every term must prefix-match the name or tag
+            for term in terms:
+                where_clauses.append(_asset_match("id"))
+                params.append(term)
+        else:
+            where_clauses.append("(asset_name LIKE ? OR asset_tag_id LIKE ?)")
+            q = f"%{query}%"
+            params.extend([q, q])
+
+    if where_clauses:
+        sql += " WHERE " + " AND ".join(where_clauses)
+
+    sql += " ORDER BY asset_name"
+    return conn.execute(sql, params).fetchall()
+
+
+# ---------- CHECK IN ----------
+def search_open_checkouts(conn, query=""):
+    """
+    Open checkouts for the Check In table:
+    (checkout_id, asset_name, tag, student_name, student_id, checkout_at)
+    """
+    sql = """
+        SELECT co.id, a.asset_name, a.asset_tag_id,
+               co.student_name, co.student_id, co.checkout_at
+        FROM checkout co
+        JOIN assets a ON co.asset_id = a.id
+        WHERE co.status = 'Checked Out'
+    """
+    params = []
+
+    if query:
+        terms = fts_terms(query)
+        if has_fts(conn) and terms:
+            # each term may hit the asset or the student side
+            for term in terms:
+                sql += f" AND ({_asset_match('co.asset_id')} OR {_checkout_match('co.id')})"
+                params.extend([term, term])
+        else:
+            sql += """ AND (
+                a.asset_name LIKE ? OR
+                a.asset_tag_id LIKE ? OR
+                co.student_name LIKE ? OR
+                co.student_id LIKE ?
+            )"""
+            q = f"%{query}%"
+            params.extend([q, q, q, q])
+
+    sql += " ORDER BY co.checkout_at DESC"
+    return conn.execute(sql, params).fetchall()
+
+
+# ---------- HISTORY ----------
+# Rows per History page; the next page is fetched on scroll
+HISTORY_PAGE_SIZE = 200
+
+# Column references for the live table, and for the union that adds
+# archived rows (services.archive). Archived rows are not in the FTS
+# index, so searches that include the archive use LIKE.
+_HOT = {
+    "from": "checkout AS co JOIN assets AS a ON co.asset_id = a.id",
+    "id": "co.id",
+    "student_name": "co.student_name",
+    "student_id": "co.student_id",
+    "tag": "a.asset_tag_id",
+    "checkout_at": "co.checkout_at",
+    "checkin_at": "co.checkin_at",
+    "status": "co.status",
+}
+_WITH_ARCHIVE = {
+    "from": f"{HISTORY_UNION_SQL} AS h",
+    "id": "h.id",
+    "student_name": "h.student_name",
+    "student_id": "h.student_id",
+    "tag": "h.asset_tag_id",
+    "checkout_at": "h.checkout_at",
+    "checkin_at": "h.checkin_at",
+    "status": "h.status",
+}
+
+
+def _history_source(conn, include_archive):
+    # before the first archive run there is nothing to union with
+    if include_archive and attach_archive(conn, create=False):
+        return _WITH_ARCHIVE
+    return _HOT
+
+
+def _history_filter(conn, query, src):
+    """WHERE fragments + params shared by the page and count queries."""
+    clauses, params = [], []
+    if query:
+        terms = fts_terms(query)
+        if src is _HOT and has_fts(conn) and terms:
+            for term in terms:
+                clauses.append(f"({_checkout_match('co.id')} OR {_asset_match('co.asset_id')})")
+                params.extend([term, term])
+        else:
+            clauses.append(f"""(
+                {src["student_name"]} LIKE ?
+                OR {src["student_id"]} LIKE ?
+                OR {src["tag"]} LIKE ?
+            )""")
+            q = f"%{query}%"
+            params.extend([q, q, q])
+    return clauses, params
+
+
+def history_cursor(conn, query="", after=None, limit=HISTORY_PAGE_SIZE,
+                   include_archive=False):
+    """
+    Cursor over checkout history, newest first:
+    (checkout_id, student_name, student_id, tag, checkout_at, checkin_at, status)
+    Times are epoch seconds; format them with utils.timefmt.format_ts.
+
+    after -> (checkout_at, checkout_id) of the last row already shown.
+             Keyset paging: the next page is an index seek from there,
+             so page 500 costs the same as page 1.
+    include_archive -> also return rows moved to the archive database
+    limit=None streams the whole history (exports).
+    """
+    src = _history_source(conn, include_archive)
+    clauses, params = _history_filter(conn, query, src)
+    if after is not None:
+        at, cid = after
+        # the plain range term lets SQLite seek the (checkout_at, id) index
+        clauses.append(
+            f"{src['checkout_at']} <= ? AND ({src['checkout_at']} < ? OR {src['id']} < ?)"
+        )
+        params.extend([at, at, cid])
+
+    sql = f"""
+        SELECT
+            {src["id"]},
+            COALESCE(NULLIF(TRIM({src["student_name"]}), ''), 'Unknown') AS s_name,
+            COALESCE(NULLIF(TRIM({src["student_id"]}), ''), '-') AS s_id,
+            COALESCE(NULLIF(TRIM({src["tag"]}), ''), '-') AS tag_id,
+            {src["checkout_at"]},
+            {src["checkin_at"]},
+            {src["status"]}
+        FROM {src["from"]}
+    """
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {src['checkout_at']} DESC, {src['id']} DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return conn.execute(sql, params)
+
+
+def search_history(conn, query="", after=None, limit=HISTORY_PAGE_SIZE,
+                   include_archive=False):
+    """history_cursor() rows as a list (one page for the History table)."""
+    return history_cursor(conn, query, after, limit, include_archive).fetchall()
+
+
+def count_history(conn, query="", include_archive=False):
+    """Total rows search_history() would page through (for the footer)."""
+    src = _history_source(conn, include_archive)
+    clauses, params = _history_filter(conn, query, src)
+    sql = f"SELECT COUNT(*) FROM {src['from']}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return conn.execute(sql, params).fetchone()[0]
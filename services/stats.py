@@ -0,0 +1,145 @@
+"""
+Dashboard counters.
+
+The stat_counters table (migration 4) is kept current by triggers on
+assets, users and checkout, so reading the dashboard cards is a handful
+of primary-key lookups regardless of inventory size.
+
+    python -m services.stats --verify    # compare counters with COUNT(*)
+    python -m services.stats --rebuild   # recompute counters from scratch
+"""
+import argparse
+import sys
+
+from db_conn import get_connection
+
+# (kind, name, SELECT producing rows of (name, n)) used by rebuild/verify
+_SOURCE_COUNTS = [
+    ("total", "SELECT 'assets', COUNT(*) FROM assets"),
+    ("total", "SELECT 'users', COUNT(*) FROM users"),
+    ("total", "SELECT 'open_checkouts', COUNT(*) FROM checkout WHERE status = 'Checked Out'"),
+    ("status", "SELECT COALESCE(status, ''), COUNT(*) FROM assets GROUP BY 1"),
+    ("category", "SELECT COALESCE(category, ''), COUNT(*) FROM assets GROUP BY 1"),
+    ("location", "SELECT COALESCE(location, ''), COUNT(*) FROM assets GROUP BY 1"),
+]
+
+
+def has_counters(conn):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='stat_counters'"
+    ).fetchone()
+    return row is not None
+
+
+def _fresh_counts(conn):
+    counts = {}
+    for kind, sql in _SOURCE_COUNTS:
+        for name, n in conn.execute(sql):
+            counts[(kind, name)] = n
+    return counts
+
+
+def _stored_counts(conn):
+    return {
+        (kind, name): n
+        for kind, name, n in conn.execute("SELECT kind, name, n FROM stat_counters")
+        if n
+    }
+
+
+def rebuild_stats(conn):
+    """Recompute every counter (runs inside the caller's transaction)."""
+    conn.execute("DELETE FROM stat_counters")
+    conn.executemany(
+        "INSERT INTO stat_counters (kind, name, n) VALUES (?, ?, ?)",
+        [(kind, name, n) for (kind, name), n in _fresh_counts(conn).items()],
+    )
+
+
+def verify_stats(conn):
+    """Return {(kind, name): (stored, actual)} for every counter that drifted."""
+    fresh = {k: n for k, n in _fresh_counts(conn).items() if n}
+    stored = _stored_counts(conn)
+    return {
+        key: (stored.get(key, 0), fresh.get(key, 0))
+        for key in set(fresh) | set(stored)
+        if stored.get(key, 0) != fresh.get(key, 0)
+    }
+
+
+def get_counts(conn, kind):
+    """{name: n} for one dimension, e.g. get_counts(conn, 'category')."""
+    return {
+        name: n
+        for name, n in conn.execute(
+            "SELECT name, n FROM stat_counters WHERE kind = ? AND n > 0 ORDER BY name",
+            (kind,),
+        )
+    }
+
+
+def get_summary_stats(conn):
+    """Numbers for the four dashboard cards."""
+    if not has_counters(conn):
+        # database not migrated yet: count the slow way
+        c = conn.cursor()
+        return {
+            "total_assets": c.execute("SELECT COUNT(*) FROM assets").fetchone()[0] or 0,
+            "checked_out": c.execute(
+                "SELECT COUNT(*) FROM assets WHERE status = 'Checked Out'"
+            ).fetchone()[0] or 0,
+            "available": c.execute(
+                "SELECT COUNT(*) FROM assets WHERE status = 'Available'"
+            ).fetchone()[0] or 0,
+            "total_users": c.execute("SELECT COUNT(*) FROM users").fetchone()[0] or 0,
+        }
+
+    counts = {
+        (kind, name): n
+        for kind, name, n in conn.execute("""
+            SELECT kind, name, n FROM stat_counters
+            WHERE (kind = 'total' AND name IN ('assets', 'users'))
+               OR (kind = 'status' AND name IN ('Checked Out', 'Available'))
+        """)
+    }
+    return {
+        "total_assets": counts.get(("total", "assets"), 0),
+        "checked_out": counts.get(("status", "Checked Out"), 0),
+        "available": counts.get(("status", "Available"), 0),
+        "total_users": counts.get(("total", "users"), 0),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check or rebuild dashboard counters.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--verify", action="store_true", help="report counters that drifted")
+    group.add_argument("--rebuild", action="store_true", help="recompute all counters")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        if not has_counters(conn):
+            print("stat_counters table missing; run migrate.py first.")
+            return 1
+
+        if args.rebuild:
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild_stats(conn)
+            conn.commit()
+            print("Counters rebuilt.")
+            return 0
+
+        drift = verify_stats(conn)
+        for (kind, name), (stored, actual) in sorted(drift.items()):
+            print(f"{kind}/{name or '(blank)'}: stored {stored}, actual {actual}")
+        if drift:
+            return 1
+        print("All counters match.")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
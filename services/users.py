@@ -0,0 +1,66 @@
+"""
+Staff accounts: sign-in, sign-up and password changes.
+
+Passwords are stored as SHA-256 hex digests. Accounts created before
+hashing still hold the plain password; they are accepted and upgraded
+to the hash on their next successful sign-in.
+"""
+import hashlib
+
+from services.repositories import UserRepository
+
+# accounts added from the Staff page start with this password
+TEMP_PASSWORD = "temp123"
+
+
+def hash_password(pw: str) -> str:
+    return hashlib.sha256(pw.encode()).hexdigest()
+
+
+def password_matches(stored, typed):
+    """True if `typed` matches a hashed or legacy plain-text password."""
+    return stored is not None and stored in (typed, hash_password(typed))
+
+
+def authenticate(conn, email, password):
+    """-> User for a correct email/password, else None."""
+    users = UserRepository(conn)
+    found = users.credentials(email)
+    if found is None:
+        return None
+
+    user, stored_pw = found
+    if not password_matches(stored_pw, password):
+        return None
+
+    if stored_pw == password and stored_pw != hash_password(password):
+        try:
+            users.set_password(user.id, hash_password(password))
+        except Exception:
+            pass  # sign-in still succeeds; the upgrade is retried next time
+    return user
+
+
+def register_staff(conn, first_name, last_name, email, password):
+    """Self sign-up: always a 'staff' account. Returns the new user id."""
+    return UserRepository(conn).add(
+        first_name, last_name, email, hash_password(password), "staff"
+    )
+
+
+def add_staff(conn, first_name, last_name, email, role):
+    """Account added by an admin; signs in with TEMP_PASSWORD."""
+    return UserRepository(conn).add(
+        first_name, last_name, email, hash_password(TEMP_PASSWORD), role
+    )
+
+
+def change_password(conn, user_id, current, new):
+    """Raises ValueError with a user-facing message if the change is refused."""
+    users = UserRepository(conn)
+    stored_pw = users.password_of(user_id)
+    if stored_pw is None:
+        raise ValueError("User not found")
+    if not password_matches(stored_pw, current):
+        raise ValueError("Current password is incorrect")
+    users.set_password(user_id, hash_password(new))
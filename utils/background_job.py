@@ -0,0 +1,98 @@
+"""
+Run one long job (export, import) off the Tk main thread.
+
+The job gets a `progress(done, total)` callback it may call from the
+worker thread; updates are queued and delivered to the main thread by
+polling with `after`, like SearchController does for searches. Only the
+latest progress update per poll is delivered.
+"""
+import queue
+import threading
+
+import tkinter as tk
+
+POLL_MS = 100
+
+
+class BackgroundJob:
+    """
+    widget      -> any Tk widget (used for `after` scheduling)
+    fn          -> fn(progress, cancelled) -> result; runs on the worker
+    on_progress -> optional fn(done, total) on the main thread
+    on_done     -> optional fn(result) on the main thread
+    on_error    -> optional fn(exception) on the main thread
+    """
+
+    def __init__(self, widget, fn, on_progress=None, on_done=None, on_error=None):
+        self.widget = widget
+        self.fn = fn
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+
+        self._events = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._poll_id = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+        self._poll_id = self.widget.after(POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        """Ask the job to stop at its next cancelled() check."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    # ---------- worker thread ----------
+    def _work(self):
+        try:
+            result = self.fn(self._progress, self._cancel.is_set)
+        except BaseException as e:
+            self._events.put(("error", e))
+        else:
+            self._events.put(("done", result))
+
+    def _progress(self, done, total=None):
+        self._events.put(("progress", (done, total)))
+
+    # ---------- main thread ----------
+    def _poll(self):
+        self._poll_id = None
+        progress, finished = None, None
+        while True:
+            try:
+                kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                progress = payload
+            else:
+                finished = (kind, payload)
+
+        try:
+            if not self.widget.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        if progress is not None and self.on_progress:
+            self.on_progress(*progress)
+        if finished is not None:
+            kind, payload = finished
+            if kind == "done" and self.on_done:
+                self.on_done(payload)
+            elif kind == "error" and self.on_error:
+                self.on_error(payload)
+            return
+
+        self._poll_id = self.widget.after(POLL_MS, self._poll)
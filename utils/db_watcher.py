@@ -0,0 +1,79 @@
+"""
+Cheap "did the database change?" check for live views.
+
+PRAGMA data_version on a connection changes whenever *another*
+connection (another desk, or one of this app's pooled connections)
+commits to the database file. Reading it touches no table pages, so a
+view can poll it on the Tk `after` loop and only re-query when the
+number moves. The watcher keeps its own connection for that reason:
+the value is only comparable on the connection that produced it.
+"""
+import sqlite3
+
+import tkinter as tk
+
+from db_conn import open_connection
+
+POLL_MS = 2000
+
+
+class DataVersionWatcher:
+    """
+    widget    -> any Tk widget (used for `after` scheduling)
+    on_change -> fn(); runs on the Tk main thread when another
+                 connection committed since the last check
+    """
+
+    def __init__(self, widget, on_change, interval_ms=POLL_MS, db_path=None):
+        self.widget = widget
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+
+        self._conn = open_connection(db_path, profile="read-only-report")
+        self._version = self._read()
+        self._after_id = None
+
+    def _read(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def check(self):
+        """True if the database changed since the previous check."""
+        try:
+            version = self._read()
+        except sqlite3.Error:
+            return False
+        if version == self._version:
+            return False
+        self._version = version
+        return True
+
+    # ---------- polling ----------
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def close(self):
+        self.stop()
+        self._conn.close()
+
+    def _tick(self):
+        self._after_id = None
+        if self.check():
+            self.on_change()
+        try:
+            self._after_id = self.widget.after(self.interval_ms, self._tick)
+        except tk.TclError:
+            # widget destroyed between ticks
+            self._after_id = None
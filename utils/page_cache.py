@@ -0,0 +1,122 @@
+"""
+Keeps DashboardPage's sub-pages alive between sidebar clicks.
+
+Pages are built once, then hidden with pack_forget() and shown again
+instead of being destroyed and rebuilt. Optional hooks on a page:
+
+    on_show(stale)  -> called every time the page is shown; `stale` is
+                       True when data changed since it was last shown
+    on_hide()       -> called when another page replaces it
+
+Pages announce writes with notify_data_changed(widget); the dashboard
+turns that into invalidate_all() so other pages reload on next show.
+"""
+from collections import OrderedDict
+
+DATA_CHANGED_EVENT = "<<DataChanged>>"
+
+
+def notify_data_changed(widget):
+    """Tell the app that `widget` wrote to the database."""
+    try:
+        widget.event_generate(DATA_CHANGED_EVENT, when="tail")
+    except Exception:
+        # widget already destroyed (e.g. dialog closed) - nothing to notify
+        pass
+
+
+class PageCache:
+    """
+    parent    -> frame the pages are packed into
+    max_pages -> optional cap on cached pages; least recently shown
+                 pages beyond it are destroyed (rebuilt on next visit)
+    """
+
+    def __init__(self, parent, max_pages=None, pack_options=None):
+        self.parent = parent
+        self.max_pages = max_pages
+        self.pack_options = pack_options or {"fill": "both", "expand": True}
+
+        self._pages = OrderedDict()   # key -> page, oldest first
+        self._stale = set()
+        self.current_key = None
+
+    @property
+    def current(self):
+        return self._pages.get(self.current_key)
+
+    def get(self, key):
+        return self._pages.get(key)
+
+    def show(self, key, factory):
+        """Show the page for `key`, building it with factory() if needed."""
+        if key == self.current_key and key in self._pages:
+            page = self._pages[key]
+            self._call(page, "on_show", key in self._stale)
+            self._stale.discard(key)
+            return page
+
+        self.hide_current()
+
+        page = self._pages.get(key)
+        if page is None:
+            page = factory()
+            self._pages[key] = page
+            stale = False           # freshly built = fresh data
+        else:
+            self._pages.move_to_end(key)
+            stale = key in self._stale
+        self._stale.discard(key)
+
+        page.pack(**self.pack_options)
+        self.current_key = key
+        self._call(page, "on_show", stale)
+
+        self._evict()
+        return page
+
+    def hide_current(self):
+        page = self.current
+        if page is not None:
+            self._call(page, "on_hide")
+            page.pack_forget()
+        self.current_key = None
+
+    def invalidate(self, *keys):
+        """Mark pages as needing a reload the next time they are shown."""
+        self._stale.update(k for k in keys if k in self._pages)
+
+    def invalidate_all(self, except_current=False):
+        for key in self._pages:
+            if except_current and key == self.current_key:
+                continue
+            self._stale.add(key)
+
+    def discard(self, key):
+        """Destroy a cached page (it is rebuilt on next show)."""
+        page = self._pages.pop(key, None)
+        self._stale.discard(key)
+        if page is None:
+            return
+        if key == self.current_key:
+            self.current_key = None
+        page.destroy()
+
+    def clear(self):
+        for key in list(self._pages):
+            self.discard(key)
+
+    def _evict(self):
+        if not self.max_pages:
+            return
+        for key in list(self._pages):
+            if len(self._pages) <= self.max_pages:
+                break
+            if key != self.current_key:
+                self.discard(key)
+
+    @staticmethod
+    def _call(page, hook, *args):
+        fn = getattr(page, hook, None)
+        if fn is not None:
+            fn(*args)
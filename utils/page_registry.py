@@ -0,0 +1,74 @@
+"""
+Lazy page classes for main.App and DashboardPage.
+
+Pages are registered as "module:Class" strings and only imported the
+first time they are needed, so starting the app imports the landing
+page and nothing else. prewarm() imports the rest one module per
+`after` tick once the first frame is up, so input is still handled in
+between and the first click on a page usually finds it already loaded.
+"""
+import importlib
+
+PREWARM_DELAY_MS = 300   # after the first frame, before the first import
+PREWARM_STEP_MS = 50     # between imports
+
+
+class PageRegistry:
+    """
+    specs -> {name: "package.module:ClassName"}
+    """
+
+    def __init__(self, specs):
+        self._specs = dict(specs)
+        self._classes = {}
+        self._prewarm_job = None
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def module_names(self):
+        return [spec.partition(":")[0] for spec in self._specs.values()]
+
+    def is_loaded(self, name):
+        return name in self._classes
+
+    def get(self, name):
+        """The page class for `name`, importing its module on first use."""
+        cls = self._classes.get(name)
+        if cls is None:
+            module_name, _, class_name = self._specs[name].partition(":")
+            cls = getattr(importlib.import_module(module_name), class_name)
+            self._classes[name] = cls
+        return cls
+
+    def create(self, name, *args, **kwargs):
+        return self.get(name)(*args, **kwargs)
+
+    def prewarm(self, widget, names=None, delay_ms=PREWARM_DELAY_MS):
+        """Import the remaining pages in the background of the Tk loop."""
+        pending = [n for n in (names or self._specs) if not self.is_loaded(n)]
+
+        def step():
+            self._prewarm_job = None
+            while pending and self.is_loaded(pending[0]):
+                pending.pop(0)
+            if not pending:
+                return
+            try:
+                self.get(pending.pop(0))
+            except Exception as e:
+                # the real navigation will raise (and report) it again
+                print("Page prewarm failed:", e)
+            self._prewarm_job = widget.after(PREWARM_STEP_MS, step)
+
+        self.cancel_prewarm(widget)
+        if pending:
+            self._prewarm_job = widget.after(delay_ms, step)
+
+    def cancel_prewarm(self, widget):
+        if self._prewarm_job is not None:
+            try:
+                widget.after_cancel(self._prewarm_job)
+            except Exception:
+                pass
+            self._prewarm_job = None
@@ -8,6 +8,7 @@ def resource_path(relative_path):
     if getattr(sys, 'frozen', False):
         base_path = sys._MEIPASS
     else:
-        base_path = os.path.abspath(".")
+        # the repo root, wherever the app was started from
+        base_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
 
     return os.path.join(base_path, relative_path)
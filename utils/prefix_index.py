@@ -0,0 +1,91 @@
+"""
+Sorted-array prefix index for type-ahead suggestions.
+
+Every searchable term is stored once in a sorted list; a lookup is a
+bisect to the first term >= the typed prefix followed by a short walk
+while terms still start with it, so it does not slow down as the list
+grows. Each text is indexed from every word start, so "smi" finds
+"John Smith" as well as "Smith, Amy".
+"""
+from bisect import bisect_left, insort
+
+
+def normalize(text):
+    return " ".join(str(text).casefold().split())
+
+
+def terms_for(texts):
+    """Word-start suffixes of each text: 'john a smith' -> john a smith, a smith, smith."""
+    terms = set()
+    for text in texts:
+        words = normalize(text).split(" ")
+        for i in range(len(words)):
+            term = " ".join(words[i:])
+            if term:
+                terms.add(term)
+    return terms
+
+
+class PrefixIndex:
+    """
+    key   -> unique id of an entry (adding the same key replaces it)
+    texts -> strings the entry can be found by (e.g. name and ID)
+    item  -> whatever search() should return for the entry
+    """
+
+    def __init__(self, entries=()):
+        self._items = {}   # key -> (terms, item)
+        self._terms = []   # sorted [(term, key)]
+        for key, texts, item in entries:
+            self._remove_terms(key)
+            terms = terms_for(texts)
+            self._items[key] = (terms, item)
+            self._terms.extend((term, key) for term in terms)
+        self._terms.sort()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def add(self, key, texts, item):
+        self.remove(key)
+        terms = terms_for(texts)
+        self._items[key] = (terms, item)
+        for term in terms:
+            insort(self._terms, (term, key))
+
+    def remove(self, key):
+        entry = self._items.pop(key, None)
+        if entry is None:
+            return
+        for term in entry[0]:
+            i = bisect_left(self._terms, (term, key))
+            if i < len(self._terms) and self._terms[i] == (term, key):
+                del self._terms[i]
+
+    def _remove_terms(self, key):
+        # bulk build: a duplicate key keeps only its last entry
+        entry = self._items.pop(key, None)
+        if entry is not None:
+            self._terms = [t for t in self._terms if t[1] != key]
+
+    def search(self, prefix, limit=10):
+        """Items with a term starting with `prefix`, in term order."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        terms = self._terms
+        results, seen = [], set()
+        i = bisect_left(terms, (prefix,))
+        while i < len(terms) and len(results) < limit:
+            term, key = terms[i]
+            if not term.startswith(prefix):
+                break
+            if key not in seen:
+                seen.add(key)
+                results.append(self._items[key][1])
+            i += 1
+        return results
@@ -0,0 +1,112 @@
+"""
+Small modal window with a progress bar for BackgroundJob work
+(exports, imports). The job keeps running on its worker thread; the
+dialog only shows progress and offers a Cancel button.
+"""
+from tkinter import messagebox
+
+import customtkinter as ctk
+
+from utils.background_job import BackgroundJob
+
+
+class ProgressDialog(ctk.CTkToplevel):
+    """
+    title     -> window title and heading
+    on_cancel -> optional fn() called when Cancel is pressed
+    """
+
+    def __init__(self, master, title, on_cancel=None, width=380, height=170):
+        super().__init__(master)
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(master.winfo_toplevel())
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+
+        self._on_cancel = on_cancel
+        self._center(width, height)
+
+        ctk.CTkLabel(
+            self,
+            text=title,
+            font=ctk.CTkFont(size=16, weight="bold"),
+        ).pack(pady=(16, 8))
+
+        self.bar = ctk.CTkProgressBar(self, width=width - 60, mode="determinate")
+        self.bar.set(0)
+        self.bar.pack(pady=(0, 6))
+
+        self.status_label = ctk.CTkLabel(
+            self, text="Starting...", text_color="#555555", font=ctk.CTkFont(size=12)
+        )
+        self.status_label.pack()
+
+        self.cancel_btn = ctk.CTkButton(
+            self,
+            text="Cancel",
+            width=100,
+            fg_color="#E0E0E0",
+            text_color="#222222",
+            hover_color="#CCCCCC",
+            command=self._cancel,
+        )
+        self.cancel_btn.pack(pady=(10, 12))
+
+    def update_progress(self, done, total=None, unit="row(s)"):
+        if total:
+            self.bar.set(min(done / total, 1.0))
+            self.status_label.configure(text=f"{done:,} of {total:,} {unit}")
+        else:
+            self.status_label.configure(text=f"{done:,} {unit}")
+
+    def _cancel(self):
+        self.cancel_btn.configure(state="disabled", text="Cancelling...")
+        if self._on_cancel:
+            self._on_cancel()
+
+    def close(self):
+        try:
+            self.grab_release()
+        except Exception:
+            pass
+        self.destroy()
+
+    def _center(self, width, height):
+        try:
+            self.update_idletasks()
+            x = self.winfo_screenwidth() // 2 - width // 2
+            y = self.winfo_screenheight() // 2 - height // 2
+            self.geometry(f"{width}x{height}+{x}+{y}")
+        except Exception:
+            pass
+
+
+def run_with_progress(master, title, fn, on_done=None, on_stopped=None,
+                      error_title="Error", unit="row(s)"):
+    """
+    Run fn(progress, cancelled) as a BackgroundJob behind a ProgressDialog.
+    on_done(result) runs on the main thread after the dialog closes;
+    on_stopped() runs instead if the job failed or was cancelled.
+    A job that stops because Cancel was pressed closes quietly.
+    """
+    job = None
+
+    def on_progress(done, total):
+        dialog.update_progress(done, total, unit)
+
+    def finished(result):
+        dialog.close()
+        if on_done:
+            on_done(result)
+
+    def failed(error):
+        dialog.close()
+        if on_stopped:
+            on_stopped()
+        if not job.cancelled:
+            messagebox.showerror(error_title, str(error))
+
+    dialog = ProgressDialog(master, title, on_cancel=lambda: job.cancel())
+    job = BackgroundJob(master, fn, on_progress, finished, failed).start()
+    return job
@@ -0,0 +1,106 @@
+"""
+Scan strip for the Check Out / Check In pages.
+
+A wedge scanner types each tag followed by Enter, often dozens per
+second. Every scan is resolved through the page's ScanCart (a dict
+lookup, no query) and the entry is cleared for the next tag; the cart
+label is redrawn once per idle cycle, so a burst of scans costs one
+label update and never touches the Treeview.
+"""
+import customtkinter as ctk
+
+from services.scan import SCAN_ADDED
+
+TEXT_MUTED = "#555555"
+TEXT_ERROR = "#B00020"
+
+
+class ScanBar(ctk.CTkFrame):
+    """
+    cart      -> ScanCart the scans go into
+    noun      -> what the cart holds, for the label ("to check out")
+    """
+
+    def __init__(self, master, cart, noun):
+        super().__init__(master, fg_color="#FFFFFF")
+        self.cart = cart
+        self.noun = noun
+
+        self._message = "Scan a tag (or type it and press Enter)."
+        self._is_error = False
+        self._redraw_pending = False
+
+        self.scan_entry = ctk.CTkEntry(
+            self,
+            placeholder_text="Scan asset tag...",
+            width=260,
+            height=32,
+        )
+        self.scan_entry.pack(side="left", padx=(0, 10))
+        self.scan_entry.bind("<Return>", self._on_scan)
+        self.scan_entry.bind("<KP_Enter>", self._on_scan)
+
+        self.cart_label = ctk.CTkLabel(
+            self,
+            text="",
+            text_color=TEXT_MUTED,
+            font=ctk.CTkFont(size=12),
+            anchor="w",
+        )
+        self.cart_label.pack(side="left", fill="x", expand=True)
+
+        for text, command in (("Clear", self.clear), ("Undo", self.undo)):
+            ctk.CTkButton(
+                self,
+                text=text,
+                width=70,
+                height=32,
+                fg_color="#E0E0E0",
+                text_color="#222222",
+                hover_color="#CCCCCC",
+                command=command,
+            ).pack(side="right", padx=(6, 0))
+
+        self._redraw()
+
+    def focus(self):
+        self.scan_entry.focus_set()
+
+    # ---------- scanning ----------
+    def _on_scan(self, event=None):
+        tag = self.scan_entry.get()
+        self.scan_entry.delete(0, "end")
+        if not tag.strip():
+            return "break"
+
+        result = self.cart.scan(tag)
+        if result.code != SCAN_ADDED:
+            self.bell()
+        self._set_message(result.message, result.code != SCAN_ADDED)
+        return "break"
+
+    def undo(self):
+        asset = self.cart.undo()
+        if asset is not None:
+            self._set_message(f"Removed {asset.name} ({asset.tag})")
+        self.focus()
+
+    def clear(self, message="Cart cleared."):
+        self.cart.clear()
+        self._set_message(message)
+        self.focus()
+
+    # ---------- label ----------
+    def _set_message(self, message, is_error=False):
+        self._message = message
+        self._is_error = is_error
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        self.cart_label.configure(
+            text=f"{len(self.cart)} asset(s) {self.noun}  •  {self._message}",
+            text_color=TEXT_ERROR if self._is_error else TEXT_MUTED,
+        )
@@ -0,0 +1,149 @@
+"""
+Debounced background search for the page search boxes.
+
+Typing (or a barcode scanner) fires <KeyRelease> for every character.
+SearchController waits until input pauses, runs the query on a worker
+thread with its own pooled connection, interrupts/drops any query that a
+newer keystroke has made stale, and hands results back to the Tk main
+loop with `after` (Tk widgets must only be touched from the main thread).
+"""
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter as tk
+
+from db_conn import get_connection
+
+DEBOUNCE_MS = 150
+POLL_MS = 15
+
+
+class SearchController:
+    """
+    widget     -> any Tk widget (used for `after` scheduling)
+    query_fn   -> fn(conn, *args) -> rows; runs on the worker thread
+    on_results -> fn(rows); runs on the Tk main thread
+    on_error   -> optional fn(exception); runs on the Tk main thread
+    """
+
+    def __init__(self, widget, query_fn, on_results, on_error=None,
+                 delay_ms=DEBOUNCE_MS):
+        self.widget = widget
+        self.query_fn = query_fn
+        self.on_results = on_results
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._results = queue.Queue()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._running_conn = None
+        self._debounce_id = None
+        self._poll_id = None
+
+    # ---------- main thread ----------
+    def schedule(self, *args):
+        """Call from the KeyRelease handler; restarts the debounce timer."""
+        self._cancel_after("_debounce_id")
+        self._debounce_id = self.widget.after(self.delay_ms, self._start, *args)
+
+    def run_now(self, *args):
+        """Skip the debounce (e.g. status filter change, Enter key)."""
+        self._cancel_after("_debounce_id")
+        self._start(*args)
+
+    def cancel(self):
+        """Drop pending and running searches (call when the page is destroyed)."""
+        self._cancel_after("_debounce_id")
+        self._cancel_after("_poll_id")
+        with self._lock:
+            self._generation += 1
+            self._interrupt_running()
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, *args):
+        self._debounce_id = None
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._interrupt_running()
+        self._executor.submit(self._work, generation, args)
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        delivered = None
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # only the newest result matters
+            if item[0] == self._generation:
+                delivered = item
+
+        if delivered is not None:
+            if not self.widget.winfo_exists():
+                return
+            _, ok, payload = delivered
+            if ok:
+                self.on_results(payload)
+            elif self.on_error:
+                self.on_error(payload)
+            return
+
+        try:
+            self._poll_id = self.widget.after(POLL_MS, self._poll)
+        except tk.TclError:
+            # widget destroyed while a search was in flight
+            self._poll_id = None
+
+    def _cancel_after(self, attr):
+        after_id = getattr(self, attr)
+        if after_id is not None:
+            try:
+                self.widget.after_cancel(after_id)
+            except tk.TclError:
+                pass
+            setattr(self, attr, None)
+
+    # ---------- worker thread ----------
+    def _interrupt_running(self):
+        # caller holds self._lock
+        if self._running_conn is not None:
+            self._running_conn.interrupt()
+
+    def _is_stale(self, generation):
+        return generation != self._generation
+
+    def _work(self, generation, args):
+        if self._is_stale(generation):
+            return
+
+        conn = get_connection()
+        with self._lock:
+            if self._is_stale(generation):
+                conn.close()
+                return
+            self._running_conn = conn
+        try:
+            result = (generation, True, self.query_fn(conn, *args))
+        except sqlite3.OperationalError as e:
+            # interrupted by a newer keystroke -> nothing to report
+            result = None if self._is_stale(generation) else (generation, False, e)
+        except Exception as e:
+            result = (generation, False, e)
+        finally:
+            with self._lock:
+                self._running_conn = None
+            conn.close()
+
+        if result is not None and not self._is_stale(generation):
+            self._results.put(result)
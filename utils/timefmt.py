@@ -0,0 +1,53 @@
+"""
+Timestamps: stored as integer UTC epochs, shown in the desk's local time.
+
+The checkout table keeps checkout_at / checkin_at as epoch seconds so
+sorting, ranges and durations are plain integer comparisons on an index.
+This module is the only place that turns them into text. The UTC offset
+is looked up once per hour of time (DST always switches on the hour
+in America/Detroit), so formatting a long history does no tz math per row.
+"""
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+APP_TZ = ZoneInfo("America/Detroit")
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M:%S"
+EMPTY = "-"
+
+
+def now_epoch():
+    return int(time.time())
+
+
+@lru_cache(maxsize=1024)
+def _utc_offset(hour):
+    """Seconds to add to UTC for the hour starting at hour * 3600."""
+    moment = datetime.fromtimestamp(hour * 3600, timezone.utc).astimezone(APP_TZ)
+    return int(moment.utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=4096)
+def format_ts(epoch):
+    """Epoch seconds -> local display string ('-' for NULL)."""
+    if epoch is None:
+        return EMPTY
+    epoch = int(epoch)
+    return time.strftime(DISPLAY_FORMAT, time.gmtime(epoch + _utc_offset(epoch // 3600)))
+
+
+def parse_local(text):
+    """
+    Local wall-clock text (the old checkout_time format) -> epoch seconds.
+    Returns None for blank or unreadable values.
+    """
+    if not text or not str(text).strip():
+        return None
+    try:
+        dt = datetime.fromisoformat(str(text).strip())
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=APP_TZ)
+    return int(dt.timestamp())
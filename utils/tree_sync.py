@@ -0,0 +1,76 @@
+"""
+Keyed diff/patch for ttk.Treeview refreshes.
+
+Instead of deleting every item and reinserting all rows, TreeSync
+compares the new rows with what the tree already shows (by iid) and
+only issues the inserts, value updates, moves and deletes that are
+actually needed. Item images (checkbox state) of surviving rows are
+left untouched.
+"""
+from collections import namedtuple
+
+TreeDiff = namedtuple("TreeDiff", "inserted updated moved removed")
+
+
+class TreeSync:
+    """
+    tree -> flat ttk.Treeview (top-level items only)
+
+    Keeps a shadow copy of each row's values so unchanged rows are
+    detected without asking Tk for them.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._values = {}
+
+    def apply(self, items, image=None):
+        """
+        items -> iterable of (iid, values) in display order
+        image -> image for newly inserted rows (e.g. unchecked box)
+        Returns a TreeDiff of iid lists.
+        """
+        tree = self.tree
+        items = [(str(iid), tuple(values)) for iid, values in items]
+        wanted = {iid for iid, _ in items}
+
+        current = list(tree.get_children())
+        removed = [iid for iid in current if iid not in wanted]
+        if removed:
+            tree.delete(*removed)
+            for iid in removed:
+                self._values.pop(iid, None)
+            removed_set = set(removed)
+            current = [iid for iid in current if iid not in removed_set]
+
+        existing = set(current)
+        order = current  # mirrors the tree's order as we patch it
+        inserted, updated, moved = [], [], []
+        insert_kw = {"text": ""}
+        if image is not None:
+            insert_kw["image"] = image
+
+        for index, (iid, values) in enumerate(items):
+            if iid not in existing:
+                tree.insert("", index, iid=iid, values=values, **insert_kw)
+                order.insert(index, iid)
+                self._values[iid] = values
+                inserted.append(iid)
+                continue
+
+            if self._values.get(iid) != values:
+                tree.item(iid, values=values)
+                self._values[iid] = values
+                updated.append(iid)
+
+            if index >= len(order) or order[index] != iid:
+                order.remove(iid)
+                order.insert(index, iid)
+                tree.move(iid, "", index)
+                moved.append(iid)
+
+        return TreeDiff(inserted, updated, moved, removed)
+
+    def forget(self):
+        """Drop the shadow copy (call if the tree was cleared elsewhere)."""
+        self._values.clear()
@@ -0,0 +1,99 @@
+"""
+Images and ttk styles shared by every page.
+
+Pages used to decode the 512px checkbox PNGs, subsample them and call
+theme_use("clam") each time one was built. Here each image is decoded
+and scaled once per Tk root (straight to the target size with Pillow
+when it is installed, Tk's integer subsample otherwise) and each ttk
+style is configured once; later pages get the cached objects.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from utils.path_helper import resource_path
+
+try:
+    from PIL import Image, ImageOps, ImageTk
+except ImportError:  # Pillow is optional; fall back to Tk's PNG loader
+    Image = None
+
+THEME = "clam"
+CHECKBOX_SIZE = 22
+CHECKBOX_UNCHECKED = "Images/unchecked.png"
+CHECKBOX_CHECKED = "Images/checkbox.png"
+
+
+def _cache(widget):
+    """Per-root cache: Tk images and styles belong to one interpreter."""
+    root = widget._root()
+    cache = getattr(root, "_ui_resources", None)
+    if cache is None:
+        cache = root._ui_resources = {"images": {}, "styles": set(), "style": None}
+    return cache
+
+
+# ---------- IMAGES ----------
+def _load_pillow(path, size, root):
+    with Image.open(path) as img:
+        img = ImageOps.contain(img.convert("RGBA"), (size, size), Image.LANCZOS)
+    return ImageTk.PhotoImage(img, master=root)
+
+
+def _load_tk(path, size, root):
+    img = tk.PhotoImage(file=path, master=root)
+    w, h = img.width(), img.height()
+    if w <= size and h <= size:
+        return img
+    factor = max(int(w / size), int(h / size), 1)
+    return img.subsample(factor, factor)
+
+
+def load_image(widget, relative_path, size):
+    """PhotoImage of `relative_path` fitted into size x size, cached."""
+    images = _cache(widget)["images"]
+    key = (relative_path, size)
+    img = images.get(key)
+    if img is None:
+        path = resource_path(relative_path)
+        root = widget._root()
+        img = _load_pillow(path, size, root) if Image else _load_tk(path, size, root)
+        images[key] = img
+    return img
+
+
+def checkbox_images(widget, size=CHECKBOX_SIZE):
+    """(unchecked, checked) images for Treeview checkbox columns."""
+    return (
+        load_image(widget, CHECKBOX_UNCHECKED, size),
+        load_image(widget, CHECKBOX_CHECKED, size),
+    )
+
+
+# ---------- STYLES ----------
+def ttk_style(widget):
+    """The shared ttk.Style, switched to THEME on first use."""
+    cache = _cache(widget)
+    if cache["style"] is None:
+        style = ttk.Style(widget._root())
+        try:
+            style.theme_use(THEME)
+        except tk.TclError:
+            pass
+        cache["style"] = style
+    return cache["style"]
+
+
+def define_style(widget, name, map=None, **options):
+    """
+    Configure ttk style `name` the first time any page asks for it.
+    map -> optional style.map() options, e.g. {"background": [("selected", "#4E6B85")]}
+    """
+    cache = _cache(widget)
+    if name in cache["styles"]:
+        return name
+    style = ttk_style(widget)
+    style.configure(name, **options)
+    if map:
+        style.map(name, **map)
+    cache["styles"].add(name)
+    return name
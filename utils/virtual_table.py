@@ -0,0 +1,210 @@
+"""
+Windowed (virtualized) read-only table.
+
+Only the rows that fit in the viewport are built as widgets; scrolling
+re-labels that small set of recycled rows instead of creating a frame
+and a label per cell for every record. Rendering 5 rows or 50k rows
+costs the same number of widgets.
+"""
+import math
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(tk.Frame):
+    """
+    columns   -> list of (heading, min_width); widths are also used as
+                 relative weights when the table is wider than their sum
+    row_height-> fixed pixel height of every row
+    """
+
+    def __init__(
+        self,
+        master,
+        columns,
+        row_height=40,
+        bg="#FFFFFF",
+        stripe_bg="#F2F2F5",
+        header_bg="#ECECEC",
+        line_color="#D5D5D5",
+        text_color="#1A1A1A",
+        header_text_color="#333333",
+        font=("Inter", 13),
+        header_font=("Inter", 14, "bold"),
+        empty_text="No rows.",
+        empty_color="#777777",
+        empty_font=("Inter", 15, "bold"),
+    ):
+        super().__init__(master, bg=bg)
+
+        self.columns = list(columns)
+        self.row_height = row_height
+        self.bg = bg
+        self.stripe_bg = stripe_bg
+        self.line_color = line_color
+        self.text_color = text_color
+        self.font = font
+
+        self._rows = []
+        self._offset = 0          # pixels scrolled from the top
+        self._row_widgets = []    # recycled: [(frame, [labels])]
+
+        total = sum(w for _, w in self.columns) or 1
+        self._rel = []
+        x = 0.0
+        for _, w in self.columns:
+            self._rel.append((x / total, w / total))
+            x += w
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        # ---------- HEADER ----------
+        header = tk.Frame(self, bg=header_bg, height=row_height)
+        header.grid(row=0, column=0, columnspan=2, sticky="ew")
+        for (title, _), (relx, relwidth) in zip(self.columns, self._rel):
+            tk.Label(
+                header,
+                text=title,
+                bg=header_bg,
+                fg=header_text_color,
+                font=header_font,
+                anchor="center",
+            ).place(relx=relx, relwidth=relwidth, rely=0, relheight=1)
+        tk.Frame(header, bg="#C7C7C7", height=1).place(
+            relx=0, rely=1.0, relwidth=1, anchor="sw"
+        )
+        self.min_width = sum(w for _, w in self.columns)
+        header.configure(width=self.min_width)
+
+        # ---------- BODY ----------
+        self.viewport = tk.Frame(self, bg=bg, width=self.min_width)
+        self.viewport.grid(row=1, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.empty_label = tk.Label(
+            self.viewport,
+            text=empty_text,
+            bg=bg,
+            fg=empty_color,
+            font=empty_font,
+        )
+
+        self.viewport.bind("<Configure>", lambda e: self._layout())
+        self._bind_wheel(self.viewport)
+        self._bind_wheel(self.empty_label)
+
+    # ---------- PUBLIC ----------
+    def set_rows(self, rows):
+        """Replace the data; keeps the scroll position when possible."""
+        self._rows = list(rows)
+        self._offset = min(self._offset, self._max_offset())
+        self._layout()
+
+    def row_count(self):
+        return len(self._rows)
+
+    def widget_count(self):
+        """Number of Tk widgets used for the body (for benchmarks)."""
+        # frame + one label per column + the separator line
+        return sum(2 + len(labels) for _, labels in self._row_widgets)
+
+    # ---------- SCROLLING ----------
+    def _viewport_height(self):
+        return max(self.viewport.winfo_height(), 1)
+
+    def _max_offset(self):
+        return max(len(self._rows) * self.row_height - self._viewport_height(), 0)
+
+    def _scroll_to(self, offset):
+        offset = int(min(max(offset, 0), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            total = len(self._rows) * self.row_height
+            self._scroll_to(float(value) * total)
+        elif action == "scroll":
+            step = self.row_height if unit == "units" else self._viewport_height()
+            self._scroll_to(self._offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            steps = -1
+        elif getattr(event, "num", None) == 5:
+            steps = 1
+        else:
+            delta = event.delta
+            # macOS sends small deltas, Windows multiples of 120
+            steps = -int(delta / 120) if abs(delta) >= 120 else -int(delta)
+            if steps == 0:
+                return
+        self._scroll_to(self._offset + steps * self.row_height)
+        return "break"
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    # ---------- RENDERING ----------
+    def _make_row(self):
+        frame = tk.Frame(self.viewport, bg=self.bg, height=self.row_height)
+        labels = []
+        for relx, relwidth in self._rel:
+            lbl = tk.Label(
+                frame,
+                bg=self.bg,
+                fg=self.text_color,
+                font=self.font,
+                anchor="center",
+            )
+            lbl.place(relx=relx, relwidth=relwidth, rely=0, relheight=1)
+            self._bind_wheel(lbl)
+            labels.append(lbl)
+        line = tk.Frame(frame, bg=self.line_color, height=1)
+        line.place(relx=0, rely=1.0, relwidth=1, anchor="sw")
+        self._bind_wheel(frame)
+        return frame, labels
+
+    def _layout(self):
+        """Grow the recycled row pool to cover the viewport, then render."""
+        needed = math.ceil(self._viewport_height() / self.row_height) + 1
+        while len(self._row_widgets) < needed:
+            self._row_widgets.append(self._make_row())
+        self._offset = min(self._offset, self._max_offset())
+        self._render()
+
+    def _render(self):
+        if not self._rows:
+            for frame, _ in self._row_widgets:
+                frame.place_forget()
+            self.empty_label.place(relx=0.5, y=16, anchor="n")
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.empty_label.place_forget()
+
+        first = self._offset // self.row_height
+        shift = self._offset % self.row_height
+
+        for slot, (frame, labels) in enumerate(self._row_widgets):
+            index = first + slot
+            if index >= len(self._rows):
+                frame.place_forget()
+                continue
+
+            bg = self.bg if index % 2 == 0 else self.stripe_bg
+            frame.configure(bg=bg)
+            for lbl, value in zip(labels, self._rows[index]):
+                lbl.configure(text=str(value), bg=bg)
+            frame.place(x=0, y=slot * self.row_height - shift,
+                        relwidth=1, height=self.row_height)
+
+        total = len(self._rows) * self.row_height
+        top = self._offset / total
+        bottom = min((self._offset + self._viewport_height()) / total, 1.0)
+        self.scrollbar.set(top, bottom)